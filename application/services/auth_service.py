@@ -3,14 +3,20 @@ from fastapi import Depends
 
 from domain.entities.trabajador import Trabajador
 from domain.entities.brigada import Brigada
+from application.services.session_token_service import SessionTokenError, SessionTokenService
+from infrastucture.repositories.refresh_tokens_repository import RefreshTokensRepository
 from infrastucture.repositories.trabajadores_repository import WorkerRepository
 from infrastucture.repositories.brigada_repository import BrigadaRepository
 
 
 class AuthService:
-    def __init__(self, worker_repo: WorkerRepository, brigada_repo: BrigadaRepository):
+    def __init__(self, worker_repo: WorkerRepository, brigada_repo: BrigadaRepository,
+                 token_service: Optional[SessionTokenService] = None,
+                 refresh_tokens_repo: Optional[RefreshTokensRepository] = None):
         self.worker_repo = worker_repo
         self.brigada_repo = brigada_repo
+        self.token_service = token_service
+        self.refresh_tokens_repo = refresh_tokens_repo
 
     async def login_trabajador(self, ci: str, contraseña: str) -> Optional[Brigada]:
         """
@@ -39,4 +45,28 @@ class AuthService:
             # Si no se encuentra la brigada, aún consideramos el login exitoso
             # pero retornamos None para la brigada
             return None
-   
\ No newline at end of file
+
+    def refrescar_sesion(self, refresh_token: str) -> dict:
+        """
+        Emite un par de tokens nuevo a partir de un refresh token, que queda usado.
+        Antes comprueba que el trabajador sigue existiendo con la misma contraseña y
+        que sigue siendo líder de la misma brigada. El par nuevo conserva el fin de
+        la sesión original (sesion_exp).
+
+        Lanza SessionTokenError si el token no es válido, ya se usó o la sesión se revocó.
+        """
+        claims = self.token_service.verificar(refresh_token, SessionTokenService.REFRESH)
+        if not claims.get("jti") or not claims.get("sesion_exp") or not claims.get("pwd"):
+            # Refresh tokens emitidos antes de la rotación con jti
+            raise SessionTokenError("Sesión caducada, inicie sesión de nuevo")
+        if not self.refresh_tokens_repo.consumir(claims["jti"], claims["exp"]):
+            raise SessionTokenError("Refresh token ya usado")
+
+        ci = claims["sub"]
+        contraseña = self.worker_repo.get_contraseña(ci)
+        if contraseña is None or self.token_service.huella(contraseña) != claims["pwd"]:
+            raise SessionTokenError("Sesión revocada, inicie sesión de nuevo")
+        brigada = self.brigada_repo.get_brigada_by_lider_ci(ci)
+        if brigada is None or brigada.id != claims.get("brigada_id"):
+            raise SessionTokenError("Sesión revocada, inicie sesión de nuevo")
+        return self.token_service.emitir(ci, brigada.id, contraseña, sesion_exp=claims["sesion_exp"])
@@ -15,6 +15,10 @@ class ChatService:
         self.gemini_provider = gemini_provider
         self.default_model = os.getenv("GEMINI_DEFAULT_MODEL", "gemini-2.5-flash")
         self.system_prompt = ""
+        # Presupuestos de latencia por endpoint (segundos)
+        self.chat_timeout = float(os.getenv("GEMINI_TIMEOUT_CHAT", "30"))
+        self.stream_timeout = float(os.getenv("GEMINI_TIMEOUT_STREAM", "60"))
+        self.recomendador_timeout = float(os.getenv("GEMINI_TIMEOUT_RECOMENDADOR", "8"))
 
     async def chat(self, user_message: str, custom_system_prompt: Optional[str] = None, 
                    model: Optional[str] = None, streaming: bool = False) -> str:
@@ -37,7 +41,9 @@ class ChatService:
             model=used_model,
             prompt=user_message,
             system_prompt=used_system_prompt,
-            streaming=streaming
+            streaming=streaming,
+            timeout=self.chat_timeout,
+            operation="chat"
         )
     
     async def chat_stream(self, user_message: str, custom_system_prompt: Optional[str] = None, 
@@ -59,12 +65,15 @@ class ChatService:
         async for chunk in self.gemini_provider.chat_stream(
             model=used_model,
             prompt=user_message,
-            system_prompt=used_system_prompt
+            system_prompt=used_system_prompt,
+            timeout=self.stream_timeout,
+            operation="chat_stream"
         ):
             yield chunk
 
     async def recomendar_ofertas(self, texto_usuario: str, ofertas_contexto: List[Dict[str, Any]],
-                                model: Optional[str] = None) -> RecomendacionOfertasResponse:
+                                model: Optional[str] = None,
+                                contexto_renderizado: Optional[str] = None) -> RecomendacionOfertasResponse:
         """
         Recomienda y ordena ofertas basado en el texto del usuario usando Pydantic para validación.
 
@@ -72,16 +81,21 @@ class ChatService:
             texto_usuario: Texto/consulta del usuario
             ofertas_contexto: Lista de diccionarios con id, descripcion_detallada, precio
             model: Modelo a usar (opcional)
+            contexto_renderizado: Contexto de ofertas ya renderizado y cacheado (opcional).
+                Si no se pasa, se construye a partir de ofertas_contexto.
 
         Returns:
             RecomendacionOfertasResponse con 'texto' e 'ids_ordenados' validados
         """
 
         # Preparar el contexto de ofertas para la IA
-        contexto_str = "\n".join([
-            f"ID: {oferta['id']}, Precio: ${oferta['precio']}, Descripción: {oferta['descripcion_detallada']}"
-            for oferta in ofertas_contexto
-        ])
+        if contexto_renderizado is not None:
+            contexto_str = contexto_renderizado
+        else:
+            contexto_str = "\n".join([
+                f"ID: {oferta['id']}, Precio: ${oferta['precio']}, Descripción: {oferta['descripcion_detallada']}"
+                for oferta in ofertas_contexto
+            ])
 
         system_prompt = """Eres un especialista en marketing y asistente especializado en recomendar ofertas.
 Tu tarea es ordenar TODAS las ofertas proporcionadas de mayor a menor recomendación basándote en la consulta del usuario.
@@ -104,13 +118,15 @@ Ordena TODAS estas ofertas de mayor a menor recomendación según la consulta de
                 model=used_model,
                 prompt=user_prompt,
                 response_schema=RecomendacionOfertasResponse,
-                system_prompt=system_prompt
+                system_prompt=system_prompt,
+                timeout=self.recomendador_timeout,
+                operation="recomendar_ofertas"
             )
 
             return response
 
         except Exception:
-            # Fallback en caso de error
+            # Fallback en caso de error, timeout o circuito abierto
             ids_disponibles = [oferta['id'] for oferta in ofertas_contexto]
             return RecomendacionOfertasResponse(
                 texto="Hola, aquí tienes todas las ofertas disponibles ordenadas alfabéticamente.",
@@ -62,9 +62,9 @@ class ClientService:
         cliente_full = ClienteCreateRequest(**data)
         return self.create_or_update_client(cliente_full)
 
-    def get_clientes(self, numero=None, nombre=None, direccion=None):
+    def get_clientes(self, numero=None, nombre=None, direccion=None, limit=None):
         self.logger.info(f"Listando clientes con filtros: numero={numero}, nombre={nombre}, direccion={direccion}")
-        return self._client_repository.get_clientes(numero, nombre, direccion)
+        return self._client_repository.get_clientes(numero, nombre, direccion, limit)
 
     def update_client_partial(self, numero: str, update_data: dict) -> bool:
         return self._client_repository.update_client_partial(numero, update_data)
@@ -61,6 +61,12 @@ class ContactoService:
             self.logger.error(f"Error al obtener contactos: {e}")
             raise
 
+    def get_all_contactos_trusted(self) -> List[dict]:
+        """
+        Obtener todos los contactos como dicts, sin revalidarlos (lectura de confianza).
+        """
+        return self._contacto_repository.get_all_contactos_trusted()
+
     def get_first_contacto(self) -> Optional[Contacto]:
         """
         Obtener el primer contacto de la base de datos.
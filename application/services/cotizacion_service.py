@@ -1,14 +1,18 @@
+import logging
 from typing import Optional
-from .email_service import EmailService
+from .email_outbox_service import EmailOutboxService
+
+logger = logging.getLogger(__name__)
 
 
 class CotizacionService:
-    def __init__(self):
-        self.email_service = EmailService()
+    def __init__(self, email_outbox_service: EmailOutboxService):
+        self.email_outbox_service = email_outbox_service
 
     async def procesar_cotizacion(self, mensaje: str, latitud: Optional[float] = None, longitud: Optional[float] = None) -> dict:
         """
-        Procesa una cotización recibiendo un mensaje, lo muestra en consola y envía por correo.
+        Procesa una cotización recibiendo un mensaje, lo registra en el log y encola el correo.
+        El envío lo hace en segundo plano EmailOutboxService, con reintentos.
         
         Args:
             mensaje (str): El mensaje de la cotización
@@ -19,29 +23,25 @@ class CotizacionService:
             dict: Respuesta con el estado del procesamiento
         """
         try:
-            # Mostrar el mensaje en consola
-            print(f"=== COTIZACIÓN RECIBIDA ===")
-            print(f"Mensaje: {mensaje}")
-            if latitud is not None and longitud is not None:
-                print(f"Coordenadas: {latitud}, {longitud}")
-            print(f"==========================")
+            # El contenido del mensaje solo se registra en DEBUG
+            logger.info("Cotización recibida (%d caracteres, con ubicación: %s)",
+                        len(mensaje), latitud is not None and longitud is not None)
+            logger.debug("Cotización: %s (coordenadas: %s, %s)", mensaje, latitud, longitud)
             
-            # Enviar por correo electrónico
-            email_result = await self.email_service.enviar_cotizacion(mensaje, latitud=latitud, longitud=longitud)
+            # Encolar el correo electrónico (el envío es asíncrono)
+            outbox_id = self.email_outbox_service.enqueue_cotizacion(mensaje, latitud=latitud, longitud=longitud)
             
             return {
                 "success": True,
                 "message": "Cotización procesada exitosamente",
                 "mensaje_recibido": mensaje,
-                "email_enviado": email_result["success"],
-                "email_mensaje": email_result["message"],
-                "destinatario": email_result.get("destinatario")
+                "email_encolado": True,
+                "outbox_id": outbox_id
             }
         except Exception as e:
             return {
                 "success": False,
                 "message": f"Error al procesar cotización: {str(e)}",
                 "mensaje_recibido": None,
-                "email_enviado": False,
-                "email_mensaje": f"Error: {str(e)}"
-            } 
\ No newline at end of file
+                "email_encolado": False
+            } 
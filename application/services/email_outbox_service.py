@@ -0,0 +1,201 @@
+import asyncio
+import os
+import random
+import time
+import logging
+from typing import List, Optional
+
+from infrastucture.observability.metrics_registry import MetricFamily
+from infrastucture.repositories.email_outbox_repository import EmailOutboxRepository
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutboxService:
+    """
+    Envía en segundo plano los correos encolados en la outbox, con reintentos
+    y backoff exponencial.
+
+    Puede trabajar de dos formas:
+    - process_pending(): vacía lo que esté listo, en lotes sobre una misma sesión SMTP
+      (se lanza como BackgroundTask tras encolar).
+    - run_forever(): bucle continuo para despliegues con proceso persistente
+      (se activa con EMAIL_OUTBOX_WORKER=true).
+    """
+
+    def __init__(self, outbox_repo: EmailOutboxRepository, email_service=None):
+        self.outbox_repo = outbox_repo
+        self._email_service = email_service
+        self.max_attempts = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "8"))
+        self.backoff_base = float(os.getenv("EMAIL_OUTBOX_BACKOFF_SECONDS", "30"))
+        self.backoff_max = float(os.getenv("EMAIL_OUTBOX_BACKOFF_MAX_SECONDS", "3600"))
+        self.lease_seconds = float(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", "300"))
+        self.poll_interval = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "5"))
+        self.batch_size = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50"))
+        self._drain_lock: Optional[asyncio.Lock] = None
+
+        # Contadores del proceso para /metrics (el scrape no consulta la outbox)
+        self.enqueued = 0
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+        self._last_depth: Optional[int] = None
+        self._last_depth_at: Optional[float] = None
+
+    @property
+    def email_service(self):
+        # Se crea al primer envío para no configurar SMTP en el arranque
+        if self._email_service is None:
+            from application.services.email_service import EmailService
+            self._email_service = EmailService()
+        return self._email_service
+
+    def enqueue_cotizacion(self, mensaje: str, latitud: Optional[float] = None,
+                           longitud: Optional[float] = None, destinatario: Optional[str] = None) -> str:
+        """
+        Encola el correo de una cotización. Retorna el id del mensaje en la outbox.
+        """
+        message_id = self.outbox_repo.enqueue("cotizacion", {
+            "mensaje": mensaje,
+            "latitud": latitud,
+            "longitud": longitud,
+            "destinatario": destinatario
+        })
+        self.enqueued += 1
+        return message_id
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_base * (2 ** (attempts - 1)), self.backoff_max)
+        # Jitter para que los reintentos de varios mensajes no coincidan
+        return delay * random.uniform(0.8, 1.2)
+
+    def _send_deadline(self, claimed_at: float) -> float:
+        """
+        Hasta cuándo (time.monotonic()) pueden durar los envíos de un lote cuyo primer
+        mensaje se reclamó en `claimed_at`. El emisor corta cada envío al llegar al plazo,
+        así que todos terminan dentro del lease y ninguna otra instancia reclama y reenvía
+        el mismo mensaje. Se reserva un timeout SMTP para cerrar la sesión tras un envío
+        cortado y marcar los resultados en la outbox.
+        """
+        return claimed_at + self.lease_seconds - self.email_service.sender.timeout
+
+    def _build(self, message: dict):
+        if message["tipo"] == "cotizacion":
+            return self.email_service.construir_cotizacion(**message["payload"])
+        raise ValueError(f"Tipo de mensaje desconocido: {message['tipo']}")
+
+    async def _send_batch(self, messages: List[dict], deadline: Optional[float] = None) -> List[dict]:
+        """
+        Construye los correos y los envía en lote sobre una sola sesión SMTP, cortando los
+        envíos que no terminen antes de `deadline` (time.monotonic()).
+        """
+        results: List[Optional[dict]] = [None] * len(messages)
+        to_send = []
+        for i, message in enumerate(messages):
+            try:
+                to_send.append((i, self._build(message)))
+            except Exception as e:
+                results[i] = {"success": False, "message": str(e)}
+
+        if to_send:
+            try:
+                send_results = await self.email_service.enviar_lote([email for _, email in to_send], deadline)
+            except Exception as e:
+                send_results = [{"success": False, "message": str(e)}] * len(to_send)
+            for (i, _), result in zip(to_send, send_results):
+                results[i] = result
+        return results
+
+    async def process_pending(self, max_messages: int = 200) -> int:
+        """
+        Envía los mensajes listos de la outbox en lotes de EMAIL_OUTBOX_BATCH_SIZE.
+        Retorna cuántos se enviaron.
+        """
+        sent = 0
+        if self._drain_lock is None:
+            self._drain_lock = asyncio.Lock()
+        async with self._drain_lock:
+            remaining = max_messages
+            while remaining > 0:
+                claimed = []
+                # El lease del primer mensaje empieza a contar aquí
+                claimed_at = time.monotonic()
+                for _ in range(min(self.batch_size, remaining)):
+                    message = self.outbox_repo.claim_next(self.lease_seconds)
+                    if message is None:
+                        break
+                    claimed.append(message)
+                if not claimed:
+                    break
+                remaining -= len(claimed)
+
+                results = await self._send_batch(claimed, self._send_deadline(claimed_at))
+                released = 0
+                for message, result in zip(claimed, results):
+                    if result.get("success"):
+                        self.outbox_repo.mark_sent(message["_id"])
+                        sent += 1
+                        self.sent += 1
+                        continue
+                    if result.get("no_intentado"):
+                        self.outbox_repo.release(message["_id"], self.backoff_base)
+                        released += 1
+                        continue
+
+                    attempts = message.get("attempts", 1)
+                    retry_in = None if attempts >= self.max_attempts else self._backoff(attempts)
+                    self.outbox_repo.mark_failed(message["_id"], result.get("message", ""), retry_in)
+                    if retry_in is None:
+                        self.dead += 1
+                        logger.error(f"❌ Correo {message['_id']} descartado tras {attempts} intentos: {result.get('message')}")
+                    else:
+                        self.retried += 1
+                        logger.warning(f"⚠️ Fallo enviando correo {message['_id']} (intento {attempts}), reintento en {retry_in:.0f}s")
+                if released:
+                    # Sesión SMTP caída o lote fuera de plazo: no seguir reclamando
+                    logger.warning(f"⚠️ {released} correos devueltos a la outbox sin intentar")
+                    break
+        return sent
+
+    async def run_forever(self) -> None:
+        logger.info("Worker de la outbox de correos iniciado")
+        while True:
+            try:
+                await self.process_pending()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Error en el worker de la outbox de correos: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def get_stats(self) -> dict:
+        stats = self.outbox_repo.get_stats()
+        self._last_depth = stats["depth"]
+        self._last_depth_at = time.monotonic()
+        if self._email_service is not None:
+            stats["smtp"] = self._email_service.sender.get_stats()
+        return stats
+
+    def metric_families(self) -> List[MetricFamily]:
+        """
+        Métricas de la outbox desde los contadores en memoria. La profundidad es la
+        última leída por get_stats() (endpoint de métricas de la outbox), con su antigüedad.
+        """
+        families = [
+            MetricFamily("suncar_email_outbox_enqueued_total", "counter", "Correos encolados").add(self.enqueued),
+            MetricFamily("suncar_email_outbox_sent_total", "counter", "Correos enviados desde la outbox").add(self.sent),
+            MetricFamily("suncar_email_outbox_retries_total", "counter",
+                         "Envíos fallidos reprogramados con backoff").add(self.retried),
+            MetricFamily("suncar_email_outbox_dead_total", "counter",
+                         "Correos descartados tras agotar los intentos").add(self.dead),
+        ]
+        if self._last_depth is not None:
+            families.append(MetricFamily(
+                "suncar_email_outbox_depth", "gauge", "Correos pendientes o en envío (última lectura)"
+            ).add(self._last_depth))
+            families.append(MetricFamily(
+                "suncar_email_outbox_depth_age_seconds", "gauge", "Antigüedad de la última lectura de la profundidad"
+            ).add(round(time.monotonic() - self._last_depth_at, 1)))
+        if self._email_service is not None:
+            families.extend(self._email_service.sender.metric_families())
+        return families
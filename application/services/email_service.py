@@ -1,26 +1,71 @@
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig
-from typing import Optional
+from email.message import EmailMessage
+from email.utils import formataddr
+from typing import List, Optional
 import os
 from dotenv import load_dotenv
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup, escape
+
+from infrastucture.external_services.smtp_sender import SMTPBatchAborted, SMTPSender, get_smtp_sender
 
 load_dotenv()
 
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "emailtemplates")
+
+
+def _nl2br(texto) -> Markup:
+    # Escapa el texto y convierte los saltos de línea en <br>
+    return Markup("<br>").join(escape(linea) for linea in str(texto).split("\n"))
+
+
+# Las plantillas se compilan una sola vez al importar el módulo; auto_reload=False evita
+# revisar el archivo en cada render. Con autoescape el texto del cliente no puede inyectar HTML.
+_templates = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False
+)
+_templates.filters["nl2br"] = _nl2br
+_cotizacion_template = _templates.get_template("cotizacion.html")
+
+
 class EmailService:
-    def __init__(self):
-        # Configuración del servidor de correo (Gmail con datos reales)
-        self.config = ConnectionConfig(
-            MAIL_USERNAME=os.getenv("MAIL_USERNAME", "alexandercalero42@gmail.com"),
-            MAIL_PASSWORD=os.getenv("MAIL_PASSWORD"),
-            MAIL_FROM=os.getenv("MAIL_FROM", "rubianclaude@gmail.com"),
-            MAIL_PORT=587,
-            MAIL_SERVER="smtp.gmail.com",
-            MAIL_FROM_NAME="SunCar Sistema",
-            MAIL_STARTTLS=True,
-            MAIL_SSL_TLS=False,
-            USE_CREDENTIALS=True
-        )
-        self.fastmail = FastMail(self.config)
-    
+    def __init__(self, sender: Optional[SMTPSender] = None):
+        # Emisor SMTP compartido: reutiliza una sesión autenticada entre envíos
+        self.sender = sender or get_smtp_sender()
+        self.mail_from = os.getenv("MAIL_FROM", "rubianclaude@gmail.com")
+        self.mail_from_name = os.getenv("MAIL_FROM_NAME", "SunCar Sistema")
+
+    def construir_cotizacion(self, mensaje: str, destinatario: str = None, latitud: Optional[float] = None, longitud: Optional[float] = None) -> EmailMessage:
+        """
+        Construye el correo de una cotización sin enviarlo.
+
+        Args:
+            mensaje (str): El mensaje de la cotización
+            destinatario (str): Email del destinatario (por defecto usa el de la variable de entorno)
+            latitud (Optional[float]): Latitud de la ubicación para mostrar mapa
+            longitud (Optional[float]): Longitud de la ubicación para mostrar mapa
+
+        Returns:
+            EmailMessage: Mensaje listo para enviar
+        """
+        # Email desde variable de entorno
+        if not destinatario:
+            destinatario = os.getenv("MAIL_TO", "hernandzruben9@gmail.com")
+
+        # Crear el mensaje
+        message = EmailMessage()
+        message["Subject"] = "Nueva Cotización Recibida - SunCar"
+        message["From"] = formataddr((self.mail_from_name, self.mail_from))
+        message["To"] = destinatario
+        message.set_content(_cotizacion_template.render(
+            mensaje=mensaje,
+            latitud=latitud,
+            longitud=longitud,
+            mail_from=self.mail_from
+        ), subtype="html")
+        return message
+
     async def enviar_cotizacion(self, mensaje: str, destinatario: str = None, latitud: Optional[float] = None, longitud: Optional[float] = None) -> dict:
         """
         Envía una cotización por correo electrónico.
@@ -35,69 +80,11 @@ class EmailService:
             dict: Respuesta con el estado del envío
         """
         try:
-            # Email desde variable de entorno
-            if not destinatario:
-                destinatario = os.getenv("MAIL_TO", "hernandzruben9@gmail.com")
-            
-            # Generar contenido del mapa si hay coordenadas
-            mapa_html = ""
-            if latitud is not None and longitud is not None:
-                mapa_html = f"""
-                    <div style="margin: 20px 0; padding: 15px; border: 2px solid #e0e0e0; border-radius: 8px; background-color: #f9f9f9;">
-                        <h3 style="color: #333; margin-top: 0;">📍 Ubicación de la Cotización</h3>
-                        <p><strong>Coordenadas:</strong> {latitud}, {longitud}</p>
-                        
-                        <div style="background-color: #fff; border: 1px solid #ddd; border-radius: 4px; padding: 10px; margin: 10px 0;">
-                            <p style="margin: 5px 0;"><strong>🌐 Latitud:</strong> {latitud}</p>
-                            <p style="margin: 5px 0;"><strong>🌐 Longitud:</strong> {longitud}</p>
-                        </div>
-                        
-                        <div style="text-align: center; margin: 15px 0;">
-                            <a href="https://www.google.com/maps?q={latitud},{longitud}" target="_blank" 
-                               style="display: inline-block; background-color: #1a73e8; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; font-weight: bold;">
-                                🗺️ Ver Ubicación en Google Maps
-                            </a>
-                        </div>
-                        
-                        <div style="text-align: center; margin: 10px 0;">
-                            <a href="https://maps.apple.com/?q={latitud},{longitud}" target="_blank" 
-                               style="display: inline-block; background-color: #007aff; color: white; padding: 8px 16px; text-decoration: none; border-radius: 5px; font-size: 14px; margin: 0 5px;">
-                                🍎 Apple Maps
-                            </a>
-                            <a href="https://www.openstreetmap.org/?mlat={latitud}&mlon={longitud}&zoom=15" target="_blank" 
-                               style="display: inline-block; background-color: #7ebc6f; color: white; padding: 8px 16px; text-decoration: none; border-radius: 5px; font-size: 14px; margin: 0 5px;">
-                                🌍 OpenStreetMap
-                            </a>
-                        </div>
-                        
-                        <p style="font-size: 12px; color: #666; text-align: center; margin-bottom: 0;">
-                            Haga clic en cualquier enlace para ver la ubicación en su aplicación de mapas preferida
-                        </p>
-                    </div>
-                """
+            message = self.construir_cotizacion(mensaje, destinatario, latitud=latitud, longitud=longitud)
+            destinatario = message["To"]
             
-            # Crear el mensaje
-            message = MessageSchema(
-                subject="Nueva Cotización Recibida - SunCar",
-                recipients=[destinatario],
-                body=f"""
-                <html>
-                <body>
-                    <h2>Nueva Cotización Recibida</h2>
-                    <p><strong>Mensaje:</strong></p>
-                    <p>{mensaje.replace(chr(10), '<br>')}</p>
-                    {mapa_html}
-                    <br>
-                    <p>Este es un mensaje automático del sistema SunCar.</p>
-                    <p><small>Enviado desde: rubianclaude@gmail.com</small></p>
-                </body>
-                </html>
-                """,
-                subtype="html"
-            )
-            
-            # Enviar el correo
-            await self.fastmail.send_message(message)
+            # Enviar el correo por la sesión SMTP compartida
+            await self.sender.send(message)
             
             return {
                 "success": True,
@@ -110,4 +97,21 @@ class EmailService:
                 "success": False,
                 "message": f"Error al enviar correo: {str(e)}",
                 "destinatario": destinatario
-            } 
\ No newline at end of file
+            }
+
+    async def enviar_lote(self, mensajes: List[EmailMessage], deadline: Optional[float] = None) -> List[dict]:
+        """
+        Envía varios correos ya construidos sobre una misma sesión SMTP.
+
+        Returns:
+            List[dict]: Estado del envío de cada mensaje, en el mismo orden. Los que no se
+            llegaron a intentar (sesión caída o pasado `deadline`) llevan "no_intentado".
+        """
+        errores = await self.sender.send_batch(mensajes, deadline)
+        return [
+            {"success": True, "message": f"Correo enviado exitosamente a {m['To']}", "destinatario": m["To"]}
+            if error is None else
+            {"success": False, "message": f"Error al enviar correo: {str(error)}", "destinatario": m["To"],
+             "no_intentado": isinstance(error, SMTPBatchAborted)}
+            for m, error in zip(mensajes, errores)
+        ]
@@ -21,9 +21,26 @@ class FormService:
     def get_reportes(self, tipo_reporte=None, cliente_numero=None, fecha_inicio=None, fecha_fin=None, lider_ci=None, descripcion=None, q=None):
         return self._form_repository.get_reportes(tipo_reporte, cliente_numero, fecha_inicio, fecha_fin, lider_ci, descripcion, q)
 
+    def buscar_reportes(self, q: str, page: int = 1, limit: int = 50, tipo_reporte=None, cliente_numero=None,
+                        fecha_inicio=None, fecha_fin=None, lider_ci=None) -> dict:
+        return self._form_repository.buscar_reportes(q, page, limit, tipo_reporte, cliente_numero, fecha_inicio, fecha_fin, lider_ci)
+
     def get_reportes_view(self, tipo_reporte=None, cliente_numero=None, fecha_inicio=None, fecha_fin=None, lider_ci=None):
         return self._form_repository.get_reportes_view(tipo_reporte, cliente_numero, fecha_inicio, fecha_fin, lider_ci)
 
+    def refrescar_reportes_view(self) -> None:
+        """
+        Refresco incremental de la copia materializada de reportes_view tras guardar un
+        reporte (BackgroundTask). Si ya hay uno en curso no espera.
+        """
+        if self._form_repository.reportes_view is None:
+            return
+        try:
+            self._form_repository.reportes_view.refrescar(esperar=False)
+        except Exception:
+            # Ya registrado; lo reintenta el siguiente refresco
+            pass
+
     def get_reporte_by_id(self, reporte_id: str) -> dict:
         return self._form_repository.get_reporte_by_id(reporte_id)
 
@@ -16,10 +16,10 @@ class LeadsService:
         Crear un nuevo lead.
         Retorna el ID del lead creado.
         """
-        self.logger.info(f"Creando lead: {lead}")
+        self.logger.debug("Creando lead")
         try:
             lead_id = self._leads_repository.create_lead(lead)
-            self.logger.info(f"Lead creado con ID: {lead_id}")
+            self.logger.debug("Lead creado con ID: %s", lead_id)
             return lead_id
         except Exception as e:
             self.logger.error(f"Error al crear lead: {e}")
@@ -29,37 +29,45 @@ class LeadsService:
         """
         Obtener un lead por su ID.
         """
-        self.logger.info(f"Obteniendo lead por ID: {lead_id}")
+        self.logger.debug("Obteniendo lead por ID: %s", lead_id)
         try:
             lead = self._leads_repository.find_lead_by_id(lead_id)
-            self.logger.info(f"Lead encontrado: {lead}")
+            self.logger.debug("Lead encontrado: %s", lead is not None)
             return lead
         except Exception as e:
             self.logger.error(f"Error al obtener lead: {e}")
             raise
 
-    def get_leads(self, nombre=None, telefono=None, estado=None, fuente=None):
+    def get_leads(self, nombre=None, telefono=None, estado=None, fuente=None, limit=None):
         """
         Obtener leads con filtros opcionales.
         """
-        self.logger.info(f"Listando leads con filtros: nombre={nombre}, telefono={telefono}, estado={estado}, fuente={fuente}")
+        self.logger.debug(
+            "Listando leads con filtros: nombre=%s, telefono=%s, estado=%s, fuente=%s", nombre, telefono, estado, fuente
+        )
         try:
-            leads = self._leads_repository.get_leads(nombre, telefono, estado, fuente)
-            self.logger.info(f"Leads encontrados: {len(leads)}")
+            leads = self._leads_repository.get_leads(nombre, telefono, estado, fuente, limit)
+            self.logger.debug("Leads encontrados: %d", len(leads))
             return leads
         except Exception as e:
             self.logger.error(f"Error al obtener leads: {e}")
             raise
 
+    def get_leads_trusted(self, nombre=None, telefono=None, estado=None, fuente=None, limit=None) -> List[dict]:
+        """
+        Obtener leads con filtros opcionales como dicts, sin revalidarlos (lectura de confianza).
+        """
+        return self._leads_repository.get_leads_trusted(nombre, telefono, estado, fuente, limit)
+
     def update_lead(self, lead_id: str, update_data: LeadUpdateRequest) -> bool:
         """
         Actualizar un lead existente.
         Retorna True si se actualizó correctamente, False si no se encontró.
         """
-        self.logger.info(f"Actualizando lead {lead_id} con datos: {update_data}")
+        self.logger.debug("Actualizando lead %s", lead_id)
         try:
             result = self._leads_repository.update_lead(lead_id, update_data)
-            self.logger.info(f"Lead actualizado: {result}")
+            self.logger.debug("Lead actualizado: %s", result)
             return result
         except Exception as e:
             self.logger.error(f"Error al actualizar lead: {e}")
@@ -69,10 +77,10 @@ class LeadsService:
         """
         Eliminar un lead por su ID.
         """
-        self.logger.info(f"Eliminando lead: {lead_id}")
+        self.logger.debug("Eliminando lead: %s", lead_id)
         try:
             result = self._leads_repository.delete_lead(lead_id)
-            self.logger.info(f"Lead eliminado: {result}")
+            self.logger.debug("Lead eliminado: %s", result)
             return result
         except Exception as e:
             self.logger.error(f"Error al eliminar lead: {e}")
@@ -82,10 +90,10 @@ class LeadsService:
         """
         Buscar leads por teléfono (puede haber duplicados).
         """
-        self.logger.info(f"Buscando leads por teléfono: {telefono}")
+        self.logger.debug("Buscando leads por teléfono: %s", telefono)
         try:
             leads = self._leads_repository.find_leads_by_telefono(telefono)
-            self.logger.info(f"Leads encontrados por teléfono: {len(leads)}")
+            self.logger.debug("Leads encontrados por teléfono: %d", len(leads))
             return leads
         except Exception as e:
             self.logger.error(f"Error al buscar leads por teléfono: {e}")
@@ -95,11 +103,11 @@ class LeadsService:
         """
         Verificar si existe un lead por su ID.
         """
-        self.logger.info(f"Verificando existencia de lead: {lead_id}")
+        self.logger.debug("Verificando existencia de lead: %s", lead_id)
         try:
             lead = self._leads_repository.find_lead_by_id(lead_id)
             exists = lead is not None
-            self.logger.info(f"Lead existe: {exists}")
+            self.logger.debug("Lead existe: %s", exists)
             return exists
         except Exception as e:
             self.logger.error(f"Error al verificar lead: {e}")
@@ -1,8 +1,32 @@
+import os
+import time
 from typing import List, Optional, Union
 
 from domain.entities.oferta import Oferta, OfertaSimplificada
+from infrastucture.observability.metrics_registry import cache_metric_families, metrics_registry
 from infrastucture.repositories.ofertas_repository import OfertasRepository
 
+# Tiempo máximo que se reutiliza el contexto pre-renderizado aunque la versión local
+# no haya cambiado (otras instancias pueden haber modificado el catálogo)
+CONTEXTO_TTL_SECONDS = float(os.getenv("OFERTAS_CONTEXTO_TTL_SECONDS", "300"))
+
+# Caché del contexto del recomendador, compartida entre instancias del servicio
+_contexto_cache = {"version": None, "expires_at": 0.0, "value": None, "hits": 0, "misses": 0}
+
+metrics_registry.register("ofertas_contexto_cache", lambda: cache_metric_families(
+    "ofertas_contexto", _contexto_cache["hits"], _contexto_cache["misses"]
+))
+
+
+def renderizar_contexto_ofertas(ofertas: List[dict]) -> str:
+    """
+    Renderiza las ofertas en el formato compacto que se envía al LLM.
+    """
+    return "\n".join(
+        f"ID: {oferta['id']} | ${oferta['precio']} | {oferta['descripcion_ia']}"
+        for oferta in ofertas
+    )
+
 
 class OfertaService:
     def __init__(self, ofertas_repository: OfertasRepository):
@@ -11,6 +35,12 @@ class OfertaService:
     async def get_all(self) -> List[Oferta]:
         return self.ofertas_repository.get_all()
 
+    async def get_all_trusted(self) -> List[dict]:
+        return self.ofertas_repository.get_all_trusted()
+
+    async def get_all_simplified_trusted(self) -> List[dict]:
+        return self.ofertas_repository.get_all_simplified_trusted()
+
     async def get_all_simplified(self) -> List[OfertaSimplificada]:
         ofertas = self.ofertas_repository.get_all()
         return [
@@ -58,6 +88,30 @@ class OfertaService:
         """
         return self.ofertas_repository.obtener_datos_minimos_ofertas()
 
+    async def obtener_contexto_recomendador(self) -> dict:
+        """
+        Obtiene el contexto de ofertas pre-renderizado para el recomendador IA.
+        Se cachea por versión del catálogo (y con TTL), así que solo se consulta
+        y renderiza de nuevo cuando cambian las ofertas.
+
+        Retorna: {"ofertas": datos mínimos, "contexto": texto para el prompt, "version": versión}
+        """
+        version = self.ofertas_repository.catalog_version
+        now = time.monotonic()
+        if _contexto_cache["version"] == version and now < _contexto_cache["expires_at"]:
+            _contexto_cache["hits"] += 1
+            return _contexto_cache["value"]
+        _contexto_cache["misses"] += 1
+
+        ofertas = self.ofertas_repository.obtener_datos_minimos_ofertas()
+        value = {
+            "ofertas": ofertas,
+            "contexto": renderizar_contexto_ofertas(ofertas),
+            "version": version
+        }
+        _contexto_cache.update(version=version, expires_at=now + CONTEXTO_TTL_SECONDS, value=value)
+        return value
+
     async def obtener_ofertas_por_ids(self, ids_ofertas: List[str]) -> List[OfertaSimplificada]:
         """
         Obtiene ofertas en formato simplificado por lista de IDs manteniendo el orden.
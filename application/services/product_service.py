@@ -16,6 +16,12 @@ class ProductService:
         """
         return  self.productos_repository.get_all_products()
 
+    async def get_all_products_trusted(self) -> List[dict]:
+        """
+        Obtiene todos los productos del catálogo como dicts, sin revalidarlos (lectura de confianza).
+        """
+        return self.productos_repository.get_all_products_trusted()
+
     async def get_unique_categories(self) -> List[Cataegoria]:
         """
         Obtiene todas las categorías únicas de productos.
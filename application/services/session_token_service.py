@@ -0,0 +1,118 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from typing import Optional
+
+
+class SessionTokenError(Exception):
+    """Token de sesión mal formado, con firma inválida o expirado."""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class SessionTokenService:
+    """
+    Emite y verifica tokens de sesión firmados (JWT HS256) para los jefes de brigada.
+
+    El token lleva el CI del trabajador y el id de su brigada, así que el middleware
+    puede autenticar cada request sin consultar MongoDB. Hay dos tipos:
+    - access: vida corta (SESSION_TOKEN_TTL_SECONDS), se manda en cada request.
+    - refresh: vida larga (SESSION_REFRESH_TTL_SECONDS), solo sirve para pedir un access nuevo.
+      Es de un solo uso (jti) y lleva la huella de la contraseña, para que AuthService
+      compruebe en cada renovación que el trabajador sigue igual (ver refrescar_sesion).
+
+    Ningún token vive más allá del fin de su sesión (sesion_exp), fijado en el login a
+    SESSION_MAX_AGE_SECONDS y que las renovaciones conservan: pasado ese plazo hay que
+    volver a hacer login.
+
+    Sin SESSION_TOKEN_SECRET el servicio queda deshabilitado y el login no emite tokens.
+    """
+
+    ACCESS = "access"
+    REFRESH = "refresh"
+
+    _HEADER = _b64encode(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+
+    def __init__(self, secret: Optional[str] = None, access_ttl: Optional[int] = None,
+                 refresh_ttl: Optional[int] = None):
+        secret = secret if secret is not None else os.getenv("SESSION_TOKEN_SECRET")
+        self._secret = secret.encode() if secret else None
+        self.access_ttl = access_ttl or int(os.getenv("SESSION_TOKEN_TTL_SECONDS", "900"))
+        self.refresh_ttl = refresh_ttl or int(os.getenv("SESSION_REFRESH_TTL_SECONDS", "604800"))
+        self.max_age = int(os.getenv("SESSION_MAX_AGE_SECONDS", "2592000"))
+
+    @property
+    def enabled(self) -> bool:
+        return self._secret is not None
+
+    def _sign(self, signing_input: str) -> str:
+        return _b64encode(hmac.new(self._secret, signing_input.encode("ascii"), hashlib.sha256).digest())
+
+    def _encode(self, ci: str, brigada_id: Optional[str], tipo: str, ttl: int, sesion_exp: int,
+                **extra) -> str:
+        now = int(time.time())
+        payload = {
+            "sub": ci, "brigada_id": brigada_id, "typ": tipo, "jti": secrets.token_urlsafe(16),
+            "iat": now, "exp": min(now + ttl, sesion_exp), "sesion_exp": sesion_exp, **extra
+        }
+        signing_input = f"{self._HEADER}.{_b64encode(json.dumps(payload, separators=(',', ':')).encode())}"
+        return f"{signing_input}.{self._sign(signing_input)}"
+
+    def huella(self, contraseña: str) -> str:
+        """
+        Huella de la contraseña para el refresh token (HMAC con el secreto: no permite
+        recuperarla). Si la contraseña cambia, los refresh tokens anteriores dejan de servir.
+        """
+        return self._sign(f"pwd:{contraseña}")[:22]
+
+    def emitir(self, ci: str, brigada_id: Optional[str], contraseña: str,
+               sesion_exp: Optional[int] = None) -> Optional[dict]:
+        """
+        Emite el par de tokens de una sesión. Sin sesion_exp es una sesión nueva (login).
+        Retorna None si el servicio está deshabilitado.
+        """
+        if not self.enabled:
+            return None
+        if sesion_exp is None:
+            sesion_exp = int(time.time()) + self.max_age
+        access = self._encode(ci, brigada_id, self.ACCESS, self.access_ttl, sesion_exp)
+        return {
+            "token": access,
+            "refresh_token": self._encode(ci, brigada_id, self.REFRESH, self.refresh_ttl, sesion_exp,
+                                          pwd=self.huella(contraseña)),
+            "expires_in": max(0, min(self.access_ttl, sesion_exp - int(time.time())))
+        }
+
+    def verificar(self, token: str, tipo: str = ACCESS) -> dict:
+        """
+        Verifica firma, tipo y expiración del token y retorna sus claims.
+        Lanza SessionTokenError si no es válido.
+        """
+        if not self.enabled:
+            raise SessionTokenError("Tokens de sesión no configurados en el servidor")
+        try:
+            header, payload, signature = token.split(".")
+        except ValueError:
+            raise SessionTokenError("Token inválido")
+        # Solo aceptamos la cabecera que emitimos nosotros (evita alg=none y similares)
+        if header != self._HEADER or not hmac.compare_digest(signature, self._sign(f"{header}.{payload}")):
+            raise SessionTokenError("Token inválido")
+        try:
+            claims = json.loads(_b64decode(payload))
+        except ValueError:
+            raise SessionTokenError("Token inválido")
+        if claims.get("typ") != tipo:
+            raise SessionTokenError("Token inválido")
+        if claims.get("exp", 0) < time.time():
+            raise SessionTokenError("Token expirado")
+        return claims
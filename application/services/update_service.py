@@ -1,3 +1,4 @@
+import logging
 from datetime import datetime, timezone
 from typing import List, Optional
 from domain.entities.update import DataUpdateRequest, DataUpdateResponse, AppUpdateRequest, AppUpdateResponse
@@ -6,6 +7,8 @@ from application.services.worker_service import WorkerService
 from application.services.client_service import ClientService
 from infrastucture.repositories.update_repository import UpdateRepository
 
+logger = logging.getLogger(__name__)
+
 
 class UpdateService:
     def __init__(
@@ -61,31 +64,34 @@ class UpdateService:
         Verifica si la aplicación está actualizada consultando la BD
         """
         try:
-            print(f"[DEBUG] Checking updates for platform: {request.platform}, current_version: {request.current_version}")
+            logger.debug("Checking updates for platform: %s, current_version: %s", request.platform, request.current_version)
             
             platform_config = self.update_repository.get_app_version_config(request.platform)
             if not platform_config:
                 raise ValueError(f"Plataforma no soportada: {request.platform}")
             
-            print(f"[DEBUG] Platform config found: latest_version={platform_config.latest_version}, min_version={platform_config.min_version}")
+            logger.debug(
+                "Platform config found: latest_version=%s, min_version=%s",
+                platform_config.latest_version, platform_config.min_version
+            )
             
             current_version = request.current_version
             latest_version = platform_config.latest_version
             
-            print(f"[DEBUG] Comparing versions: current='{current_version}' vs latest='{latest_version}'")
+            logger.debug("Comparing versions: current='%s' vs latest='%s'", current_version, latest_version)
             
             is_up_to_date = self._compare_versions(current_version, latest_version) >= 0
             
-            print(f"[DEBUG] Is up to date: {is_up_to_date}")
+            logger.debug("Is up to date: %s", is_up_to_date)
             
             if is_up_to_date:
                 return AppUpdateResponse(is_up_to_date=True)
             
             # Verificar si es actualización forzada
-            print(f"[DEBUG] Checking force update: current='{current_version}' vs min='{platform_config.min_version}'")
+            logger.debug("Checking force update: current='%s' vs min='%s'", current_version, platform_config.min_version)
             force_update = self._compare_versions(current_version, platform_config.min_version) < 0
             
-            print(f"[DEBUG] Force update: {force_update}")
+            logger.debug("Force update: %s", force_update)
             
             return AppUpdateResponse(
                 is_up_to_date=False,
@@ -96,7 +102,7 @@ class UpdateService:
                 force_update=force_update
             )
         except Exception as e:
-            print(f"[ERROR] Exception in check_app_updates: {str(e)}")
+            logger.error("❌ Exception in check_app_updates: %s", e)
             raise Exception(f"Error verificando actualizaciones de app: {str(e)}")
 
     def _get_products_last_update(self) -> datetime:
@@ -164,5 +170,5 @@ class UpdateService:
             
         except Exception as e:
             # En caso de error, asumir que las versiones son iguales
-            print(f"Error comparing versions '{version1}' and '{version2}': {str(e)}")
+            logger.warning("⚠️ Error comparing versions '%s' and '%s': %s", version1, version2, e)
             return 0 
\ No newline at end of file
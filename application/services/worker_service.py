@@ -1,5 +1,5 @@
 # application/services/worker_service.py
-from typing import List
+from typing import List, Optional
 from fastapi import Depends
 
 from domain.entities.trabajador import Trabajador
@@ -18,11 +18,17 @@ class WorkerService:
         """
         return self.worker_repo.get_all_workers()
 
+    async def get_all_workers_trusted(self) -> List[dict]:
+        """
+        Obtains all workers as dicts, without re-validating them (trusted read).
+        """
+        return self.worker_repo.get_all_workers_trusted()
+
     async def create_worker(self, ci: str, nombre: str, contrasena: str = None) -> str:
         return self.worker_repo.create_worker(ci, nombre, contrasena)
 
-    async def search_workers_by_name(self, nombre: str) -> list:
-        return self.worker_repo.search_workers_by_name(nombre)
+    async def search_workers_by_name(self, nombre: str, limit: Optional[int] = None) -> list:
+        return self.worker_repo.search_workers_by_name(nombre, limit)
 
     async def set_worker_password(self, ci: str, contrasena: str) -> bool:
         return self.worker_repo.set_worker_password(ci, contrasena)
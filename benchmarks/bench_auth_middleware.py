@@ -0,0 +1,135 @@
+"""
+Benchmark del coste por request del middleware de autenticación.
+
+Llama directamente a la app ASGI (sin servidor ni cliente HTTP) con una ruta hello-world
+y compara:
+- sin_middleware: la ruta sola, como referencia.
+- base_http_middleware: la implementación anterior sobre BaseHTTPMiddleware.
+- asgi_puro: AuthMiddleware actual.
+
+Uso:
+    python -m benchmarks.bench_auth_middleware --requests 20000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from presentation.middleware.auth_middleware import AuthMiddleware
+
+TOKEN = "token-de-prueba"
+
+
+class AuthMiddlewareAnterior(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        excluded_paths = [
+            "/docs",
+            "/redoc",
+            "/openapi.json",
+            "/api/auth/login",
+            "/api/auth/login-token",
+            "/",
+            "/favicon.ico"
+        ]
+        if request.url.path in excluded_paths:
+            return await call_next(request)
+
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return JSONResponse(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                content={"detail": "Token de autorización requerido"}
+            )
+        token = auth_header.replace("Bearer ", "")
+        if token != TOKEN:
+            return JSONResponse(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                content={"detail": "Token inválido"}
+            )
+        return await call_next(request)
+
+
+def crear_app(middleware=None, **kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/hello")
+    async def hello():
+        return PlainTextResponse("hello")
+
+    if middleware is not None:
+        app.add_middleware(middleware, **kwargs)
+    return app
+
+
+async def medir(app, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/hello",
+        "raw_path": b"/hello",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost"), (b"authorization", f"Bearer {TOKEN}".encode())],
+        "client": ("127.0.0.1", 1234),
+        "server": ("localhost", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    statuses = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    # Calentar (construcción de la pila de middlewares, caches de rutas)
+    for _ in range(100):
+        await app(dict(scope), receive, send)
+    statuses.clear()
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    elapsed = time.perf_counter() - start
+
+    if set(statuses) != {200}:
+        raise RuntimeError(f"Respuestas inesperadas: {set(statuses)}")
+    return elapsed / requests * 1e6
+
+
+async def _run(requests: int) -> dict:
+    variantes = {
+        "sin_middleware": crear_app(),
+        "base_http_middleware": crear_app(AuthMiddlewareAnterior),
+        "asgi_puro": crear_app(AuthMiddleware, auth_token=TOKEN),
+    }
+    us = {nombre: round(await medir(app, requests), 2) for nombre, app in variantes.items()}
+    base = us["sin_middleware"]
+    return {
+        "requests": requests,
+        "us_por_request": us,
+        "overhead_us": {
+            "base_http_middleware": round(us["base_http_middleware"] - base, 2),
+            "asgi_puro": round(us["asgi_puro"] - base, 2),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(_run(args.requests)), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
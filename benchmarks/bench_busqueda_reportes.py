@@ -0,0 +1,112 @@
+"""
+Benchmark de la búsqueda global de reportes (q) sobre una base sembrada con
+benchmarks.datos_sinteticos (100k reportes con --escala 1).
+
+Para cada búsqueda compara:
+- regex: el $or anterior de cinco $regex sin anclar ni índice (recorre la colección).
+- texto: FormRepository.get_reportes(q=...), con el índice de texto y ordenado por
+  relevancia, devolviendo todas las coincidencias.
+- texto_paginado: FormRepository.buscar_reportes(q, page=1, limit=50), lo que pide la app.
+
+Reporta min/mediana en ms, documentos devueltos y, del explain() de MongoDB, los
+documentos y claves examinados. $text no existe en mongomock: hace falta un MongoDB real.
+
+Uso:
+    python -m benchmarks.datos_sinteticos --db suncar_bench --drop
+    python -m benchmarks.bench_busqueda_reportes --db suncar_bench
+"""
+import argparse
+import json
+import logging
+import statistics
+import time
+from typing import Callable, List
+
+# Palabras de las descripciones, nombres de líderes, un tipo de reporte y un número de
+# cliente de los datos sintéticos
+BUSQUEDAS = ["inversor", "paneles", "María", "Pérez Díaz", "averia", "F00000123"]
+
+
+def _regex_anterior(q: str) -> dict:
+    return {"$or": [
+        {"descripcion": {"$regex": q, "$options": "i"}},
+        {"cliente.nombre": {"$regex": q, "$options": "i"}},
+        {"cliente.numero": {"$regex": q, "$options": "i"}},
+        {"brigada.lider.nombre": {"$regex": q, "$options": "i"}},
+        {"tipo_reporte": {"$regex": q, "$options": "i"}},
+    ]}
+
+
+def _explain(collection, query: dict, limit: int = 0) -> dict:
+    stats = collection.find(query).limit(limit).explain()["executionStats"]
+    return {
+        "docs_examinados": stats["totalDocsExamined"],
+        "claves_examinadas": stats["totalKeysExamined"],
+    }
+
+
+def medir(funcion: Callable[[], int], repeticiones: int) -> dict:
+    tiempos: List[float] = []
+    devueltos = 0
+    for i in range(repeticiones + 1):
+        start = time.perf_counter()
+        devueltos = funcion()
+        if i > 0:  # la primera repetición calienta la caché de MongoDB
+            tiempos.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": round(min(tiempos), 2),
+        "mediana_ms": round(statistics.median(tiempos), 2),
+        "devueltos": devueltos,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongodb-url", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="suncar_bench")
+    parser.add_argument("--busquedas", default=",".join(BUSQUEDAS))
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    from pymongo import MongoClient
+    from infrastucture.database.mongo_db.connection import mongo_db
+    from infrastucture.repositories.reportes_repository import FormRepository
+
+    mongo_db.client = MongoClient(args.mongodb_url)
+    mongo_db.database = mongo_db.client[args.db]
+    collection = mongo_db.database["reportes"]
+    repo = FormRepository()
+
+    # La primera búsqueda crea el índice de texto; se mide aparte
+    start = time.perf_counter()
+    repo._ensure_search_index(collection)
+    indice_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    resultado = {
+        "db": args.db,
+        "reportes": collection.estimated_document_count(),
+        "crear_indice_ms": indice_ms,
+        "busquedas": {},
+    }
+    for q in args.busquedas.split(","):
+        resultado["busquedas"][q] = {
+            "regex": {
+                **medir(lambda: len(list(collection.find(_regex_anterior(q)))), args.repeticiones),
+                **_explain(collection, _regex_anterior(q)),
+            },
+            "texto": {
+                **medir(lambda: len(repo.get_reportes(q=q)), args.repeticiones),
+                **_explain(collection, {"$text": {"$search": q}}),
+            },
+            "texto_paginado": {
+                **medir(lambda: len(repo.buscar_reportes(q, page=1, limit=50)["reportes"]), args.repeticiones),
+                **_explain(collection, {"$text": {"$search": q}}, limit=50),
+            },
+        }
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
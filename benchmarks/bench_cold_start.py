@@ -0,0 +1,110 @@
+"""
+Benchmark del arranque en frío (cold start) de la app.
+
+Lanza varias veces un intérprete nuevo con `python -X importtime -c "import main"`,
+igual que un cold start de Vercel, y reporta la mediana del tiempo de importación de
+`main`, el tiempo total del proceso y los módulos que más pesan.
+
+Con --check compara contra benchmarks/cold_start_budget.json y termina con código 1 si:
+- la mediana de importación supera max_import_ms, o
+- se carga en el arranque alguno de los modulos_diferidos (SDKs que deben importarse
+  solo al primer uso: google.genai, minio, supabase, ...).
+
+Uso:
+    python -m benchmarks.bench_cold_start --runs 5
+    python -m benchmarks.bench_cold_start --check
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(ROOT, "benchmarks", "cold_start_budget.json")
+
+
+def _parse_importtime(stderr: str) -> dict:
+    """
+    Convierte la salida de -X importtime en {modulo: (self_us, cumulative_us)}.
+    """
+    modulos = {}
+    for linea in stderr.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        try:
+            _, self_us, cumulative_us, nombre = [p.strip() for p in linea.replace("import time:", "|").split("|")]
+            modulos[nombre] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return modulos
+
+
+def medir_arranque() -> dict:
+    start = time.perf_counter()
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", "import main"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proceso.returncode != 0:
+        raise RuntimeError(f"'import main' falló:\n{proceso.stderr[-2000:]}")
+    modulos = _parse_importtime(proceso.stderr)
+    return {"wall_ms": wall_ms, "import_ms": modulos["main"][1] / 1000, "modulos": modulos}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Módulos más pesados a mostrar")
+    parser.add_argument("--check", action="store_true", help="Fallar si se excede el presupuesto")
+    args = parser.parse_args()
+
+    with open(BUDGET_FILE, encoding="utf-8") as f:
+        budget = json.load(f)
+
+    # La primera ejecución compila los .pyc y no es representativa
+    medir_arranque()
+    runs = [medir_arranque() for _ in range(args.runs)]
+
+    ultima = runs[-1]["modulos"]
+    # Módulos con mayor tiempo acumulado (el primero es el propio main)
+    top = sorted(ultima.items(), key=lambda item: item[1][1], reverse=True)[1:args.top + 1]
+    diferidos_cargados = sorted({
+        modulo for modulo in budget["modulos_diferidos"]
+        if any(nombre == modulo or nombre.startswith(modulo + ".") for nombre in ultima)
+    })
+
+    resultado = {
+        "runs": args.runs,
+        "import_ms": {
+            "p50": round(statistics.median(r["import_ms"] for r in runs), 1),
+            "min": round(min(r["import_ms"] for r in runs), 1),
+            "max": round(max(r["import_ms"] for r in runs), 1),
+        },
+        "wall_ms_p50": round(statistics.median(r["wall_ms"] for r in runs), 1),
+        "modulos_mas_pesados_ms": {nombre: round(cumulative / 1000, 1) for nombre, (_, cumulative) in top},
+        "modulos_diferidos_cargados": diferidos_cargados,
+        "presupuesto": budget,
+    }
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+    if args.check:
+        errores = []
+        if resultado["import_ms"]["p50"] > budget["max_import_ms"]:
+            errores.append(
+                f"import de main: {resultado['import_ms']['p50']} ms > presupuesto {budget['max_import_ms']} ms"
+            )
+        if diferidos_cargados:
+            errores.append(f"módulos que deberían importarse en diferido: {', '.join(diferidos_cargados)}")
+        if errores:
+            for error in errores:
+                print(f"❌ Cold start fuera de presupuesto: {error}", file=sys.stderr)
+            sys.exit(1)
+        print("✅ Cold start dentro del presupuesto", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
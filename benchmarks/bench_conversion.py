@@ -0,0 +1,276 @@
+"""
+Micro-benchmark de la conversión documento de MongoDB -> modelo Pydantic en los
+repositorios (el bucle `_id` -> `id`, `str()` y `Model.model_validate` por documento).
+
+Para cada conversión y tamaño (1k/10k/100k documentos por defecto) compara:
+- validate: el método real del repositorio (get_all_workers, get_all_products,
+  get_all_brigadas, OfertasRepository.get_all) contra una colección en memoria, es
+  decir, el bucle actual con un model_validate por documento.
+- construct: la misma preparación con `Model.model_construct` (recursivo para los
+  modelos anidados). No valida ni convierte tipos, así que solo es válido con datos
+  que ya cumplen el esquema.
+- type_adapter: la misma preparación y una sola llamada a
+  `TypeAdapter(List[Model]).validate_python` sobre la lista completa.
+
+Los documentos se generan con benchmarks.datos_sinteticos y se recrean antes de cada
+repetición (la conversión los modifica), fuera del tiempo medido. Se reporta, al estilo
+de pytest-benchmark, min/mediana/media/desviación en ms por lote y µs por documento, y
+se comprueba que las tres variantes producen los mismos modelos.
+
+Uso:
+    python -m benchmarks.bench_conversion
+    python -m benchmarks.bench_conversion --tamanos 1000,10000 --repeticiones 7 --conversiones ofertas
+"""
+import argparse
+import json
+import logging
+import random
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+from benchmarks.datos_sinteticos import generar_ofertas, generar_productos, generar_trabajadores
+from domain.entities.brigada import Brigada
+from domain.entities.oferta import Oferta, OfertaElemento
+from domain.entities.producto import CatalogoProductos, Material
+from domain.entities.trabajador import Trabajador
+from infrastucture.repositories import (
+    brigada_repository, ofertas_repository, productos_repository, trabajadores_repository
+)
+
+
+class _ColeccionEnMemoria:
+    """
+    Lo justo de la API de pymongo que usan los get_all: find({}).to_list(length=None).
+    """
+
+    def __init__(self):
+        self.docs: List[dict] = []
+
+    def find(self, query=None, projection=None):
+        return self
+
+    def to_list(self, length=None):
+        return self.docs
+
+
+# --- Generadores de documentos con la forma que devuelve MongoDB -------------------
+
+def _object_id(rng: random.Random) -> ObjectId:
+    # Derivado de la semilla para que las tres estrategias vean los mismos ids
+    return ObjectId(rng.getrandbits(96).to_bytes(12, "big"))
+
+
+def _docs_trabajadores(n: int, rng: random.Random) -> List[dict]:
+    docs = generar_trabajadores(rng, n)
+    for doc in docs:
+        doc["_id"] = _object_id(rng)
+        if rng.random() < 0.3:
+            doc["contraseña"] = "$2b$12$" + "x" * 53
+    return docs
+
+
+def _docs_productos(n: int, rng: random.Random) -> List[dict]:
+    docs = generar_productos(rng, n, 10)
+    for doc in docs:
+        doc["_id"] = _object_id(rng)
+    return docs
+
+
+def _docs_brigadas(n: int, rng: random.Random) -> List[dict]:
+    # Forma de la vista brigadas_completas: líder e integrantes con su documento completo
+    def trabajador() -> dict:
+        return {"_id": _object_id(rng), "CI": f"{rng.randrange(10**10, 10**11)}", "nombre": "Juan Pérez Díaz"}
+
+    return [{
+        "_id": _object_id(rng),
+        "lider_ci": f"{rng.randrange(10**10, 10**11)}",
+        "lider": trabajador(),
+        "integrantes": [trabajador() for _ in range(rng.randint(2, 6))],
+    } for _ in range(n)]
+
+
+def _docs_ofertas(n: int, rng: random.Random) -> List[dict]:
+    catalogo = generar_productos(rng, 12, 10)
+    docs = generar_ofertas(rng, n, catalogo)
+    for doc in docs:
+        doc["_id"] = _object_id(rng)
+    return docs
+
+
+# --- Preparación común (lo que hacen los repositorios antes de validar) ------------
+
+def _preparar_trabajador(raw: dict) -> dict:
+    raw["id"] = str(raw.pop("_id"))
+    raw["tiene_contraseña"] = bool(raw.get("contraseña"))
+    return raw
+
+
+def _preparar_producto(raw: dict) -> dict:
+    raw["id"] = str(raw.pop("_id"))
+    for material in raw.get("materiales", []):
+        if "codigo" in material:
+            material["codigo"] = str(material["codigo"])
+    return raw
+
+
+def _preparar_brigada(raw: dict) -> dict:
+    return {
+        "id": str(raw["_id"]),
+        "lider": _preparar_trabajador(raw["lider"]),
+        "integrantes": [_preparar_trabajador(i) for i in raw.get("integrantes", [])],
+    }
+
+
+def _preparar_oferta(raw: dict) -> dict:
+    raw["id"] = str(raw.pop("_id"))
+    if raw.get("elementos"):
+        raw["elementos"] = sorted(raw["elementos"], key=lambda x: x.get("categoria", "") or "")
+    return raw
+
+
+# --- model_construct recursivo -----------------------------------------------------
+
+def _construct_producto(raw: dict) -> CatalogoProductos:
+    raw = _preparar_producto(raw)
+    raw["materiales"] = [Material.model_construct(**m) for m in raw.get("materiales", [])]
+    return CatalogoProductos.model_construct(**raw)
+
+
+def _construct_brigada(raw: dict) -> Brigada:
+    data = _preparar_brigada(raw)
+    return Brigada.model_construct(
+        id=data["id"],
+        lider=Trabajador.model_construct(**data["lider"]),
+        integrantes=[Trabajador.model_construct(**i) for i in data["integrantes"]],
+    )
+
+
+def _construct_oferta(raw: dict) -> Oferta:
+    raw = _preparar_oferta(raw)
+    raw["elementos"] = [OfertaElemento.model_construct(**e) for e in raw.get("elementos", [])]
+    return Oferta.model_construct(**raw)
+
+
+# --- Variantes por conversión ------------------------------------------------------
+
+def _variantes(coleccion: _ColeccionEnMemoria) -> Dict[str, dict]:
+    worker_repo = trabajadores_repository.WorkerRepository()
+    producto_repo = productos_repository.ProductRepository()
+    brigada_repo = brigada_repository.BrigadaRepository()
+    # La vista no trae tiene_contraseña de los integrantes y el repositorio lo consulta
+    # uno a uno; aquí se omite esa consulta para medir solo la conversión
+    brigada_repo._get_tiene_contraseña = lambda ci: False
+    oferta_repo = ofertas_repository.OfertasRepository()
+
+    def _adapter(model, preparar: Callable[[dict], dict]) -> Callable[[List[dict]], list]:
+        adapter = TypeAdapter(List[model])
+        return lambda docs: adapter.validate_python([preparar(raw) for raw in docs])
+
+    return {
+        "trabajadores": {
+            "generar": _docs_trabajadores,
+            "validate": lambda docs: worker_repo.get_all_workers(),
+            "construct": lambda docs: [Trabajador.model_construct(**_preparar_trabajador(raw)) for raw in docs],
+            "type_adapter": _adapter(Trabajador, _preparar_trabajador),
+        },
+        "productos": {
+            "generar": _docs_productos,
+            "validate": lambda docs: producto_repo.get_all_products(),
+            "construct": lambda docs: [_construct_producto(raw) for raw in docs],
+            "type_adapter": _adapter(CatalogoProductos, _preparar_producto),
+        },
+        "brigadas": {
+            "generar": _docs_brigadas,
+            "validate": lambda docs: brigada_repo.get_all_brigadas(),
+            "construct": lambda docs: [_construct_brigada(raw) for raw in docs],
+            "type_adapter": _adapter(Brigada, _preparar_brigada),
+        },
+        "ofertas": {
+            "generar": _docs_ofertas,
+            "validate": lambda docs: oferta_repo.get_all(),
+            "construct": lambda docs: [_construct_oferta(raw) for raw in docs],
+            "type_adapter": _adapter(Oferta, _preparar_oferta),
+        },
+    }
+
+
+def _estadisticas(tiempos_ms: List[float], n: int) -> dict:
+    return {
+        "min_ms": round(min(tiempos_ms), 2),
+        "mediana_ms": round(statistics.median(tiempos_ms), 2),
+        "media_ms": round(statistics.mean(tiempos_ms), 2),
+        "desviacion_ms": round(statistics.stdev(tiempos_ms), 2) if len(tiempos_ms) > 1 else 0.0,
+        "us_por_documento": round(min(tiempos_ms) * 1000 / n, 3),
+        "documentos_por_segundo": int(n / (min(tiempos_ms) / 1000)),
+    }
+
+
+def medir(coleccion: _ColeccionEnMemoria, variante: dict, estrategia: str, n: int, repeticiones: int,
+          semilla: int) -> List[float]:
+    tiempos = []
+    for i in range(repeticiones + 1):
+        docs = variante["generar"](n, random.Random(semilla))
+        coleccion.docs = docs
+        start = time.perf_counter()
+        variante[estrategia](docs)
+        transcurrido = (time.perf_counter() - start) * 1000
+        if i > 0:  # la primera repetición calienta
+            tiempos.append(transcurrido)
+    return tiempos
+
+
+def equivalentes(coleccion: _ColeccionEnMemoria, variante: dict, semilla: int) -> bool:
+    """
+    Comprueba con 50 documentos que las tres estrategias producen los mismos modelos.
+    """
+    resultados = []
+    for estrategia in ("validate", "construct", "type_adapter"):
+        docs = variante["generar"](50, random.Random(semilla))
+        coleccion.docs = docs
+        resultados.append([m.model_dump() for m in variante[estrategia](docs)])
+    return resultados[0] == resultados[1] == resultados[2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanos", default="1000,10000,100000", help="Documentos por lote, separados por comas")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--conversiones", default="trabajadores,productos,brigadas,ofertas")
+    parser.add_argument("--semilla", type=int, default=42)
+    args = parser.parse_args()
+
+    # Los get_all registran un INFO por llamada; no es lo que se mide aquí
+    logging.disable(logging.INFO)
+
+    coleccion = _ColeccionEnMemoria()
+    for modulo in (trabajadores_repository, productos_repository, brigada_repository, ofertas_repository):
+        modulo.get_collection = lambda name: coleccion
+
+    variantes = _variantes(coleccion)
+    tamanos = [int(t) for t in args.tamanos.split(",")]
+    resultado = {"repeticiones": args.repeticiones, "conversiones": {}}
+    for nombre in args.conversiones.split(","):
+        variante = variantes[nombre]
+        por_tamano = {}
+        for n in tamanos:
+            estrategias = {
+                estrategia: _estadisticas(medir(coleccion, variante, estrategia, n, args.repeticiones, args.semilla), n)
+                for estrategia in ("validate", "construct", "type_adapter")
+            }
+            base = estrategias["validate"]["min_ms"]
+            for stats in estrategias.values():
+                stats["vs_validate"] = round(stats["min_ms"] / base, 2) if base else None
+            por_tamano[str(n)] = estrategias
+        resultado["conversiones"][nombre] = {
+            "equivalentes": equivalentes(coleccion, variante, args.semilla),
+            "tamanos": por_tamano,
+        }
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Micro-benchmark del render del correo de cotización.
+
+Compara, por mensaje:
+- fstring: el HTML armado con f-strings anidadas en cada llamada (implementación anterior,
+  sin escapar el mensaje).
+- jinja_sin_precompilar: la misma plantilla Jinja2 compilada en cada llamada.
+- jinja_precompilado: la plantilla compilada una vez al importar EmailService (actual).
+
+Uso:
+    python -m benchmarks.bench_email_render --repeticiones 20000
+"""
+import argparse
+import json
+import time
+
+from jinja2 import Environment, select_autoescape
+
+from application.services import email_service as email_service_module
+
+MENSAJE = "Hola, quiero cotizar un sistema de 5 kW.\nTengo un consumo de 400 kWh al mes.\nGracias <3"
+LATITUD = 23.1136
+LONGITUD = -82.3666
+
+
+def render_fstring(mensaje, latitud, longitud) -> str:
+    mapa_html = ""
+    if latitud is not None and longitud is not None:
+        mapa_html = f"""
+            <div style="margin: 20px 0; padding: 15px; border: 2px solid #e0e0e0; border-radius: 8px; background-color: #f9f9f9;">
+                <h3 style="color: #333; margin-top: 0;">📍 Ubicación de la Cotización</h3>
+                <p><strong>Coordenadas:</strong> {latitud}, {longitud}</p>
+                
+                <div style="background-color: #fff; border: 1px solid #ddd; border-radius: 4px; padding: 10px; margin: 10px 0;">
+                    <p style="margin: 5px 0;"><strong>🌐 Latitud:</strong> {latitud}</p>
+                    <p style="margin: 5px 0;"><strong>🌐 Longitud:</strong> {longitud}</p>
+                </div>
+                
+                <div style="text-align: center; margin: 15px 0;">
+                    <a href="https://www.google.com/maps?q={latitud},{longitud}" target="_blank" 
+                       style="display: inline-block; background-color: #1a73e8; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; font-weight: bold;">
+                        🗺️ Ver Ubicación en Google Maps
+                    </a>
+                </div>
+                
+                <div style="text-align: center; margin: 10px 0;">
+                    <a href="https://maps.apple.com/?q={latitud},{longitud}" target="_blank" 
+                       style="display: inline-block; background-color: #007aff; color: white; padding: 8px 16px; text-decoration: none; border-radius: 5px; font-size: 14px; margin: 0 5px;">
+                        🍎 Apple Maps
+                    </a>
+                    <a href="https://www.openstreetmap.org/?mlat={latitud}&mlon={longitud}&zoom=15" target="_blank" 
+                       style="display: inline-block; background-color: #7ebc6f; color: white; padding: 8px 16px; text-decoration: none; border-radius: 5px; font-size: 14px; margin: 0 5px;">
+                        🌍 OpenStreetMap
+                    </a>
+                </div>
+                
+                <p style="font-size: 12px; color: #666; text-align: center; margin-bottom: 0;">
+                    Haga clic en cualquier enlace para ver la ubicación en su aplicación de mapas preferida
+                </p>
+            </div>
+        """
+
+    return f"""
+    <html>
+    <body>
+        <h2>Nueva Cotización Recibida</h2>
+        <p><strong>Mensaje:</strong></p>
+        <p>{mensaje.replace(chr(10), '<br>')}</p>
+        {mapa_html}
+        <br>
+        <p>Este es un mensaje automático del sistema SunCar.</p>
+        <p><small>Enviado desde: rubianclaude@gmail.com</small></p>
+    </body>
+    </html>
+    """
+
+
+def render_jinja_sin_precompilar(fuente: str):
+    def render(mensaje, latitud, longitud) -> str:
+        env = Environment(autoescape=select_autoescape(["html"], default_for_string=True))
+        env.filters["nl2br"] = email_service_module._nl2br
+        return env.from_string(fuente).render(
+            mensaje=mensaje, latitud=latitud, longitud=longitud, mail_from="rubianclaude@gmail.com"
+        )
+    return render
+
+
+def render_jinja_precompilado(mensaje, latitud, longitud) -> str:
+    return email_service_module._cotizacion_template.render(
+        mensaje=mensaje, latitud=latitud, longitud=longitud, mail_from="rubianclaude@gmail.com"
+    )
+
+
+def medir(func, repeticiones: int, con_mapa: bool) -> float:
+    latitud, longitud = (LATITUD, LONGITUD) if con_mapa else (None, None)
+    start = time.perf_counter()
+    for _ in range(repeticiones):
+        func(MENSAJE, latitud, longitud)
+    return round((time.perf_counter() - start) / repeticiones * 1e6, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=20000)
+    args = parser.parse_args()
+
+    fuente = email_service_module._templates.loader.get_source(email_service_module._templates, "cotizacion.html")[0]
+    variantes = {
+        "fstring": render_fstring,
+        # Compilar es mucho más caro que renderizar: se mide con menos repeticiones
+        "jinja_sin_precompilar": render_jinja_sin_precompilar(fuente),
+        "jinja_precompilado": render_jinja_precompilado,
+    }
+
+    resultado = {"repeticiones": args.repeticiones, "us_por_mensaje": {}}
+    for nombre, func in variantes.items():
+        repeticiones = args.repeticiones if nombre != "jinja_sin_precompilar" else max(args.repeticiones // 100, 10)
+        resultado["us_por_mensaje"][nombre] = {
+            "con_mapa": medir(func, repeticiones, con_mapa=True),
+            "sin_mapa": medir(func, repeticiones, con_mapa=False),
+        }
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark de la serialización JSON de las respuestas de /api/reportes, /api/productos y
+/api/ofertas.
+
+Para cada payload mide el tiempo por respuesta (mínimo de --repeticiones) y el tamaño:
+- reportes (List[dict] con ObjectId, como salen de MongoDB):
+  - anterior: `str(_id)` en un bucle de Python y el camino de FastAPI para
+    response_model=List[dict] (validate_python + dump_json de pydantic-core).
+  - jsonable_encoder: el camino clásico de JSONResponse (rutas sin response_model).
+  - orjson: ORJSONResponse.render sobre los documentos tal cual, con ObjectId.
+- productos y ofertas (listados con response_model tipado):
+  - pydantic_dump_json: modelos validados y el camino de FastAPI con response_model, que
+    es el que mantienen las rutas tipadas con Default(ORJSONResponse).
+  - orjson_modelos: ORJSONResponse con los modelos (model_dump por objeto); muestra por
+    qué no se fuerza orjson en las rutas tipadas.
+  - confianza_pydantic / confianza_orjson: los dicts de hydration.trusted_documents
+    serializados con pydantic_core.to_json (antes) y con ORJSONResponse (ahora).
+
+Uso:
+    python -m benchmarks.bench_json_response --documentos 1000
+"""
+import argparse
+import json
+import random
+import time
+from typing import Callable, Dict, List
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from benchmarks.datos_sinteticos import (
+    generar_brigadas, generar_clientes, generar_ofertas, generar_productos, generar_reportes,
+    generar_trabajadores
+)
+from domain.entities.oferta import Oferta
+from domain.entities.producto import CatalogoProductos
+from infrastucture.repositories.hydration import trusted_documents
+from presentation.responses import ORJSONResponse
+from presentation.schemas.responses.ofertas_responses import OfertasListResponse
+from presentation.schemas.responses.productos_responses import ProductoListResponse
+
+
+def _object_id(rng: random.Random) -> ObjectId:
+    return ObjectId(rng.getrandbits(96).to_bytes(12, "big"))
+
+
+def _reportes(n: int, semilla: int) -> List[dict]:
+    rng = random.Random(semilla)
+    trabajadores = generar_trabajadores(rng, 60)
+    brigadas = generar_brigadas(rng, trabajadores, 10)
+    clientes = generar_clientes(rng, 200)
+    productos = generar_productos(rng, 12, 40)
+    docs = list(generar_reportes(rng, n, brigadas, trabajadores, clientes, productos))
+    for doc in docs:
+        doc["_id"] = _object_id(rng)
+    return docs
+
+
+def _productos(n: int, semilla: int) -> List[dict]:
+    rng = random.Random(semilla)
+    docs = generar_productos(rng, n, 10)
+    for doc in docs:
+        doc["_id"] = _object_id(rng)
+        for material in doc["materiales"]:
+            material["codigo"] = str(material["codigo"])
+    return docs
+
+
+def _ofertas(n: int, semilla: int) -> List[dict]:
+    rng = random.Random(semilla)
+    docs = generar_ofertas(rng, n, generar_productos(rng, 12, 10))
+    for doc in docs:
+        doc["_id"] = _object_id(rng)
+    return docs
+
+
+def _con_id_str(docs: List[dict]) -> List[dict]:
+    for doc in docs:
+        doc["id"] = str(doc.pop("_id"))
+    return docs
+
+
+def _con_id(docs: List[dict]) -> List[dict]:
+    for doc in docs:
+        doc["id"] = doc.pop("_id")
+    return docs
+
+
+def _orjson(content) -> bytes:
+    return ORJSONResponse(content).body
+
+
+def _variantes_reportes() -> Dict[str, Callable[[List[dict]], bytes]]:
+    adapter = TypeAdapter(List[dict])
+    return {
+        "anterior": lambda docs: adapter.dump_json(adapter.validate_python(_con_id_str(docs))),
+        "jsonable_encoder": lambda docs: json.dumps(
+            jsonable_encoder(_con_id_str(docs)), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8"),
+        "orjson": lambda docs: _orjson(_con_id(docs)),
+    }
+
+
+def _variantes_listado(model, response_model) -> Dict[str, Callable[[List[dict]], bytes]]:
+    adapter = TypeAdapter(response_model)
+
+    def modelos(docs: List[dict]):
+        return [model.model_validate(doc) for doc in _con_id_str(docs)]
+
+    def respuesta(data) -> dict:
+        return {"success": True, "message": "ok", "data": data}
+
+    return {
+        "pydantic_dump_json": lambda docs: adapter.dump_json(adapter.validate_python(response_model(**respuesta(modelos(docs))))),
+        "orjson_modelos": lambda docs: _orjson(respuesta(modelos(docs))),
+        "confianza_pydantic": lambda docs: to_json(respuesta(trusted_documents(model, _con_id_str(docs)))),
+        "confianza_orjson": lambda docs: _orjson(respuesta(trusted_documents(model, docs))),
+    }
+
+
+def medir(generar: Callable[[int, int], List[dict]], variante: Callable[[List[dict]], bytes],
+          n: int, repeticiones: int, semilla: int) -> dict:
+    tiempos = []
+    tamano = 0
+    for i in range(repeticiones + 1):
+        docs = generar(n, semilla)  # la serialización modifica los dicts
+        start = time.perf_counter()
+        body = variante(docs)
+        if i > 0:
+            tiempos.append((time.perf_counter() - start) * 1000)
+        tamano = len(body)
+    return {"ms": round(min(tiempos), 2), "bytes": tamano}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documentos", type=int, default=1000)
+    parser.add_argument("--repeticiones", type=int, default=7)
+    parser.add_argument("--semilla", type=int, default=42)
+    args = parser.parse_args()
+
+    payloads = {
+        "reportes": (_reportes, _variantes_reportes()),
+        "productos": (_productos, _variantes_listado(CatalogoProductos, ProductoListResponse)),
+        "ofertas": (_ofertas, _variantes_listado(Oferta, OfertasListResponse)),
+    }
+    resultado = {"documentos": args.documentos, "payloads": {}}
+    for nombre, (generar, variantes) in payloads.items():
+        resultado["payloads"][nombre] = {
+            variante: medir(generar, funcion, args.documentos, args.repeticiones, args.semilla)
+            for variante, funcion in variantes.items()
+        }
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark del coste del logging en las lecturas calientes de clientes.
+
+Ejecuta find_client_by_number, find_client_by_identifier y get_clientes contra una
+colección en memoria mínima (sin MongoDB, para que el coste del acceso a datos no tape
+el del logging) y mide el tiempo por llamada y los bytes de log emitidos con:
+- anterior_info: el repositorio anterior, que volcaba documentos y queries con f-strings en INFO.
+- actual_info: el repositorio actual con LOG_LEVEL=INFO (los detalles van a DEBUG, diferidos).
+- actual_debug: el repositorio actual con todo el detalle en DEBUG.
+- actual_muestreo: DEBUG con un SamplingFilter al 10 %.
+- sin_logging: logging.disable, como referencia.
+
+El log se escribe a un stream que solo cuenta bytes, así que no incluye el coste de E/S
+ni de ingesta, que en producción crece con esos mismos bytes.
+
+Uso:
+    python -m benchmarks.bench_logging --llamadas 5000
+"""
+import argparse
+import json
+import logging
+import time
+
+from bson import ObjectId
+
+from infrastucture.observability.logging_config import SamplingFilter
+from infrastucture.repositories import client_repository
+from infrastucture.repositories.client_repository import ClientRepository
+from domain.entities.cliente import Cliente
+
+LOGGER_NAME = client_repository.__name__
+
+
+class _ContadorBytes:
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, text: str) -> None:
+        self.bytes += len(text.encode("utf-8"))
+
+    def flush(self) -> None:
+        pass
+
+
+class ClientRepositoryAnterior(ClientRepository):
+    """
+    Lecturas tal como estaban antes: documento completo y query en INFO con f-strings.
+    """
+
+    def find_client_by_number(self, numero: str):
+        collection = client_repository.get_collection(self.collection_name)
+        self.logger.info(f"Buscando cliente por número: {numero}")
+        cliente_doc = collection.find_one({"numero": numero})
+        if cliente_doc:
+            self.logger.info(f"Cliente encontrado: {cliente_doc}")
+            return Cliente.model_validate(cliente_doc)
+        self.logger.info("Cliente no encontrado")
+        return None
+
+    def find_client_by_identifier(self, identifier: str):
+        collection = client_repository.get_collection(self.collection_name)
+        self.logger.info(f"Buscando cliente por identificador: {identifier}")
+        cliente_doc = collection.find_one(
+            {"$or": [{"numero": identifier}, {"telefono": identifier}]},
+            {"numero": 1, "nombre": 1, "_id": 0}
+        )
+        if cliente_doc:
+            self.logger.info(f"Cliente encontrado: {cliente_doc}")
+            return cliente_doc
+        self.logger.info("Cliente no encontrado")
+        return None
+
+    def get_clientes(self, numero=None, nombre=None, direccion=None):
+        collection = client_repository.get_collection(self.collection_name)
+        query = {"numero": numero} if numero else {}
+        self.logger.info(f"Buscando clientes con query: {query}")
+        clientes = []
+        for doc in collection.find(query):
+            doc["id"] = str(doc.pop("_id"))
+            clientes.append(doc)
+        clientes.sort(key=lambda c: int(c["numero"][-4:]))
+        self.logger.info(f"Clientes encontrados: {len(clientes)}")
+        return clientes
+
+
+class _ColeccionEnMemoria:
+    """
+    Lo justo de la API de pymongo que usan las tres lecturas: igualdad por campo y $or.
+    """
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def _coincide(self, doc: dict, query: dict) -> bool:
+        if "$or" in query:
+            return any(self._coincide(doc, q) for q in query["$or"])
+        return all(doc.get(campo) == valor for campo, valor in query.items())
+
+    def find(self, query=None, projection=None):
+        for doc in self.docs:
+            if self._coincide(doc, query or {}):
+                if projection:
+                    yield {k: v for k, v in doc.items() if projection.get(k)}
+                else:
+                    yield dict(doc)
+
+    def find_one(self, query=None, projection=None):
+        return next(self.find(query, projection), None)
+
+
+def _crear_coleccion(clientes: int):
+    return _ColeccionEnMemoria([
+        {
+            "_id": ObjectId(),
+            "numero": f"C{i:06d}",
+            "nombre": f"Cliente de prueba número {i}",
+            "direccion": f"Calle {i} entre A y B, Reparto Ejemplo, La Habana",
+            "latitud": 23.1 + i / 1e5,
+            "longitud": -82.3 - i / 1e5,
+            "telefono": f"5355{i:06d}",
+        }
+        for i in range(clientes)
+    ])
+
+
+def medir(repo: ClientRepository, llamadas: int, clientes: int) -> float:
+    start = time.perf_counter()
+    for i in range(llamadas):
+        numero = f"C{i % clientes:06d}"
+        repo.find_client_by_number(numero)
+        repo.find_client_by_identifier(f"5355{i % clientes:06d}")
+        repo.get_clientes(numero=numero)
+    return (time.perf_counter() - start) / llamadas * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llamadas", type=int, default=5000, help="Iteraciones (3 lecturas cada una)")
+    parser.add_argument("--clientes", type=int, default=200)
+    args = parser.parse_args()
+
+    collection = _crear_coleccion(args.clientes)
+    client_repository.get_collection = lambda name: collection
+
+    contador = _ContadorBytes()
+    handler = logging.StreamHandler(contador)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    variantes = {
+        "anterior_info": (ClientRepositoryAnterior(), logging.INFO, None),
+        "actual_info": (ClientRepository(), logging.INFO, None),
+        "actual_debug": (ClientRepository(), logging.DEBUG, None),
+        "actual_muestreo": (ClientRepository(), logging.DEBUG, SamplingFilter(0.1)),
+        "sin_logging": (ClientRepository(), None, None),
+    }
+
+    resultado = {"llamadas": args.llamadas, "clientes": args.clientes, "us_por_llamada": {}, "bytes_log_por_llamada": {}}
+    for nombre, (repo, level, filtro) in variantes.items():
+        logging.disable(logging.CRITICAL if level is None else logging.NOTSET)
+        logger.setLevel(level or logging.INFO)
+        if filtro is not None:
+            logger.addFilter(filtro)
+        medir(repo, 200, args.clientes)  # calentar
+        contador.bytes = 0
+        us = medir(repo, args.llamadas, args.clientes)
+        resultado["us_por_llamada"][nombre] = round(us, 2)
+        resultado["bytes_log_por_llamada"][nombre] = round(contador.bytes / args.llamadas, 1)
+        if filtro is not None:
+            logger.removeFilter(filtro)
+    logging.disable(logging.NOTSET)
+
+    base = resultado["us_por_llamada"]["sin_logging"]
+    resultado["overhead_us"] = {
+        nombre: round(us - base, 2) for nombre, us in resultado["us_por_llamada"].items() if nombre != "sin_logging"
+    }
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
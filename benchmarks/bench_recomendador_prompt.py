@@ -0,0 +1,107 @@
+"""
+Benchmark del tamaño del prompt del recomendador de ofertas.
+
+Compara el prompt original (descripcion_detallada completa, renderizado en cada request)
+con el contexto compacto y cacheado (descripcion_ia). Usa ofertas sintéticas, así que
+no necesita MongoDB. Con --count-tokens y GEMINI_API_KEY definida cuenta los tokens
+reales con la API de Gemini; si no, los estima como caracteres / 4.
+
+Uso:
+    python -m benchmarks.bench_recomendador_prompt --ofertas 40 --chars 1500
+"""
+import argparse
+import json
+import os
+import random
+import time
+
+from application.services.oferta_service import renderizar_contexto_ofertas
+from infrastucture.repositories.ofertas_repository import compactar_descripcion
+
+PALABRAS = (
+    "sistema solar fotovoltaico inversor híbrido paneles monocristalinos batería litio "
+    "respaldo hogar oficina consumo mensual kWh garantía instalación incluida estructura "
+    "aluminio cableado protección eficiencia ahorro financiamiento mantenimiento anual"
+).split()
+
+
+def generar_ofertas(cantidad: int, chars: int, seed: int = 42) -> list:
+    rnd = random.Random(seed)
+    ofertas = []
+    for i in range(cantidad):
+        palabras = []
+        while sum(len(p) + 1 for p in palabras) < chars:
+            palabras.append(rnd.choice(PALABRAS))
+        descripcion = " ".join(palabras)
+        # Simular el formato real: saltos de línea y viñetas
+        descripcion = descripcion.replace(" garantía", "\n\n- garantía").replace(" ahorro", "\n  * ahorro")
+        ofertas.append({
+            "id": f"{i:024x}",
+            "descripcion_detallada": descripcion,
+            "precio": rnd.randint(500, 15000)
+        })
+    return ofertas
+
+
+def contexto_original(ofertas: list) -> str:
+    return "\n".join([
+        f"ID: {oferta['id']}, Precio: ${oferta['precio']}, Descripción: {oferta['descripcion_detallada']}"
+        for oferta in ofertas
+    ])
+
+
+def contar_tokens(texto: str, usar_api: bool) -> int:
+    if usar_api:
+        from google import genai
+        client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
+        model = os.getenv("GEMINI_DEFAULT_MODEL", "gemini-2.5-flash")
+        return client.models.count_tokens(model=model, contents=texto).total_tokens
+    return len(texto) // 4
+
+
+def medir(func, repeticiones: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeticiones):
+        func()
+    return (time.perf_counter() - start) / repeticiones * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ofertas", type=int, default=40)
+    parser.add_argument("--chars", type=int, default=1500, help="Longitud media de descripcion_detallada")
+    parser.add_argument("--repeticiones", type=int, default=200)
+    parser.add_argument("--count-tokens", action="store_true", help="Contar tokens con la API de Gemini")
+    args = parser.parse_args()
+
+    usar_api = args.count_tokens and bool(os.getenv("GEMINI_API_KEY"))
+    ofertas = generar_ofertas(args.ofertas, args.chars)
+
+    antes = contexto_original(ofertas)
+    # Lo que se guarda en Mongo al escribir la oferta
+    compactas = [dict(o, descripcion_ia=compactar_descripcion(o["descripcion_detallada"])) for o in ofertas]
+    despues = renderizar_contexto_ofertas(compactas)
+
+    resultado = {
+        "ofertas": args.ofertas,
+        "tokens_exactos": usar_api,
+        "antes": {
+            "chars": len(antes),
+            "tokens": contar_tokens(antes, usar_api),
+            "render_us": round(medir(lambda: contexto_original(ofertas), args.repeticiones), 2),
+        },
+        "despues": {
+            "chars": len(despues),
+            "tokens": contar_tokens(despues, usar_api),
+            # Con la caché por versión de catálogo este render solo ocurre cuando cambian las ofertas
+            "render_us": round(medir(lambda: renderizar_contexto_ofertas(compactas), args.repeticiones), 2),
+        },
+    }
+    resultado["reduccion_tokens_pct"] = round(
+        100 * (1 - resultado["despues"]["tokens"] / max(resultado["antes"]["tokens"], 1)), 1
+    )
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark del envío de cotizaciones por SMTP.
+
+Compara abrir una conexión SMTP por mensaje (como hacía fastapi-mail) con la sesión
+compartida de SMTPSender enviando la cola en lote. Levanta un servidor SMTP local
+que descarta los mensajes (aiosmtpd, solo para desarrollo: pip install aiosmtpd),
+así que no envía correos reales ni mide la latencia de red hacia Gmail; con un
+servidor remoto la diferencia crece con el RTT y el handshake TLS/AUTH.
+
+Uso:
+    python -m benchmarks.bench_smtp_batch --mensajes 1000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from aiosmtpd.controller import Controller
+
+from application.services.email_service import EmailService
+from infrastucture.external_services.smtp_sender import SMTPSender
+
+
+class _Sumidero:
+    def __init__(self):
+        self.recibidos = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.recibidos += 1
+        return "250 OK"
+
+
+def _nuevo_sender(port: int) -> SMTPSender:
+    return SMTPSender(
+        hostname="127.0.0.1",
+        port=port,
+        start_tls=False,
+        use_credentials=False,
+        idle_timeout=300
+    )
+
+
+async def _una_conexion_por_mensaje(port: int, mensajes: list) -> float:
+    start = time.perf_counter()
+    for mensaje in mensajes:
+        sender = _nuevo_sender(port)
+        await sender.send(mensaje)
+        await sender.close()
+    return time.perf_counter() - start
+
+
+async def _sesion_compartida(port: int, mensajes: list, lote: int) -> float:
+    sender = _nuevo_sender(port)
+    start = time.perf_counter()
+    for i in range(0, len(mensajes), lote):
+        errores = await sender.send_batch(mensajes[i:i + lote])
+        if any(errores):
+            raise RuntimeError(f"Fallo enviando el lote {i // lote}: {errores}")
+    elapsed = time.perf_counter() - start
+    await sender.close()
+    return elapsed
+
+
+def _resultado(elapsed: float, cantidad: int) -> dict:
+    return {
+        "segundos": round(elapsed, 3),
+        "mensajes_por_segundo": round(cantidad / elapsed, 1),
+        "ms_por_mensaje": round(elapsed / cantidad * 1000, 3),
+    }
+
+
+async def _run(args) -> dict:
+    sumidero = _Sumidero()
+    controller = Controller(sumidero, hostname="127.0.0.1", port=args.port)
+    controller.start()
+    try:
+        email_service = EmailService(sender=_nuevo_sender(args.port))
+        mensajes = [
+            email_service.construir_cotizacion(
+                f"Cotización de prueba #{i}: sistema de 5 kW con batería",
+                destinatario="ventas@example.com",
+                latitud=23.1136,
+                longitud=-82.3666
+            )
+            for i in range(args.mensajes)
+        ]
+
+        por_mensaje = await _una_conexion_por_mensaje(args.port, mensajes)
+        en_lote = await _sesion_compartida(args.port, mensajes, args.lote)
+    finally:
+        controller.stop()
+
+    return {
+        "mensajes": args.mensajes,
+        "lote": args.lote,
+        "recibidos": sumidero.recibidos,
+        "conexion_por_mensaje": _resultado(por_mensaje, args.mensajes),
+        "sesion_compartida": _resultado(en_lote, args.mensajes),
+        "speedup": round(por_mensaje / en_lote, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mensajes", type=int, default=1000)
+    parser.add_argument("--lote", type=int, default=50, help="Tamaño de lote (EMAIL_OUTBOX_BATCH_SIZE)")
+    parser.add_argument("--port", type=int, default=8025)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(_run(args)), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Generador de datos sintéticos para los benchmarks de carga.
+
+Siembra una base de MongoDB local (o una mongomock en memoria) con volúmenes parecidos
+a producción, con la misma forma de documento que guardan los endpoints:
+- trabajadores y brigadas (colección base "brigadas")
+- clientes (10k), leads (50k)
+- catálogo de productos por categoría y ofertas
+- reportes (100k) de inversión/avería/mantenimiento con brigada, materiales del
+  catálogo, cliente, fecha/hora y adjuntos
+
+Los datos son deterministas para una misma --semilla, así que dos corridas sobre
+commits distintos usan exactamente los mismos documentos.
+
+Por seguridad solo escribe en bases cuyo nombre contiene "bench" (salvo --forzar) y
+solo borra colecciones con --drop.
+
+Uso:
+    python -m benchmarks.datos_sinteticos --mongodb-url mongodb://localhost:27017 --drop
+    python -m benchmarks.datos_sinteticos --escala 0.1 --db suncar_bench_pequena --drop
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+
+# Volúmenes con --escala 1
+VOLUMENES = {
+    "trabajadores": 400,
+    "brigadas": 60,
+    "clientes": 10_000,
+    "leads": 50_000,
+    "categorias": 25,
+    "materiales_por_categoria": 40,
+    "ofertas": 60,
+    "reportes": 100_000,
+}
+
+NOMBRES = ["Juan", "María", "Pedro", "Ana", "Luis", "Carmen", "José", "Yanet", "Raúl", "Dayana",
+           "Ernesto", "Lázaro", "Yudith", "Osmany", "Niurka", "Alejandro", "Mariela", "Yoel"]
+APELLIDOS = ["Pérez", "González", "Rodríguez", "Fernández", "López", "Martínez", "Sánchez",
+             "Díaz", "Hernández", "García", "Álvarez", "Ramírez", "Cabrera", "Suárez"]
+PROVINCIAS = ["La Habana", "Artemisa", "Mayabeque", "Matanzas", "Villa Clara", "Cienfuegos",
+              "Sancti Spíritus", "Camagüey", "Holguín", "Santiago de Cuba"]
+CATEGORIAS = ["Paneles", "Inversores", "Baterías", "Estructuras", "Cables", "Protecciones",
+              "Conectores", "Canaletas", "Tornillería", "Medidores", "Reguladores", "Tierra"]
+UNIDADES = ["u", "m", "kg", "rollo", "juego"]
+ESTADOS_LEAD = ["nuevo", "contactado", "interesado", "cotizado", "cerrado", "descartado"]
+FUENTES_LEAD = ["página web", "facebook", "whatsapp", "referido", "feria", None]
+AVERIAS = ["El inversor no enciende", "Batería descargada antes de tiempo", "Panel con microfisuras",
+           "Falla en el cableado de string", "Breaker disparado de forma intermitente",
+           "Lectura incorrecta del medidor", "Sobrecalentamiento del inversor"]
+MANTENIMIENTOS = ["Limpieza de paneles", "Revisión de conexiones", "Ajuste de estructura",
+                  "Cambio de fusibles", "Actualización de firmware del inversor"]
+
+FECHA_INICIO = date(2023, 1, 1)
+DIAS = 1000
+
+
+def _nombre(rng: random.Random) -> str:
+    return f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}"
+
+
+def _fecha(rng: random.Random) -> str:
+    return (FECHA_INICIO + timedelta(days=rng.randrange(DIAS))).isoformat()
+
+
+def generar_trabajadores(rng: random.Random, n: int) -> list:
+    return [{"CI": f"{80010100000 + i:011d}", "nombre": _nombre(rng)} for i in range(n)]
+
+
+def generar_brigadas(rng: random.Random, trabajadores: list, n: int) -> list:
+    brigadas = []
+    cis = [t["CI"] for t in trabajadores]
+    por_brigada = max(len(cis) // max(n, 1), 2)
+    for i in range(min(n, len(cis) // 2)):
+        grupo = cis[i * por_brigada:(i + 1) * por_brigada]
+        brigadas.append({"lider": grupo[0], "integrantes": grupo[1:]})
+    return brigadas
+
+
+def generar_clientes(rng: random.Random, n: int) -> list:
+    clientes = []
+    for i in range(n):
+        provincia = rng.choice(PROVINCIAS)
+        clientes.append({
+            "numero": f"F{i:08d}",
+            "nombre": _nombre(rng),
+            "direccion": f"Calle {rng.randint(1, 300)} #{rng.randint(1, 2000)}, {provincia}",
+            "latitud": round(rng.uniform(19.8, 23.2), 6),
+            "longitud": round(rng.uniform(-84.9, -74.1), 6),
+            "telefono": f"53{rng.randint(50000000, 59999999)}",
+        })
+    return clientes
+
+
+def generar_leads(rng: random.Random, n: int) -> list:
+    return [{
+        "fecha_contacto": _fecha(rng),
+        "nombre": _nombre(rng),
+        "telefono": f"53{rng.randint(50000000, 59999999)}",
+        "estado": rng.choice(ESTADOS_LEAD),
+        "fuente": rng.choice(FUENTES_LEAD),
+        "referencia": None,
+        "direccion": f"Calle {rng.randint(1, 300)}, {rng.choice(PROVINCIAS)}",
+        "pais_contacto": "Cuba",
+        "necesidad": f"Sistema de {rng.choice([1, 2, 3, 5, 10])} kW",
+        "provincia_montaje": rng.choice(PROVINCIAS),
+    } for _ in range(n)]
+
+
+def generar_productos(rng: random.Random, categorias: int, materiales_por_categoria: int) -> list:
+    productos = []
+    for c in range(categorias):
+        nombre = CATEGORIAS[c % len(CATEGORIAS)] + ("" if c < len(CATEGORIAS) else f" {c // len(CATEGORIAS)}")
+        productos.append({
+            "categoria": nombre,
+            "materiales": [{
+                "codigo": c * 1000 + m,
+                "descripcion": f"{nombre} modelo {m:03d}",
+                "um": rng.choice(UNIDADES),
+            } for m in range(materiales_por_categoria)],
+        })
+    return productos
+
+
+def generar_ofertas(rng: random.Random, n: int, productos: list) -> list:
+    ofertas = []
+    for i in range(n):
+        kw = rng.choice([1, 2, 3, 5, 8, 10])
+        elementos = []
+        for producto in rng.sample(productos, min(4, len(productos))):
+            material = rng.choice(producto["materiales"])
+            elementos.append({
+                "categoria": producto["categoria"],
+                "descripcion": material["descripcion"],
+                "cantidad": rng.randint(1, 12),
+                "foto": None,
+            })
+        ofertas.append({
+            "descripcion": f"Sistema solar de {kw} kW #{i}",
+            "descripcion_detallada": f"Kit completo de {kw} kW con paneles, inversor y baterías. " * 3,
+            "precio": float(kw * rng.randint(900, 1300)),
+            "precio_cliente": None,
+            "imagen": None,
+            "moneda": "USD",
+            "financiamiento": rng.random() < 0.4,
+            "descuentos": None,
+            "garantias": ["Paneles 10 años", "Inversor 5 años"],
+            "elementos": elementos,
+        })
+    return ofertas
+
+
+def _reporte(rng: random.Random, tipo: str, brigada: dict, trabajadores_por_ci: dict,
+             cliente: dict, productos: list) -> dict:
+    lider = trabajadores_por_ci[brigada["lider"]]
+    materiales = []
+    if tipo == "inversion" or rng.random() < 0.3:
+        for _ in range(rng.randint(3, 12) if tipo == "inversion" else rng.randint(1, 3)):
+            producto = rng.choice(productos)
+            material = rng.choice(producto["materiales"])
+            materiales.append({
+                "tipo": producto["categoria"],
+                "nombre": material["descripcion"],
+                "cantidad": str(rng.randint(1, 20)),
+                "unidad_medida": material["um"],
+                "codigo_producto": str(material["codigo"]),
+            })
+    hora = rng.randint(7, 14)
+    base_url = "https://minio.example.com/photos"
+    doc = {
+        "tipo_reporte": tipo,
+        "brigada": {
+            "lider": {"nombre": lider["nombre"], "CI": lider["CI"]},
+            "integrantes": [
+                {"nombre": trabajadores_por_ci[ci]["nombre"], "CI": ci} for ci in brigada["integrantes"]
+            ],
+        },
+        "materiales": materiales,
+        "cliente": {"numero": cliente["numero"]},
+        "fecha_hora": {
+            "fecha": _fecha(rng),
+            "hora_inicio": f"{hora:02d}:00",
+            "hora_fin": f"{hora + rng.randint(1, 4):02d}:30",
+        },
+        "adjuntos": {
+            "fotos_inicio": [f"{base_url}/{rng.getrandbits(64):016x}.jpg" for _ in range(rng.randint(0, 4))],
+            "fotos_fin": [f"{base_url}/{rng.getrandbits(64):016x}.jpg" for _ in range(rng.randint(0, 4))],
+            "firma_cliente": f"{base_url}/{rng.getrandbits(64):016x}.png",
+        },
+        "fecha_creacion": _fecha(rng),
+    }
+    if tipo == "averia":
+        doc["descripcion"] = rng.choice(AVERIAS)
+    elif tipo == "mantenimiento":
+        doc["descripcion"] = rng.choice(MANTENIMIENTOS)
+    return doc
+
+
+def generar_reportes(rng: random.Random, n: int, brigadas: list, trabajadores: list,
+                     clientes: list, productos: list):
+    """
+    Generador (no lista) para no tener 100k documentos en memoria a la vez.
+    """
+    trabajadores_por_ci = {t["CI"]: t for t in trabajadores}
+    for _ in range(n):
+        tipo = rng.choices(["inversion", "averia", "mantenimiento"], weights=[5, 3, 2])[0]
+        yield _reporte(rng, tipo, rng.choice(brigadas), trabajadores_por_ci, rng.choice(clientes), productos)
+
+
+def _insertar(collection, docs, lote: int = 5000) -> int:
+    total = 0
+    buffer = []
+    for doc in docs:
+        buffer.append(doc)
+        if len(buffer) >= lote:
+            collection.insert_many(buffer, ordered=False)
+            total += len(buffer)
+            buffer = []
+    if buffer:
+        collection.insert_many(buffer, ordered=False)
+        total += len(buffer)
+    return total
+
+
+def sembrar(database, escala: float = 1.0, semilla: int = 42, drop: bool = False) -> dict:
+    """
+    Siembra `database` y retorna {coleccion: documentos insertados, "segundos": ...}.
+    """
+    rng = random.Random(semilla)
+    volumen = {k: max(int(v * escala), 1) for k, v in VOLUMENES.items()}
+    # Las brigadas y el catálogo no escalan por debajo de un mínimo razonable
+    volumen["brigadas"] = max(volumen["brigadas"], 5)
+    volumen["trabajadores"] = max(volumen["trabajadores"], volumen["brigadas"] * 3)
+    volumen["categorias"] = max(volumen["categorias"], 5)
+    volumen["materiales_por_categoria"] = max(volumen["materiales_por_categoria"], 10)
+
+    colecciones = ["trabajadores", "brigadas", "clientes", "leads", "productos", "ofertas", "reportes"]
+    if drop:
+        for nombre in colecciones:
+            database.drop_collection(nombre)
+
+    start = time.perf_counter()
+    trabajadores = generar_trabajadores(rng, volumen["trabajadores"])
+    brigadas = generar_brigadas(rng, trabajadores, volumen["brigadas"])
+    clientes = generar_clientes(rng, volumen["clientes"])
+    productos = generar_productos(rng, volumen["categorias"], volumen["materiales_por_categoria"])
+
+    # insert_many añade _id a los dicts; se insertan copias para reutilizarlos al generar reportes
+    insertados = {
+        "trabajadores": _insertar(database["trabajadores"], (dict(t) for t in trabajadores)),
+        "brigadas": _insertar(database["brigadas"], (dict(b) for b in brigadas)),
+        "clientes": _insertar(database["clientes"], (dict(c) for c in clientes)),
+        "leads": _insertar(database["leads"], generar_leads(rng, volumen["leads"])),
+        "productos": _insertar(database["productos"], (dict(p) for p in productos)),
+        "ofertas": _insertar(database["ofertas"], generar_ofertas(rng, volumen["ofertas"], productos)),
+        "reportes": _insertar(database["reportes"], generar_reportes(
+            rng, volumen["reportes"], brigadas, trabajadores, clientes, productos
+        )),
+    }
+    insertados["segundos"] = round(time.perf_counter() - start, 1)
+    return insertados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongodb-url", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="suncar_bench")
+    parser.add_argument("--escala", type=float, default=1.0, help="Multiplicador de los volúmenes por defecto")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--drop", action="store_true", help="Vaciar las colecciones antes de sembrar")
+    parser.add_argument("--forzar", action="store_true", help="Permitir bases cuyo nombre no contiene 'bench'")
+    args = parser.parse_args()
+
+    if "bench" not in args.db and not args.forzar:
+        parser.error(f"La base '{args.db}' no parece de benchmark; usa un nombre con 'bench' o --forzar")
+
+    from pymongo import MongoClient
+    client = MongoClient(args.mongodb_url)
+    resultado = sembrar(client[args.db], escala=args.escala, semilla=args.semilla, drop=args.drop)
+    print(json.dumps({"db": args.db, "escala": args.escala, "insertados": resultado}, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""
+Prueba de carga de extremo a extremo de los endpoints principales.
+
+Lanza N clientes concurrentes contra la API según un perfil de etapas y reporta por
+etapa (y por escenario) las latencias p50/p95/p99, el throughput, los errores y la
+memoria RSS del proceso servidor. El resultado se guarda como JSON en
+benchmarks/results/ con el commit actual, para comparar corridas entre commits.
+
+Modos:
+- En proceso (por defecto): importa `main` y llama a la app por ASGI con httpx, contra
+  la base indicada por --mongodb-url/--db (sembrada con benchmarks.datos_sinteticos).
+  Cliente y servidor comparten event loop, así que las latencias incluyen el coste del
+  cliente; sirve para comparar commits, no como número absoluto.
+- --mongomock: siembra una base mongomock en memoria (--escala) antes de arrancar; útil
+  sin MongoDB local, pero sus tiempos no se parecen a los de un servidor real.
+- --url: contra un servidor ya levantado (uvicorn); con --pid se lee su RSS de /proc.
+
+El perfil es una lista "concurrencia:segundos" separada por comas; cada etapa
+empieza con la memoria que dejó la anterior.
+
+Los escenarios de la vista reportes_view y de brigadas_completas no se incluyen: esas
+vistas se crean en Atlas y su pipeline no está en el repositorio.
+
+Uso:
+    python -m benchmarks.datos_sinteticos --db suncar_bench --drop
+    python -m benchmarks.load_test --db suncar_bench --perfil 1:10,8:20,32:20
+    python -m benchmarks.load_test --mongomock --escala 0.05 --perfil 1:5,8:5
+    python -m benchmarks.load_test --url http://localhost:8000 --token $AUTH_TOKEN --pid 1234
+    python -m benchmarks.load_test --comparar benchmarks/results/a.json benchmarks/results/b.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# (nombre, peso, función que arma la URL a partir de las muestras de la base)
+Escenario = Tuple[str, int, Callable[[random.Random, dict], str]]
+
+ESCENARIOS: List[Escenario] = [
+    ("reportes_por_cliente", 20, lambda rng, m: f"/api/reportes/cliente/{rng.choice(m['clientes'])}"),
+    ("reporte_por_id", 15, lambda rng, m: f"/api/reportes/{rng.choice(m['reportes'])}"),
+    ("materiales_por_brigada", 5, lambda rng, m: (
+        f"/api/reportes/materiales-usados/brigada?lider_ci={rng.choice(m['lideres'])}"
+        f"&fecha_inicio=2024-01-01&fecha_fin=2024-03-31"
+    )),
+    ("clientes_por_nombre", 10, lambda rng, m: f"/api/clientes/?nombre={rng.choice(m['nombres'])}"),
+    ("verificar_cliente", 10, lambda rng, m: f"/api/clientes/{rng.choice(m['clientes'])}/verificar"),
+    ("leads_por_estado", 5, lambda rng, m: f"/api/leads/?estado={rng.choice(['nuevo', 'contactado', 'cotizado'])}"),
+    ("lead_por_id", 10, lambda rng, m: f"/api/leads/{rng.choice(m['leads'])}"),
+    ("productos", 5, lambda rng, m: "/api/productos/"),
+    ("categorias", 10, lambda rng, m: "/api/productos/categorias"),
+    ("ofertas_simplificadas", 5, lambda rng, m: "/api/ofertas/simplified"),
+    ("trabajadores", 5, lambda rng, m: "/api/trabajadores/"),
+]
+
+
+def _parse_perfil(perfil: str) -> List[Tuple[int, float]]:
+    etapas = []
+    for etapa in perfil.split(","):
+        concurrencia, segundos = etapa.split(":")
+        etapas.append((int(concurrencia), float(segundos)))
+    return etapas
+
+
+def _percentil(valores: List[float], p: float) -> Optional[float]:
+    """
+    Percentil por rango más cercano sobre una lista ya ordenada.
+    """
+    if not valores:
+        return None
+    indice = max(int(round(p / 100 * len(valores) + 0.5)) - 1, 0)
+    return round(valores[min(indice, len(valores) - 1)], 2)
+
+
+def _resumen(latencias: List[float], errores: int, segundos: float) -> dict:
+    latencias = sorted(latencias)
+    return {
+        "requests": len(latencias),
+        "errores": errores,
+        "rps": round(len(latencias) / segundos, 1) if segundos else None,
+        "p50_ms": _percentil(latencias, 50),
+        "p95_ms": _percentil(latencias, 95),
+        "p99_ms": _percentil(latencias, 99),
+        "max_ms": round(latencias[-1], 2) if latencias else None,
+    }
+
+
+def _rss_mb(pid: Optional[int]) -> Optional[float]:
+    """
+    RSS actual del proceso (VmRSS de /proc); None si no está disponible.
+    """
+    try:
+        with open(f"/proc/{pid or 'self'}/status") as status:
+            for linea in status:
+                if linea.startswith("VmRSS:"):
+                    return round(int(linea.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+
+def _git_sha() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def obtener_muestras(database, tamano: int = 500, semilla: int = 42) -> dict:
+    """
+    Ids, números y nombres reales de la base para armar las URLs de los escenarios.
+    """
+    def valores(coleccion: str, campo: str) -> list:
+        docs = database[coleccion].find({}, {campo: 1}).limit(tamano * 4)
+        encontrados = [str(doc[campo]) for doc in docs if doc.get(campo) is not None]
+        random.Random(semilla).shuffle(encontrados)
+        return encontrados[:tamano]
+
+    muestras = {
+        "reportes": valores("reportes", "_id"),
+        "clientes": valores("clientes", "numero"),
+        "nombres": [n.split()[0] for n in valores("clientes", "nombre")],
+        "leads": valores("leads", "_id"),
+        "lideres": valores("brigadas", "lider"),
+    }
+    vacias = [nombre for nombre, lista in muestras.items() if not lista]
+    if vacias:
+        raise SystemExit(f"La base no tiene datos para {vacias}; siembra con benchmarks.datos_sinteticos")
+    return muestras
+
+
+async def _trabajador(client, rng: random.Random, muestras: dict, deadline: float,
+                      latencias: Dict[str, List[float]], errores: Dict[str, int]) -> None:
+    nombres = [nombre for nombre, _, _ in ESCENARIOS]
+    pesos = [peso for _, peso, _ in ESCENARIOS]
+    urls = {nombre: url for nombre, _, url in ESCENARIOS}
+    while time.perf_counter() < deadline:
+        escenario = rng.choices(nombres, weights=pesos)[0]
+        url = urls[escenario](rng, muestras)
+        start = time.perf_counter()
+        try:
+            response = await client.get(url)
+            ok = response.status_code < 500
+        except Exception:
+            ok = False
+        latencias[escenario].append((time.perf_counter() - start) * 1000)
+        if not ok:
+            errores[escenario] += 1
+
+
+async def _monitor_rss(pid: Optional[int], muestras_rss: List[float], parar: asyncio.Event) -> None:
+    while not parar.is_set():
+        rss = _rss_mb(pid)
+        if rss is not None:
+            muestras_rss.append(rss)
+        try:
+            await asyncio.wait_for(parar.wait(), timeout=0.5)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def ejecutar_etapa(client, concurrencia: int, segundos: float, muestras: dict,
+                         semilla: int, pid: Optional[int]) -> dict:
+    latencias: Dict[str, List[float]] = defaultdict(list)
+    errores: Dict[str, int] = defaultdict(int)
+    muestras_rss: List[float] = []
+    parar = asyncio.Event()
+    monitor = asyncio.create_task(_monitor_rss(pid, muestras_rss, parar))
+
+    start = time.perf_counter()
+    deadline = start + segundos
+    await asyncio.gather(*[
+        _trabajador(client, random.Random(semilla + i), muestras, deadline, latencias, errores)
+        for i in range(concurrencia)
+    ])
+    duracion = time.perf_counter() - start
+    parar.set()
+    await monitor
+
+    todas = [latencia for lista in latencias.values() for latencia in lista]
+    etapa = {
+        "concurrencia": concurrencia,
+        "segundos": round(duracion, 2),
+        **_resumen(todas, sum(errores.values()), duracion),
+        "rss_mb": {
+            "final": muestras_rss[-1] if muestras_rss else None,
+            "pico": max(muestras_rss) if muestras_rss else None,
+        },
+        "escenarios": {
+            nombre: _resumen(latencias[nombre], errores[nombre], duracion)
+            for nombre, _, _ in ESCENARIOS if latencias[nombre]
+        },
+    }
+    return etapa
+
+
+def _preparar_en_proceso(args) -> Tuple[object, object]:
+    """
+    Configura el entorno antes de importar `main` y devuelve (app, database).
+    """
+    os.environ.setdefault("AUTH_TOKEN", args.token or "bench-token")
+    args.token = os.environ["AUTH_TOKEN"]
+    if not args.mongomock:
+        os.environ["MONGODB_URL"] = args.mongodb_url
+        os.environ["DATABASE_NAME"] = args.db
+
+    from infrastucture.database.mongo_db.connection import mongo_db, get_database
+
+    if args.mongomock:
+        import mongomock
+        from benchmarks.datos_sinteticos import sembrar
+
+        # Los repositorios usan Cursor.to_list() de pymongo >= 4.9, que mongomock no tiene
+        if not hasattr(mongomock.collection.Cursor, "to_list"):
+            mongomock.collection.Cursor.to_list = lambda self, length=None: list(self)[:length]
+
+        mongo_db.client = mongomock.MongoClient()
+        mongo_db.database = mongo_db.client[args.db]
+        sembrado = sembrar(mongo_db.database, escala=args.escala, semilla=args.semilla)
+        print(f"mongomock sembrado: {sembrado}", file=sys.stderr)
+
+    from main import app
+    return app, get_database()
+
+
+async def ejecutar(args) -> dict:
+    import httpx
+
+    etapas = _parse_perfil(args.perfil)
+    pid = args.pid
+    if args.url:
+        from pymongo import MongoClient
+        database = MongoClient(args.mongodb_url)[args.db]
+        transport = None
+        base_url = args.url
+    else:
+        app, database = _preparar_en_proceso(args)
+        # Las excepciones no capturadas de la app cuentan como 500, igual que con uvicorn
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        base_url = "http://bench"
+        pid = None
+
+    muestras = obtener_muestras(database, semilla=args.semilla)
+    limits = httpx.Limits(max_connections=max(c for c, _ in etapas))
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+
+    resultado = {
+        "commit": _git_sha(),
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "modo": "url" if args.url else ("mongomock" if args.mongomock else "en_proceso"),
+        "perfil": args.perfil,
+        "db": args.db,
+        "python": sys.version.split()[0],
+        "etapas": [],
+    }
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, headers=headers,
+                                 limits=limits, timeout=args.timeout) as client:
+        # Calentar: primera conexión a MongoDB, cachés e imports diferidos
+        for _, _, url in ESCENARIOS:
+            await client.get(url(random.Random(args.semilla), muestras))
+        resultado["rss_inicial_mb"] = _rss_mb(pid)
+
+        for i, (concurrencia, segundos) in enumerate(etapas):
+            etapa = await ejecutar_etapa(client, concurrencia, segundos, muestras, args.semilla + i * 1000, pid)
+            resultado["etapas"].append(etapa)
+            print(
+                f"c={concurrencia}: {etapa['rps']} req/s, p50 {etapa['p50_ms']} ms, "
+                f"p95 {etapa['p95_ms']} ms, p99 {etapa['p99_ms']} ms, errores {etapa['errores']}",
+                file=sys.stderr
+            )
+
+    if pid is None:
+        # ru_maxrss está en KB en Linux
+        resultado["rss_max_proceso_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return resultado
+
+
+def _variacion(antes: Optional[float], despues: Optional[float]) -> Optional[str]:
+    if not antes or despues is None:
+        return None
+    return f"{(despues - antes) / antes * 100:+.1f}%"
+
+
+def comparar(ruta_a: str, ruta_b: str) -> dict:
+    """
+    Compara dos resultados etapa por etapa (emparejadas por concurrencia).
+    """
+    with open(ruta_a) as f:
+        a = json.load(f)
+    with open(ruta_b) as f:
+        b = json.load(f)
+    etapas_b = {etapa["concurrencia"]: etapa for etapa in b["etapas"]}
+    comparacion = {"a": {"commit": a.get("commit"), "fecha": a.get("fecha")},
+                   "b": {"commit": b.get("commit"), "fecha": b.get("fecha")}, "etapas": []}
+    for etapa_a in a["etapas"]:
+        etapa_b = etapas_b.get(etapa_a["concurrencia"])
+        if etapa_b is None:
+            continue
+        comparacion["etapas"].append({
+            "concurrencia": etapa_a["concurrencia"],
+            **{
+                clave: {"a": etapa_a.get(clave), "b": etapa_b.get(clave),
+                        "variacion": _variacion(etapa_a.get(clave), etapa_b.get(clave))}
+                for clave in ("rps", "p50_ms", "p95_ms", "p99_ms", "errores")
+            },
+            "rss_pico_mb": {"a": etapa_a["rss_mb"]["pico"], "b": etapa_b["rss_mb"]["pico"]},
+        })
+    return comparacion
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--perfil", default="1:10,8:20,32:20", help="Etapas concurrencia:segundos")
+    parser.add_argument("--mongodb-url", default="mongodb://localhost:27017")
+    parser.add_argument("--db", default="suncar_bench")
+    parser.add_argument("--mongomock", action="store_true", help="Base en memoria sembrada al arrancar")
+    parser.add_argument("--escala", type=float, default=0.05, help="Escala del sembrado con --mongomock")
+    parser.add_argument("--url", help="URL de un servidor ya levantado")
+    parser.add_argument("--token", help="Bearer token (por defecto AUTH_TOKEN)")
+    parser.add_argument("--pid", type=int, help="PID del servidor para leer su RSS (con --url)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", help="Archivo JSON de salida (por defecto en benchmarks/results/)")
+    parser.add_argument("--comparar", nargs=2, metavar=("A", "B"), help="Comparar dos resultados")
+    args = parser.parse_args()
+
+    if args.comparar:
+        print(json.dumps(comparar(*args.comparar), indent=2, ensure_ascii=False))
+        return
+
+    args.token = args.token or os.getenv("AUTH_TOKEN")
+    resultado = asyncio.run(ejecutar(args))
+
+    salida = args.salida
+    if not salida:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        marca = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        salida = os.path.join(RESULTS_DIR, f"load_{marca}_{resultado['commit'] or 'sin-commit'}.json")
+    with open(salida, "w") as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+    print(f"Resultado guardado en {salida}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,10 @@ from pymongo import MongoClient
 from typing import Optional
 import logging
 
+from infrastucture.observability.mongo_monitoring import (
+    mongo_timing_listener, slow_query_listener, pool_stats_listener
+)
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -60,7 +64,10 @@ def connect_to_mongo():
             connectTimeoutMS=10000,  # Connection timeout
             # Configuraciones adicionales
             retryWrites=True,
-            w="majority"
+            w="majority",
+            # Tiempo de cada comando para el desglose Server-Timing, registro de consultas
+            # lentas y estado del pool para /metrics
+            event_listeners=[mongo_timing_listener, slow_query_listener, pool_stats_listener]
         )
 
         # Seleccionar base de datos
@@ -1,4 +1,4 @@
-from typing import Annotated  # Recommended for clearer type hinting in FastAPI
+from typing import Annotated, Optional  # Recommended for clearer type hinting in FastAPI
 from fastapi import Depends
 
 from application.services.client_service import ClientService
@@ -11,6 +11,9 @@ from application.services.contacto_service import ContactoService
 from application.services.chat_service import ChatService
 from application.services.oferta_service import OfertaService
 from application.services.leads_service import LeadsService
+from application.services.cotizacion_service import CotizacionService
+from application.services.email_outbox_service import EmailOutboxService
+from application.services.session_token_service import SessionTokenService
 from infrastucture.repositories.adjuntos_repository import AdjuntosRepository
 from infrastucture.external_services.gemini_provider import GeminiProvider
 from application.services.brigada_service import BrigadaService
@@ -18,16 +21,22 @@ from infrastucture.repositories.client_repository import ClientRepository
 from infrastucture.repositories.productos_repository import ProductRepository
 from infrastucture.repositories.trabajadores_repository import WorkerRepository
 from infrastucture.repositories.reportes_repository import FormRepository  # Nota el plural "repositories"
+from infrastucture.repositories.reportes_view_materializada import ReportesViewMaterializada
 from infrastucture.repositories.brigada_repository import BrigadaRepository
 from infrastucture.repositories.update_repository import UpdateRepository
 from infrastucture.repositories.contacto_repository import ContactoRepository
 from infrastucture.repositories.ofertas_repository import OfertasRepository
 from infrastucture.repositories.leads_repository import LeadsRepository
+from infrastucture.repositories.email_outbox_repository import EmailOutboxRepository
+from infrastucture.repositories.refresh_tokens_repository import RefreshTokensRepository
+from infrastucture.observability.metrics_registry import metrics_registry
 
 # Global singleton instances for repositories
 product_repository = ProductRepository()
 worker_repository = WorkerRepository()
-form_repository = FormRepository()
+# Materialized copy of reportes_view, refreshed after each saved report and by its worker
+reportes_view_materializada = ReportesViewMaterializada()
+form_repository = FormRepository(reportes_view_materializada)
 brigada_repository = BrigadaRepository()
 client_repository = ClientRepository()
 adjuntos_repository = AdjuntosRepository()
@@ -35,9 +44,25 @@ update_repository = UpdateRepository()
 contacto_repository = ContactoRepository()
 ofertas_repository = OfertasRepository()
 leads_repository = LeadsRepository()
+email_outbox_repository = EmailOutboxRepository()
+refresh_tokens_repository = RefreshTokensRepository()
 
-# Global singleton instances for external services
-gemini_provider = GeminiProvider()
+# Global singleton instances for external services (created on first use to keep cold starts fast)
+_gemini_provider: Optional[GeminiProvider] = None
+
+# Global singleton for the background email sender (shared by requests and the worker)
+email_outbox_service = EmailOutboxService(email_outbox_repository)
+
+# Global singleton for signing/verifying leader session tokens (also used by AuthMiddleware)
+session_token_service = SessionTokenService()
+
+# Services built here report into the process metrics registry (GET /metrics).
+# The Gemini provider only reports once it has been built by a request.
+metrics_registry.register("email_outbox", email_outbox_service.metric_families)
+metrics_registry.register("reportes_view", reportes_view_materializada.metric_families)
+metrics_registry.register(
+    "gemini", lambda: _gemini_provider.metric_families() if _gemini_provider is not None else []
+)
 
 
 # Dependency functions for repositories
@@ -142,7 +167,14 @@ def get_auth_service(
     """
     Dependency for FastAPI that returns an instance of AuthService.
     """
-    return AuthService(worker_repo, brigada_repo)
+    return AuthService(worker_repo, brigada_repo, session_token_service, refresh_tokens_repository)
+
+
+def get_session_token_service() -> SessionTokenService:
+    """
+    Dependency for FastAPI that returns the singleton instance of SessionTokenService.
+    """
+    return session_token_service
 
 
 def get_update_service(
@@ -170,8 +202,12 @@ def get_brigada_service(
 def get_gemini_provider() -> GeminiProvider:
     """
     Dependency for FastAPI that returns the singleton instance of GeminiProvider.
+    The provider (and the google.genai SDK) is built on the first request that needs it.
     """
-    return gemini_provider
+    global _gemini_provider
+    if _gemini_provider is None:
+        _gemini_provider = GeminiProvider()
+    return _gemini_provider
 
 
 def get_chat_service(
@@ -199,3 +235,32 @@ def get_leads_service(
     """
     return LeadsService(leads_repo)
 
+
+def get_email_outbox_repository() -> EmailOutboxRepository:
+    """
+    Dependency for FastAPI that returns the singleton instance of EmailOutboxRepository.
+    """
+    return email_outbox_repository
+
+
+def get_email_outbox_service() -> EmailOutboxService:
+    """
+    Dependency for FastAPI that returns the singleton instance of EmailOutboxService.
+    """
+    return email_outbox_service
+
+
+def get_reportes_view_materializada() -> ReportesViewMaterializada:
+    """
+    Dependency for FastAPI that returns the singleton instance of ReportesViewMaterializada.
+    """
+    return reportes_view_materializada
+
+
+def get_cotizacion_service(
+        outbox_service: Annotated[EmailOutboxService, Depends(get_email_outbox_service)]
+) -> CotizacionService:
+    """
+    Dependency for FastAPI that returns an instance of CotizacionService.
+    """
+    return CotizacionService(outbox_service)
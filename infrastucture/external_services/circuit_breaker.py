@@ -0,0 +1,132 @@
+import time
+import logging
+from typing import List, Optional
+
+from infrastucture.observability.metrics_registry import MetricFamily
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Se lanza cuando el circuito está abierto y la llamada se rechaza sin intentarla."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker simple de tres estados (closed, open, half_open).
+
+    - closed: las llamadas pasan; cada fallo consecutivo suma al contador.
+    - open: tras `failure_threshold` fallos consecutivos se rechaza todo durante
+      `reset_timeout` segundos, para que el llamador use su fallback local de inmediato.
+    - half_open: pasado el `reset_timeout` se deja pasar una única llamada de prueba;
+      si tiene éxito el circuito se cierra, si falla se vuelve a abrir.
+
+    Está pensado para usarse desde el event loop (un solo hilo), por lo que no usa locks.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+        # Contadores para métricas
+        self.trips = 0
+        self.rejected = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._opened_at is not None:
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+        return self._state
+
+    def before_call(self) -> None:
+        """
+        Comprueba si la llamada puede realizarse. Lanza CircuitOpenError si no.
+        """
+        state = self.state
+        if state == self.OPEN:
+            self.rejected += 1
+            raise CircuitOpenError(f"Circuito '{self.name}' abierto")
+        if state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(f"Circuito '{self.name}' en prueba (half-open)")
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        self.successes += 1
+        self._consecutive_failures = 0
+        if self._state != self.CLOSED:
+            logger.info(f"Circuito '{self.name}' cerrado tras prueba exitosa")
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self, timeout: bool = False) -> None:
+        self.failures += 1
+        if timeout:
+            self.timeouts += 1
+        self._consecutive_failures += 1
+        if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            self._trip()
+
+    def release_probe(self) -> None:
+        """
+        Libera la llamada de prueba en half-open sin contarla como éxito ni fallo
+        (por ejemplo, cuando el cliente abandona un stream).
+        """
+        self._probe_in_flight = False
+
+    def _trip(self) -> None:
+        if self._state != self.OPEN:
+            self.trips += 1
+            logger.warning(
+                f"Circuito '{self.name}' abierto tras {self._consecutive_failures} fallos consecutivos"
+            )
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        """
+        Estado actual y contadores del circuito, para el endpoint de métricas.
+        """
+        return {
+            "name": self.name,
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout_seconds": self.reset_timeout,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+        }
+
+    def metric_families(self) -> List[MetricFamily]:
+        labels = {"circuit": self.name}
+        state = MetricFamily("suncar_circuit_breaker_state", "gauge", "Estado del circuit breaker (1 = estado actual)")
+        current = self.state
+        for candidate in (self.CLOSED, self.OPEN, self.HALF_OPEN):
+            state.add(int(current == candidate), {**labels, "state": candidate})
+        return [
+            state,
+            MetricFamily("suncar_circuit_breaker_trips_total", "counter", "Aperturas del circuito").add(self.trips, labels),
+            MetricFamily("suncar_circuit_breaker_rejected_total", "counter",
+                         "Llamadas rechazadas con el circuito abierto").add(self.rejected, labels),
+        ]
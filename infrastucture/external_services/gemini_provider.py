@@ -1,9 +1,12 @@
 import asyncio
 import os
+import time
 from typing import Optional, AsyncGenerator, TypeVar, Type
 from pydantic import BaseModel
-from google import genai
-from google.genai import types
+
+from infrastucture.external_services.circuit_breaker import CircuitBreaker
+from infrastucture.external_services.llm_metrics import LLMUsageTracker
+from infrastucture.observability import request_timing
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -14,22 +17,103 @@ class GeminiProvider:
         self.api_key = os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY environment variable is required")
+        # Import diferido: google.genai es de lo más pesado del arranque y solo se
+        # necesita cuando se usa el chat (ver get_gemini_provider en dependencies)
+        from google import genai
+        from google.genai import types
+        self.types = types
         self.client = genai.Client(api_key=self.api_key)
+        self.breaker = CircuitBreaker(
+            "gemini",
+            failure_threshold=int(os.getenv("GEMINI_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.getenv("GEMINI_BREAKER_RESET_SECONDS", "30"))
+        )
+        self.usage = LLMUsageTracker()
+
+    async def _call(self, func, model: str, prompt: str, operation: str, timeout: Optional[float] = None):
+        """
+        Ejecuta una llamada bloqueante al SDK en un hilo, respetando el circuit breaker
+        y el presupuesto de latencia (timeout en segundos), y registra su uso.
+
+        `func` recibe un dict `call_info` donde puede dejar el usage_metadata de la
+        respuesta ("usage") y el tiempo al primer token en ms ("ttft_ms").
+
+        Si se agota el presupuesto se lanza asyncio.TimeoutError; el hilo del SDK sigue
+        hasta terminar por su cuenta, pero el request deja de esperarlo.
+        Si el circuito está abierto se lanza CircuitOpenError sin llamar a Gemini.
+        """
+        self.breaker.before_call()
+        call_info = {}
+        start = time.perf_counter()
+        try:
+            if timeout is None:
+                result = await asyncio.to_thread(func, call_info)
+            else:
+                result = await asyncio.wait_for(asyncio.to_thread(func, call_info), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.breaker.record_failure(timeout=True)
+            self._record(operation, model, start, call_info, prompt, error="timeout", timeout=True)
+            raise
+        except asyncio.CancelledError:
+            # Request cancelado (p. ej. el cliente se fue): no cuenta como fallo de Gemini,
+            # pero hay que liberar la prueba o el circuito se queda en half-open
+            self.breaker.release_probe()
+            self._record(operation, model, start, call_info, prompt, error="cancelled")
+            raise
+        except Exception as e:
+            self.breaker.record_failure()
+            self._record(operation, model, start, call_info, prompt, error=type(e).__name__)
+            raise
+        self.breaker.record_success()
+        self._record(operation, model, start, call_info, prompt)
+        return result
+
+    def _record(self, operation: str, model: str, start: float, call_info: dict, prompt: str,
+                error: Optional[str] = None, timeout: bool = False) -> None:
+        latency_ms = (time.perf_counter() - start) * 1000
+        request_timing.add("llm", latency_ms)
+        self.usage.record(
+            operation=operation,
+            model=model,
+            latency_ms=latency_ms,
+            usage=call_info.get("usage"),
+            ttft_ms=call_info.get("ttft_ms"),
+            retries=call_info.get("retries", 0),
+            error=error,
+            timeout=timeout,
+            prompt=prompt
+        )
+
+    def get_stats(self) -> dict:
+        """
+        Métricas del proveedor: estado del circuit breaker y uso por operación/modelo
+        (tokens, latencia, tiempo al primer token, reintentos, aciertos de caché).
+        """
+        return {
+            "circuit_breaker": self.breaker.snapshot(),
+            "usage": self.usage.snapshot()
+        }
+
+    def metric_families(self) -> list:
+        return self.breaker.metric_families() + self.usage.metric_families()
     
-    async def chat(self, model: str, prompt: str, system_prompt: Optional[str] = None, streaming: bool = False) -> str:
+    async def chat(self, model: str, prompt: str, system_prompt: Optional[str] = None, streaming: bool = False,
+                   timeout: Optional[float] = None, operation: str = "chat") -> str:
         if streaming:
-            return await self._chat_streaming(model, prompt, system_prompt)
+            return await self._chat_streaming(model, prompt, system_prompt, timeout, operation)
         else:
-            return await self._chat_sync(model, prompt, system_prompt)
+            return await self._chat_sync(model, prompt, system_prompt, timeout, operation)
     
-    async def _chat_streaming(self, model: str, prompt: str, system_prompt: Optional[str] = None) -> str:
-        def sync_streaming():
+    async def _chat_streaming(self, model: str, prompt: str, system_prompt: Optional[str] = None,
+                              timeout: Optional[float] = None, operation: str = "chat") -> str:
+        def sync_streaming(call_info: dict):
+            start = time.perf_counter()
             result = ""
             config = None
             
             # Configure system instruction if provided
             if system_prompt:
-                config = types.GenerateContentConfig(
+                config = self.types.GenerateContentConfig(
                     system_instruction=system_prompt
                 )
             
@@ -40,18 +124,23 @@ class GeminiProvider:
                 config=config
             ):
                 if hasattr(chunk, 'text') and chunk.text:
+                    if "ttft_ms" not in call_info:
+                        call_info["ttft_ms"] = (time.perf_counter() - start) * 1000
                     result += chunk.text
+                if getattr(chunk, 'usage_metadata', None):
+                    call_info["usage"] = chunk.usage_metadata
             return result
         
-        return await asyncio.to_thread(sync_streaming)
+        return await self._call(sync_streaming, model, prompt, operation, timeout)
     
-    async def _chat_sync(self, model: str, prompt: str, system_prompt: Optional[str] = None) -> str:
-        def sync_chat():
+    async def _chat_sync(self, model: str, prompt: str, system_prompt: Optional[str] = None,
+                         timeout: Optional[float] = None, operation: str = "chat") -> str:
+        def sync_chat(call_info: dict):
             config = None
             
             # Configure system instruction if provided
             if system_prompt:
-                config = types.GenerateContentConfig(
+                config = self.types.GenerateContentConfig(
                     system_instruction=system_prompt
                 )
             
@@ -60,6 +149,7 @@ class GeminiProvider:
                 contents=prompt,
                 config=config
             )
+            call_info["usage"] = getattr(response, 'usage_metadata', None)
             
             # Extract text from response
             if hasattr(response, 'text') and response.text:
@@ -72,9 +162,10 @@ class GeminiProvider:
             
             return str(response)
         
-        return await asyncio.to_thread(sync_chat)
+        return await self._call(sync_chat, model, prompt, operation, timeout)
     
-    async def chat_stream(self, model: str, prompt: str, system_prompt: Optional[str] = None) -> AsyncGenerator[str, None]:
+    async def chat_stream(self, model: str, prompt: str, system_prompt: Optional[str] = None,
+                          timeout: Optional[float] = None, operation: str = "chat_stream") -> AsyncGenerator[str, None]:
         """
         Genera contenido en streaming, produciendo chunks de texto en tiempo real
         
@@ -82,16 +173,23 @@ class GeminiProvider:
             model: Modelo a usar
             prompt: Prompt del usuario
             system_prompt: Prompt del sistema (opcional)
+            timeout: Presupuesto total en segundos para todo el stream (opcional)
+            operation: Nombre de la operación para las métricas de uso
             
         Yields:
             Chunks de texto conforme se generan
         """
-        import queue
         import threading
         
+        self.breaker.before_call()
+
         # Cola para pasar chunks del hilo sincrónico al async
         chunk_queue = asyncio.Queue()
         exception_holder = [None]
+        call_info = {}
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
         
         def sync_streaming():
             try:
@@ -99,7 +197,7 @@ class GeminiProvider:
                 
                 # Configure system instruction if provided
                 if system_prompt:
-                    config = types.GenerateContentConfig(
+                    config = self.types.GenerateContentConfig(
                         system_instruction=system_prompt
                     )
                 
@@ -109,44 +207,68 @@ class GeminiProvider:
                     contents=prompt,
                     config=config
                 ):
+                    if getattr(chunk, 'usage_metadata', None):
+                        call_info["usage"] = chunk.usage_metadata
                     if hasattr(chunk, 'text') and chunk.text:
                         # Poner chunk en la cola de manera thread-safe
                         asyncio.run_coroutine_threadsafe(
                             chunk_queue.put(chunk.text), 
-                            asyncio.get_event_loop()
+                            loop
                         )
                 
                 # Señal de que terminó
                 asyncio.run_coroutine_threadsafe(
                     chunk_queue.put(None), 
-                    asyncio.get_event_loop()
+                    loop
                 )
                 
             except Exception as e:
                 exception_holder[0] = e
                 asyncio.run_coroutine_threadsafe(
                     chunk_queue.put(None), 
-                    asyncio.get_event_loop()
+                    loop
                 )
         
-        # Ejecutar streaming en un hilo separado
-        thread = threading.Thread(target=sync_streaming)
+        # Ejecutar streaming en un hilo separado (daemon: si se agota el presupuesto
+        # no bloqueamos el event loop esperando a que el SDK termine)
+        thread = threading.Thread(target=sync_streaming, daemon=True)
         thread.start()
         
         try:
             # Yield chunks conforme llegan
             while True:
-                chunk = await chunk_queue.get()
+                if deadline is None:
+                    chunk = await chunk_queue.get()
+                else:
+                    chunk = await asyncio.wait_for(chunk_queue.get(), timeout=max(deadline - loop.time(), 0))
                 if chunk is None:  # Señal de finalización
                     break
-                if exception_holder[0]:
-                    raise exception_holder[0]
+                if "ttft_ms" not in call_info:
+                    call_info["ttft_ms"] = (time.perf_counter() - start) * 1000
                 yield chunk
-        finally:
-            thread.join()
+            if exception_holder[0]:
+                raise exception_holder[0]
+        except asyncio.TimeoutError:
+            self.breaker.record_failure(timeout=True)
+            self._record(operation, model, start, call_info, prompt, error="timeout", timeout=True)
+            raise
+        except Exception as e:
+            self.breaker.record_failure()
+            self._record(operation, model, start, call_info, prompt, error=type(e).__name__)
+            raise
+        except (GeneratorExit, asyncio.CancelledError):
+            # El cliente cerró el stream (o se canceló la tarea de la StreamingResponse):
+            # no es un fallo de Gemini, solo liberamos la prueba
+            self.breaker.release_probe()
+            self._record(operation, model, start, call_info, prompt, error="client_disconnected")
+            raise
+        else:
+            self.breaker.record_success()
+            self._record(operation, model, start, call_info, prompt)
 
     async def chat_with_schema(self, model: str, prompt: str, response_schema: Type[T],
-                              system_prompt: Optional[str] = None) -> T:
+                              system_prompt: Optional[str] = None, timeout: Optional[float] = None,
+                              operation: str = "chat_with_schema") -> T:
         """
         Genera contenido con validación automática usando Pydantic models
 
@@ -155,12 +277,14 @@ class GeminiProvider:
             prompt: Prompt del usuario
             response_schema: Clase Pydantic para validar la respuesta
             system_prompt: Prompt del sistema (opcional)
+            timeout: Presupuesto de latencia en segundos (opcional)
+            operation: Nombre de la operación para las métricas de uso
 
         Returns:
             Instancia validada del modelo Pydantic
         """
-        def sync_chat_with_schema():
-            config = types.GenerateContentConfig(
+        def sync_chat_with_schema(call_info: dict):
+            config = self.types.GenerateContentConfig(
                 response_mime_type="application/json",
                 response_schema=response_schema
             )
@@ -174,8 +298,9 @@ class GeminiProvider:
                 contents=prompt,
                 config=config
             )
+            call_info["usage"] = getattr(response, 'usage_metadata', None)
 
             # Return the parsed Pydantic model instance
             return response.parsed
 
-        return await asyncio.to_thread(sync_chat_with_schema)
\ No newline at end of file
+        return await self._call(sync_chat_with_schema, model, prompt, operation, timeout)
\ No newline at end of file
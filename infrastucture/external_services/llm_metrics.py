@@ -0,0 +1,171 @@
+import os
+import random
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Tuple
+
+from infrastucture.observability.metrics_registry import MetricFamily, cache_metric_families
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(values, pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return round(ordered[index], 2)
+
+
+class _OperationStats:
+    """
+    Agregado en memoria de las llamadas de una operación (endpoint) con un modelo concreto.
+    Las latencias se guardan en una ventana deslizante para calcular percentiles.
+    """
+
+    def __init__(self, window: int):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self.cached_tokens = 0
+        self.latency_total_ms = 0.0
+        self.latency_max_ms = 0.0
+        self.latencies_ms = deque(maxlen=window)
+        self.ttft_ms = deque(maxlen=window)
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "cache_hits": self.cache_hits,
+            "prompt_tokens": self.prompt_tokens,
+            "response_tokens": self.response_tokens,
+            "cached_tokens": self.cached_tokens,
+            "avg_prompt_tokens": round(self.prompt_tokens / self.calls, 1) if self.calls else 0,
+            "latency_ms": {
+                "avg": round(self.latency_total_ms / self.calls, 2) if self.calls else None,
+                "p50": _percentile(self.latencies_ms, 50),
+                "p95": _percentile(self.latencies_ms, 95),
+                "max": round(self.latency_max_ms, 2),
+            },
+            "ttft_ms": {
+                "p50": _percentile(self.ttft_ms, 50),
+                "p95": _percentile(self.ttft_ms, 95),
+            },
+        }
+
+
+class LLMUsageTracker:
+    """
+    Registro en proceso del uso del LLM: tokens, latencia total, tiempo al primer token,
+    reintentos y aciertos de caché por operación y modelo.
+
+    Opcionalmente guarda una muestra de los prompts lentos (GEMINI_SLOW_PROMPT_MS y
+    GEMINI_SLOW_PROMPT_SAMPLE_RATE) para poder ajustar el tamaño de los prompts.
+    """
+
+    def __init__(self, window: int = 500, slow_prompt_ms: Optional[float] = None,
+                 slow_prompt_sample_rate: Optional[float] = None, slow_prompt_log_size: int = 50):
+        self.window = window
+        self.slow_prompt_ms = slow_prompt_ms if slow_prompt_ms is not None else float(
+            os.getenv("GEMINI_SLOW_PROMPT_MS", "5000"))
+        self.slow_prompt_sample_rate = slow_prompt_sample_rate if slow_prompt_sample_rate is not None else float(
+            os.getenv("GEMINI_SLOW_PROMPT_SAMPLE_RATE", "0"))
+        self._stats: Dict[Tuple[str, str], _OperationStats] = {}
+        self._slow_prompts = deque(maxlen=slow_prompt_log_size)
+
+    def record(self, operation: str, model: str, latency_ms: float, usage=None,
+               ttft_ms: Optional[float] = None, retries: int = 0, error: Optional[str] = None,
+               timeout: bool = False, prompt: Optional[str] = None) -> None:
+        """
+        Registra una llamada. `usage` es el usage_metadata devuelto por el SDK de Gemini.
+        """
+        stats = self._stats.get((operation, model))
+        if stats is None:
+            stats = self._stats[(operation, model)] = _OperationStats(self.window)
+
+        stats.calls += 1
+        stats.retries += retries
+        stats.latency_total_ms += latency_ms
+        stats.latency_max_ms = max(stats.latency_max_ms, latency_ms)
+        stats.latencies_ms.append(latency_ms)
+        if ttft_ms is not None:
+            stats.ttft_ms.append(ttft_ms)
+        if error is not None:
+            stats.errors += 1
+        if timeout:
+            stats.timeouts += 1
+
+        prompt_tokens = response_tokens = cached_tokens = 0
+        if usage is not None:
+            prompt_tokens = getattr(usage, "prompt_token_count", None) or 0
+            response_tokens = getattr(usage, "candidates_token_count", None) or 0
+            cached_tokens = getattr(usage, "cached_content_token_count", None) or 0
+        stats.prompt_tokens += prompt_tokens
+        stats.response_tokens += response_tokens
+        stats.cached_tokens += cached_tokens
+        if cached_tokens:
+            stats.cache_hits += 1
+
+        if (prompt is not None and latency_ms >= self.slow_prompt_ms
+                and self.slow_prompt_sample_rate > 0 and random.random() < self.slow_prompt_sample_rate):
+            entry = {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "operation": operation,
+                "model": model,
+                "latency_ms": round(latency_ms, 2),
+                "prompt_tokens": prompt_tokens,
+                "prompt_chars": len(prompt),
+                "prompt_preview": prompt[:500],
+            }
+            self._slow_prompts.append(entry)
+            logger.warning(
+                f"Prompt lento en {operation} ({model}): {latency_ms:.0f} ms, {prompt_tokens} tokens de entrada"
+            )
+
+    def snapshot(self) -> dict:
+        operations: Dict[str, dict] = {}
+        for (operation, model), stats in self._stats.items():
+            operations.setdefault(operation, {})[model] = stats.snapshot()
+        return {
+            "operations": operations,
+            "slow_prompts": list(self._slow_prompts),
+        }
+
+    def reset(self) -> None:
+        self._stats.clear()
+        self._slow_prompts.clear()
+
+    def metric_families(self) -> List[MetricFamily]:
+        calls = MetricFamily("suncar_llm_calls_total", "counter", "Llamadas al LLM")
+        errors = MetricFamily("suncar_llm_errors_total", "counter", "Llamadas al LLM fallidas")
+        timeouts = MetricFamily("suncar_llm_timeouts_total", "counter", "Llamadas al LLM que agotaron el presupuesto")
+        retries = MetricFamily("suncar_llm_retries_total", "counter", "Reintentos del SDK del LLM")
+        tokens = MetricFamily("suncar_llm_tokens_total", "counter", "Tokens del LLM por tipo")
+        latency = MetricFamily(
+            "suncar_llm_latency_milliseconds_total", "counter", "Latencia acumulada de las llamadas al LLM"
+        )
+        cache_hits = total_calls = 0
+        for (operation, model), stats in sorted(self._stats.items()):
+            labels = {"operation": operation, "model": model}
+            calls.add(stats.calls, labels)
+            errors.add(stats.errors, labels)
+            timeouts.add(stats.timeouts, labels)
+            retries.add(stats.retries, labels)
+            tokens.add(stats.prompt_tokens, {**labels, "type": "prompt"})
+            tokens.add(stats.response_tokens, {**labels, "type": "response"})
+            tokens.add(stats.cached_tokens, {**labels, "type": "cached"})
+            latency.add(stats.latency_total_ms, labels)
+            cache_hits += stats.cache_hits
+            total_calls += stats.calls
+        # Llamadas que reutilizaron contexto cacheado por Gemini
+        return [calls, errors, timeouts, retries, tokens, latency] + cache_metric_families(
+            "gemini_context", cache_hits, total_calls - cache_hits
+        )
@@ -1,14 +1,41 @@
 import os
+import time
 import uuid
-from minio import Minio
-from minio.error import S3Error
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
+from infrastucture.observability.metrics_registry import MetricFamily, metrics_registry
+from infrastucture.observability.request_timing import track
+
+if TYPE_CHECKING:
+    from minio import Minio
+
 _minio_client = None
 
-def get_minio_client() -> Minio:
+# Contadores de subidas del proceso para /metrics
+_upload_stats = {"uploads": 0, "errors": 0, "bytes": 0, "latency_total_ms": 0.0, "latency_max_ms": 0.0}
+
+
+def _collect_metrics():
+    return [
+        MetricFamily("suncar_minio_uploads_total", "counter", "Subidas a MinIO completadas").add(_upload_stats["uploads"]),
+        MetricFamily("suncar_minio_upload_errors_total", "counter", "Subidas a MinIO fallidas").add(_upload_stats["errors"]),
+        MetricFamily("suncar_minio_upload_bytes_total", "counter", "Bytes subidos a MinIO").add(_upload_stats["bytes"]),
+        MetricFamily("suncar_minio_upload_duration_milliseconds_total", "counter",
+                     "Tiempo acumulado de las subidas a MinIO").add(_upload_stats["latency_total_ms"]),
+        MetricFamily("suncar_minio_upload_duration_milliseconds_max", "gauge",
+                     "Subida a MinIO más lenta").add(_upload_stats["latency_max_ms"]),
+    ]
+
+
+metrics_registry.register("minio", _collect_metrics)
+
+def get_minio_client() -> "Minio":
     global _minio_client
     if _minio_client is None:
+        # Import diferido: el SDK de MinIO solo se carga al subir el primer archivo
+        from minio import Minio
+
         MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT")
         MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY")
         MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY")
@@ -37,6 +64,25 @@ def get_minio_client() -> Minio:
     return _minio_client
 
 async def upload_file_to_minio(file_content: bytes, original_filename: str, content_type: str, bucket_name: str = None) -> str:
+    # Cuenta en la categoría "storage" del Server-Timing
+    start = time.perf_counter()
+    try:
+        with track("storage"):
+            url = await _upload_file_to_minio(file_content, original_filename, content_type, bucket_name)
+    except Exception:
+        _upload_stats["errors"] += 1
+        raise
+    finally:
+        latency_ms = (time.perf_counter() - start) * 1000
+        _upload_stats["latency_total_ms"] += latency_ms
+        _upload_stats["latency_max_ms"] = max(_upload_stats["latency_max_ms"], latency_ms)
+    _upload_stats["uploads"] += 1
+    _upload_stats["bytes"] += len(file_content)
+    return url
+
+async def _upload_file_to_minio(file_content: bytes, original_filename: str, content_type: str, bucket_name: str = None) -> str:
+    from minio.error import S3Error
+
     BUCKET_NAME = bucket_name or os.getenv("MINIO_BUCKET", "photos")
     minio_client = get_minio_client()
 
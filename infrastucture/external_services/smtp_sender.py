@@ -0,0 +1,195 @@
+import asyncio
+import os
+import time
+import logging
+from email.message import EmailMessage
+from typing import List, Optional
+
+import aiosmtplib
+
+from infrastucture.observability.metrics_registry import MetricFamily
+
+logger = logging.getLogger(__name__)
+
+# Fallos de la sesión (conexión, timeout, login), no de un mensaje concreto: con ellos
+# los siguientes mensajes del lote fallarían igual
+_SESSION_ERRORS = (OSError, aiosmtplib.SMTPAuthenticationError)
+
+
+class SMTPBatchAborted(Exception):
+    """Mensaje de un lote que no se llegó a intentar (sesión caída o sin tiempo)."""
+
+
+class SMTPSender:
+    """
+    Emisor SMTP compartido que mantiene abierta una sesión autenticada.
+
+    - Reutiliza la conexión entre envíos y la cierra tras `idle_timeout` segundos sin uso.
+    - Si el servidor cortó la sesión, reconecta y reintenta el mensaje una vez.
+    - send_batch() envía una lista de mensajes sobre la misma sesión y la corta si la
+      sesión falla o se pasa del plazo.
+
+    Una sesión SMTP no admite envíos concurrentes, así que los envíos se serializan
+    con un lock; para un proceso serverless con una sola conexión es suficiente.
+    """
+
+    def __init__(self, hostname: str, port: int, username: Optional[str] = None,
+                 password: Optional[str] = None, start_tls: bool = True, use_tls: bool = False,
+                 use_credentials: bool = True, timeout: float = 30.0, idle_timeout: float = 60.0):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.use_tls = use_tls
+        self.use_credentials = use_credentials
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+
+        self._smtp: Optional[aiosmtplib.SMTP] = None
+        self._last_used = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+        # Contadores para métricas
+        self.connections_opened = 0
+        self.messages_sent = 0
+        self.send_errors = 0
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _connect(self) -> None:
+        await self._disconnect()
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls,
+            timeout=self.timeout
+        )
+        await smtp.connect()
+        if self.use_credentials:
+            await smtp.login(self.username, self.password)
+        self._smtp = smtp
+        self.connections_opened += 1
+        logger.info(f"Sesión SMTP abierta con {self.hostname}:{self.port}")
+
+    async def _disconnect(self) -> None:
+        if self._smtp is not None:
+            try:
+                if self._smtp.is_connected:
+                    await self._smtp.quit()
+            except Exception:
+                self._smtp.close()
+            self._smtp = None
+
+    async def _ensure_connected(self) -> None:
+        idle = time.monotonic() - self._last_used
+        if self._smtp is None or not self._smtp.is_connected or idle > self.idle_timeout:
+            await self._connect()
+
+    async def _send_one(self, message: EmailMessage) -> None:
+        await self._ensure_connected()
+        try:
+            await self._smtp.send_message(message)
+        except (aiosmtplib.SMTPServerDisconnected, ConnectionError):
+            # La sesión se cayó (timeout del servidor, red): reconectar y reintentar una vez
+            await self._connect()
+            await self._smtp.send_message(message)
+        self._last_used = time.monotonic()
+        self.messages_sent += 1
+
+    async def send(self, message: EmailMessage) -> None:
+        """
+        Envía un mensaje reutilizando la sesión abierta. Lanza la excepción si falla.
+        """
+        async with self._get_lock():
+            try:
+                await self._send_one(message)
+            except Exception:
+                self.send_errors += 1
+                await self._disconnect()
+                raise
+
+    async def send_batch(self, messages: List[EmailMessage],
+                         deadline: Optional[float] = None) -> List[Optional[Exception]]:
+        """
+        Envía varios mensajes sobre una misma sesión SMTP.
+        Retorna, por cada mensaje, None si se envió o la excepción del fallo.
+
+        `deadline` (time.monotonic()) es el límite para terminar cada envío, no solo para
+        empezarlo: un envío (reconexiones y reintento incluidos) se corta con TimeoutError al
+        llegar al plazo. Si falla la sesión (conexión, timeout, login) o ya pasó el plazo, no
+        intenta el resto: sus resultados son SMTPBatchAborted, para que quien los reclamó los
+        libere sin contarlos como intento.
+        """
+        results: List[Optional[Exception]] = []
+        async with self._get_lock():
+            for message in messages:
+                try:
+                    if deadline is None:
+                        await self._send_one(message)
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        try:
+                            await asyncio.wait_for(self._send_one(message), remaining)
+                        except asyncio.TimeoutError:
+                            raise TimeoutError("Envío SMTP cortado: se alcanzó el plazo del lote")
+                    results.append(None)
+                except Exception as e:
+                    self.send_errors += 1
+                    results.append(e)
+                    await self._disconnect()
+                    if isinstance(e, _SESSION_ERRORS):
+                        logger.warning(f"⚠️ Sesión SMTP caída, se corta el lote: {e}")
+                        break
+        aborted = SMTPBatchAborted("Envío no intentado: lote cortado")
+        return results + [aborted] * (len(messages) - len(results))
+
+    async def close(self) -> None:
+        async with self._get_lock():
+            await self._disconnect()
+
+    def get_stats(self) -> dict:
+        return {
+            "connected": bool(self._smtp is not None and self._smtp.is_connected),
+            "connections_opened": self.connections_opened,
+            "messages_sent": self.messages_sent,
+            "send_errors": self.send_errors
+        }
+
+    def metric_families(self) -> List[MetricFamily]:
+        return [
+            MetricFamily("suncar_smtp_connected", "gauge", "Sesión SMTP abierta").add(
+                bool(self._smtp is not None and self._smtp.is_connected)),
+            MetricFamily("suncar_smtp_connections_opened_total", "counter",
+                         "Sesiones SMTP abiertas").add(self.connections_opened),
+            MetricFamily("suncar_smtp_messages_sent_total", "counter", "Correos enviados por SMTP").add(self.messages_sent),
+            MetricFamily("suncar_smtp_send_errors_total", "counter", "Errores de envío SMTP").add(self.send_errors),
+        ]
+
+
+_smtp_sender: Optional[SMTPSender] = None
+
+
+def get_smtp_sender() -> SMTPSender:
+    """
+    Devuelve el emisor SMTP compartido del proceso, configurado desde variables de entorno.
+    """
+    global _smtp_sender
+    if _smtp_sender is None:
+        _smtp_sender = SMTPSender(
+            hostname=os.getenv("MAIL_SERVER", "smtp.gmail.com"),
+            port=int(os.getenv("MAIL_PORT", "587")),
+            username=os.getenv("MAIL_USERNAME", "alexandercalero42@gmail.com"),
+            password=os.getenv("MAIL_PASSWORD"),
+            start_tls=os.getenv("MAIL_STARTTLS", "true").lower() == "true",
+            use_tls=os.getenv("MAIL_SSL_TLS", "false").lower() == "true",
+            use_credentials=os.getenv("MAIL_USE_CREDENTIALS", "true").lower() == "true",
+            idle_timeout=float(os.getenv("MAIL_IDLE_TIMEOUT_SECONDS", "60"))
+        )
+    return _smtp_sender
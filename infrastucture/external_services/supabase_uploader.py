@@ -1,12 +1,18 @@
 import os
 import uuid
-from supabase import create_client, Client
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 _supabase_client = None
 
-def get_supabase_client() -> Client:
+def get_supabase_client() -> "Client":
     global _supabase_client
     if _supabase_client is None:
+        # Import diferido: el cliente de Supabase solo se carga al primer uso
+        from supabase import create_client
+
         SUPABASE_URL = os.getenv("SUPABASE_URL")
         SUPABASE_KEY = os.getenv("SUPABASE_KEY")
         if not SUPABASE_URL or not SUPABASE_KEY:
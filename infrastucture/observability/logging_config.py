@@ -0,0 +1,87 @@
+"""
+Configuración de logging del proceso, desde variables de entorno:
+
+- LOG_LEVEL: nivel global (INFO por defecto).
+- LOG_LEVELS: niveles por módulo, p. ej.
+  "infrastucture.repositories.client_repository=DEBUG,pymongo=WARNING".
+- LOG_SAMPLE_RATES: fracción de los logs INFO/DEBUG que se conservan en loggers de
+  rutas calientes, p. ej. "infrastucture.repositories.leads_repository=0.1".
+  WARNING y superiores no se muestrean nunca. El muestreo aplica al logger con ese
+  nombre exacto (el __name__ del módulo).
+- LOG_FORMAT: "text" (por defecto) o "json", una línea JSON por registro con los
+  campos pasados en `extra` (numero, lead_id, total, ...).
+
+Los logs de las rutas calientes usan formato diferido ("%s" y argumentos), así que un
+log descartado por nivel o muestreo no llega a formatear el mensaje.
+"""
+import json
+import logging
+import os
+import random
+from datetime import datetime, timezone
+from typing import Dict
+
+# Atributos propios de LogRecord; el resto son los campos de `extra`
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Deja pasar solo una fracción `rate` de los registros por debajo de WARNING.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+def _parse_pairs(value: str) -> Dict[str, str]:
+    pairs = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, setting = item.split("=", 1)
+            pairs[name.strip()] = setting.strip()
+    return pairs
+
+
+def configure_logging() -> None:
+    """
+    Aplica LOG_LEVEL, LOG_LEVELS, LOG_SAMPLE_RATES y LOG_FORMAT. Se puede llamar más
+    de una vez (p. ej. tras cargar el .env); cada llamada reemplaza la anterior.
+    """
+    root = logging.getLogger()
+    if not root.handlers:
+        root.addHandler(logging.StreamHandler())
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+    if os.getenv("LOG_FORMAT", "text").lower() == "json":
+        for handler in root.handlers:
+            handler.setFormatter(JsonFormatter())
+
+    for name, level in _parse_pairs(os.getenv("LOG_LEVELS", "")).items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    for name, rate in _parse_pairs(os.getenv("LOG_SAMPLE_RATES", "")).items():
+        logger = logging.getLogger(name)
+        for existing in [f for f in logger.filters if isinstance(f, SamplingFilter)]:
+            logger.removeFilter(existing)
+        logger.addFilter(SamplingFilter(float(rate)))
@@ -0,0 +1,105 @@
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Content-Type del formato de texto de Prometheus
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricFamily:
+    """
+    Una métrica con sus muestras, en el formato de exposición de Prometheus.
+    Los histogramas se arman con add(..., suffix="_bucket" / "_sum" / "_count").
+    """
+
+    def __init__(self, name: str, metric_type: str, documentation: str):
+        self.name = name
+        self.type = metric_type
+        self.documentation = documentation
+        self.samples: List[Tuple[str, Dict[str, str], float]] = []
+
+    def add(self, value: Optional[float], labels: Optional[Dict[str, str]] = None, suffix: str = "") -> "MetricFamily":
+        if value is not None:
+            self.samples.append((self.name + suffix, labels or {}, value))
+        return self
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    Registro en proceso de las métricas de todos los subsistemas. Cada subsistema
+    registra un collector (función sin argumentos que devuelve MetricFamily) que lee
+    sus contadores en memoria; el scrape nunca consulta la base de datos.
+
+    Si un collector falla se omite y se registra el error, sin romper el resto.
+    """
+
+    def __init__(self):
+        self._collectors: Dict[str, Callable[[], Iterable[MetricFamily]]] = {}
+
+    def register(self, name: str, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        self._collectors[name] = collector
+
+    def unregister(self, name: str) -> None:
+        self._collectors.pop(name, None)
+
+    def collect(self) -> List[MetricFamily]:
+        # Familias con el mismo nombre (p. ej. los aciertos de varias cachés) se unen
+        families: Dict[str, MetricFamily] = {}
+        for name, collector in self._collectors.items():
+            try:
+                for family in collector():
+                    existing = families.get(family.name)
+                    if existing is None:
+                        families[family.name] = family
+                    else:
+                        existing.samples.extend(family.samples)
+            except Exception as e:
+                logger.error(f"❌ Error en el collector de métricas '{name}': {e}")
+        return list(families.values())
+
+    def render(self) -> str:
+        lines = []
+        for family in self.collect():
+            lines.append(f"# HELP {family.name} {_escape(family.documentation)}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            for sample_name, labels, value in family.samples:
+                if labels:
+                    label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                    lines.append(f"{sample_name}{{{label_text}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{sample_name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def cache_metric_families(cache: str, hits: int, misses: int, size: Optional[int] = None) -> List[MetricFamily]:
+    """
+    Familias comunes a las cachés en memoria; el ratio de aciertos se calcula en Prometheus
+    con rate(hit) / rate(hit + miss).
+    """
+    families = [
+        MetricFamily("suncar_cache_requests_total", "counter", "Consultas a cachés por resultado")
+        .add(hits, {"cache": cache, "result": "hit"})
+        .add(misses, {"cache": cache, "result": "miss"})
+    ]
+    if size is not None:
+        families.append(MetricFamily("suncar_cache_entries", "gauge", "Entradas en caché").add(size, {"cache": cache}))
+    return families
+
+
+# Registro del proceso (lo expone GET /metrics)
+metrics_registry = MetricsRegistry()
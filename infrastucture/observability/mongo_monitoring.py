@@ -0,0 +1,307 @@
+import logging
+import os
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+from infrastucture.observability import request_timing
+from infrastucture.observability.metrics_registry import MetricFamily, metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Comandos de control del driver que no aportan nada al registro de consultas
+_IGNORED_COMMANDS = frozenset({
+    "hello", "ismaster", "isMaster", "ping", "buildInfo", "endSessions",
+    "saslStart", "saslContinue", "getnonce", "authenticate", "killCursors",
+})
+
+# Dónde viaja el filtro en cada comando (update/delete llevan uno por sentencia)
+_FILTER_FIELDS = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+}
+
+
+def _placeholder(value: Any) -> str:
+    return f"<{type(value).__name__}>"
+
+
+def filter_shape(value: Any) -> Any:
+    """
+    Forma del filtro sin los valores: conserva campos y operadores y sustituye cada
+    valor por su tipo, p. ej. {"nombre": {"$regex": "<str>", "$options": "i"}}.
+    Las opciones de $regex se dejan porque deciden si la búsqueda puede usar un índice.
+    """
+    if isinstance(value, dict):
+        return {
+            key: (item if key == "$options" and isinstance(item, str) else filter_shape(item))
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        shapes = []
+        for item in value:
+            shape = filter_shape(item)
+            if shape not in shapes:
+                shapes.append(shape)
+        return shapes
+    return _placeholder(value)
+
+
+def command_shape(command_name: str, command: dict) -> Optional[Any]:
+    if command_name in _FILTER_FIELDS:
+        return filter_shape(command.get(_FILTER_FIELDS[command_name], {}))
+    if command_name == "aggregate":
+        return filter_shape(command.get("pipeline", []))
+    if command_name == "update":
+        return filter_shape([update.get("q", {}) for update in command.get("updates", [])])
+    if command_name == "delete":
+        return filter_shape([delete.get("q", {}) for delete in command.get("deletes", [])])
+    return None
+
+
+def _docs_returned(reply: dict) -> Optional[int]:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        batch = cursor.get("firstBatch", cursor.get("nextBatch"))
+        if batch is not None:
+            return len(batch)
+    n = reply.get("n")
+    return n if isinstance(n, int) else None
+
+
+class MongoTimingListener(monitoring.CommandListener):
+    """
+    Suma la duración de cada comando de MongoDB a la categoría "db" del request en curso.
+    Los callbacks corren en el mismo hilo que ejecuta el comando, así que ven el contexto
+    del request aunque el repositorio se llame desde el threadpool.
+    """
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        request_timing.add("db", event.duration_micros / 1000)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        request_timing.add("db", event.duration_micros / 1000)
+
+
+class _CommandStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.slow = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.docs_returned = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "slow": self.slow,
+            "avg_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "max_ms": round(self.max_ms, 2),
+            "docs_returned": self.docs_returned,
+        }
+
+
+class SlowQueryListener(monitoring.CommandListener):
+    """
+    Telemetría por consulta del cliente de MongoDB: agregados por namespace y comando y
+    un buffer circular con las consultas que superan MONGO_SLOW_QUERY_MS, con su duración,
+    documentos devueltos y la forma del filtro (sin valores).
+
+    La forma solo se calcula para las consultas lentas; el resto cuesta un par de
+    operaciones sobre diccionarios por comando.
+    """
+
+    def __init__(self, slow_query_ms: Optional[float] = None, log_size: Optional[int] = None):
+        self.slow_query_ms = slow_query_ms if slow_query_ms is not None else float(
+            os.getenv("MONGO_SLOW_QUERY_MS", "100"))
+        log_size = log_size if log_size is not None else int(os.getenv("MONGO_SLOW_QUERY_LOG_SIZE", "100"))
+        self._lock = threading.Lock()
+        # Comandos en curso: (connection_id, request_id) -> (nombre, namespace, comando)
+        self._pending: Dict[Tuple[Any, int], Tuple[str, str, dict]] = {}
+        self._stats: Dict[Tuple[str, str], _CommandStats] = {}
+        self._slow_queries = deque(maxlen=log_size)
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name in _IGNORED_COMMANDS:
+            return
+        collection = event.command.get(event.command_name)
+        namespace = f"{event.database_name}.{collection}" if isinstance(collection, str) else event.database_name
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (event.command_name, namespace, event.command)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, _docs_returned(event.reply))
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        # codeName y no errmsg: el mensaje puede incluir valores (p. ej. la clave duplicada)
+        self._finish(event, None, error=event.failure.get("codeName") or "error")
+
+    def _finish(self, event, docs_returned: Optional[int], error: Optional[str] = None) -> None:
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        command_name, namespace, command = pending
+        duration_ms = event.duration_micros / 1000
+        slow = duration_ms >= self.slow_query_ms
+
+        entry = None
+        if slow:
+            entry = {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "namespace": namespace,
+                "command": command_name,
+                "duration_ms": round(duration_ms, 2),
+                "docs_returned": docs_returned,
+                "filter_shape": command_shape(command_name, command),
+                "error": error,
+            }
+            if command_name == "find" and command.get("sort"):
+                entry["sort"] = dict(command["sort"])
+
+        with self._lock:
+            stats = self._stats.get((namespace, command_name))
+            if stats is None:
+                stats = self._stats[(namespace, command_name)] = _CommandStats()
+            stats.count += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.docs_returned += docs_returned or 0
+            if error is not None:
+                stats.errors += 1
+            if entry is not None:
+                stats.slow += 1
+                self._slow_queries.append(entry)
+
+        if entry is not None:
+            logger.warning(
+                f"Consulta lenta en {namespace} ({command_name}): {duration_ms:.0f} ms, "
+                f"{docs_returned} documentos, filtro {entry['filter_shape']}"
+            )
+
+    def snapshot(self, limit: Optional[int] = None) -> dict:
+        """
+        Agregados por namespace/comando y las consultas lentas del buffer, de la más
+        lenta a la más rápida.
+        """
+        with self._lock:
+            commands: Dict[str, dict] = {}
+            for (namespace, command_name), stats in sorted(self._stats.items()):
+                commands.setdefault(namespace, {})[command_name] = stats.snapshot()
+            slow_queries = sorted(self._slow_queries, key=lambda q: q["duration_ms"], reverse=True)
+        return {
+            "slow_query_ms": self.slow_query_ms,
+            "commands": commands,
+            "slow_queries": slow_queries[:limit] if limit else slow_queries,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._slow_queries.clear()
+
+    def metric_families(self) -> List[MetricFamily]:
+        commands = MetricFamily("suncar_mongo_commands_total", "counter", "Comandos ejecutados en MongoDB")
+        errors = MetricFamily("suncar_mongo_command_errors_total", "counter", "Comandos de MongoDB fallidos")
+        slow = MetricFamily("suncar_mongo_slow_commands_total", "counter", "Comandos por encima de MONGO_SLOW_QUERY_MS")
+        duration = MetricFamily(
+            "suncar_mongo_command_duration_milliseconds_total", "counter", "Tiempo acumulado en comandos de MongoDB"
+        )
+        docs = MetricFamily("suncar_mongo_docs_returned_total", "counter", "Documentos devueltos por MongoDB")
+        with self._lock:
+            for (namespace, command_name), stats in sorted(self._stats.items()):
+                labels = {"namespace": namespace, "command": command_name}
+                commands.add(stats.count, labels)
+                errors.add(stats.errors, labels)
+                slow.add(stats.slow, labels)
+                duration.add(stats.total_ms, labels)
+                docs.add(stats.docs_returned, labels)
+        return [commands, errors, slow, duration, docs]
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """
+    Contadores del pool de conexiones del cliente de MongoDB (conexiones abiertas,
+    en uso, esperas fallidas y limpiezas del pool) para /metrics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open = 0
+        self.checked_out = 0
+        self.created = 0
+        self.closed = 0
+        self.checkout_failures = 0
+        self.cleared = 0
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        with self._lock:
+            self.cleared += 1
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        with self._lock:
+            self.created += 1
+            self.open += 1
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        with self._lock:
+            self.closed += 1
+            self.open -= 1
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_check_out_failed(self, event) -> None:
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event) -> None:
+        with self._lock:
+            self.checked_out += 1
+
+    def connection_checked_in(self, event) -> None:
+        with self._lock:
+            self.checked_out -= 1
+
+    def metric_families(self) -> List[MetricFamily]:
+        with self._lock:
+            return [
+                MetricFamily("suncar_mongo_pool_connections", "gauge", "Conexiones abiertas en el pool").add(self.open),
+                MetricFamily("suncar_mongo_pool_checked_out", "gauge", "Conexiones del pool en uso").add(self.checked_out),
+                MetricFamily("suncar_mongo_pool_connections_created_total", "counter",
+                             "Conexiones creadas por el pool").add(self.created),
+                MetricFamily("suncar_mongo_pool_connections_closed_total", "counter",
+                             "Conexiones cerradas por el pool").add(self.closed),
+                MetricFamily("suncar_mongo_pool_checkout_failures_total", "counter",
+                             "Esperas de conexión fallidas").add(self.checkout_failures),
+                MetricFamily("suncar_mongo_pool_cleared_total", "counter", "Limpiezas del pool").add(self.cleared),
+            ]
+
+
+mongo_timing_listener = MongoTimingListener()
+slow_query_listener = SlowQueryListener()
+pool_stats_listener = PoolStatsListener()
+metrics_registry.register("mongo_commands", slow_query_listener.metric_families)
+metrics_registry.register("mongo_pool", pool_stats_listener.metric_families)
@@ -0,0 +1,158 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Hojas de pila que indican un hilo esperando trabajo (event loop en select, hilos del
+# threadpool bloqueados en la cola); se descartan salvo que se pida include_idle
+_IDLE_LEAVES = frozenset({
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+})
+
+# (nombre, archivo, línea) de un frame
+Frame = Tuple[str, str, int]
+
+
+class ProfilerBusyError(Exception):
+    """Se lanza si ya hay una sesión de perfilado en curso en el proceso."""
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(ROOT):
+        return os.path.relpath(filename, ROOT)
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return os.path.basename(filename)
+
+
+class StackSampler:
+    """
+    Profiler por muestreo: cada `interval` segundos lee la pila de todos los hilos del
+    proceso (event loop y threadpool) con sys._current_frames() y cuenta cuántas veces
+    aparece cada pila. No instrumenta el código, así que el coste es el de recorrer las
+    pilas en cada muestra (del orden de decenas de µs con pocos hilos).
+
+    Solo se permite una sesión a la vez por proceso.
+    """
+
+    _session_lock = threading.Lock()
+
+    def __init__(self, interval: float = 0.005, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.samples = 0
+        self.duration = 0.0
+        self._stacks: Counter = Counter()
+        self._thread_names: Dict[int, str] = {}
+
+    def _sample_once(self, own_thread_id: int) -> None:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread_id:
+                continue
+            stack: List[Frame] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, _short_path(code.co_filename), code.co_firstlineno))
+                frame = frame.f_back
+            if not stack:
+                continue
+            leaf_name, leaf_file, _ = stack[0]
+            if not self.include_idle and (os.path.basename(leaf_file), leaf_name) in _IDLE_LEAVES:
+                continue
+            stack.reverse()
+            self._stacks[(thread_id, tuple(stack))] += 1
+
+    def run(self, seconds: float) -> "StackSampler":
+        """
+        Muestrea durante `seconds` segundos (bloqueante; llamar desde un hilo).
+        """
+        if not self._session_lock.acquire(blocking=False):
+            raise ProfilerBusyError("Ya hay una sesión de perfilado en curso")
+        try:
+            own_thread_id = threading.get_ident()
+            self._thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            start = time.perf_counter()
+            deadline = start + seconds
+            while time.perf_counter() < deadline:
+                self._sample_once(own_thread_id)
+                self.samples += 1
+                time.sleep(self.interval)
+            self.duration = time.perf_counter() - start
+            self._thread_names.update({thread.ident: thread.name for thread in threading.enumerate()})
+        finally:
+            self._session_lock.release()
+        return self
+
+    def _thread_name(self, thread_id: int) -> str:
+        return self._thread_names.get(thread_id, f"thread-{thread_id}")
+
+    def to_collapsed(self) -> str:
+        """
+        Formato "collapsed stack" (una línea por pila: `hilo;frame;...;frame cuenta`),
+        el que aceptan flamegraph.pl, speedscope y la mayoría de visores.
+        """
+        lines = []
+        for (thread_id, stack), count in self._stacks.most_common():
+            frames = ";".join(f"{name} ({filename}:{line})" for name, filename, line in stack)
+            lines.append(f"{self._thread_name(thread_id)};{frames} {count}")
+        return "\n".join(lines) + "\n"
+
+    def to_speedscope(self, name: str = "suncar-backend") -> dict:
+        """
+        Archivo de speedscope (https://www.speedscope.app) con un perfil "sampled" por hilo;
+        el peso de cada pila es el tiempo estimado en ms (muestras x intervalo).
+        """
+        frame_index: Dict[Frame, int] = {}
+        frames = []
+        profiles: Dict[int, dict] = {}
+        weight_ms = self.interval * 1000
+        for (thread_id, stack), count in self._stacks.most_common():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indices.append(frame_index[frame])
+            profile = profiles.get(thread_id)
+            if profile is None:
+                profile = profiles[thread_id] = {
+                    "type": "sampled",
+                    "name": self._thread_name(thread_id),
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": 0,
+                    "samples": [],
+                    "weights": [],
+                }
+            profile["samples"].append(indices)
+            profile["weights"].append(round(count * weight_ms, 3))
+            profile["endValue"] = round(profile["endValue"] + count * weight_ms, 3)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "suncar-backend",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": list(profiles.values()),
+        }
+
+
+def profile(seconds: float, interval: float = 0.005, include_idle: bool = False,
+            output_format: str = "speedscope") -> Tuple[str, str]:
+    """
+    Ejecuta una sesión y devuelve (contenido, media_type) en el formato pedido
+    ("speedscope" o "collapsed").
+    """
+    sampler = StackSampler(interval=interval, include_idle=include_idle).run(seconds)
+    if output_format == "collapsed":
+        return sampler.to_collapsed(), "text/plain; charset=utf-8"
+    return json.dumps(sampler.to_speedscope(), ensure_ascii=False), "application/json"
@@ -0,0 +1,162 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from infrastucture.observability.metrics_registry import MetricFamily, metrics_registry
+
+# Categorías del desglose que se publica en el header Server-Timing
+CATEGORIES = ("db", "validate", "storage", "llm")
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Tiempos acumulados (ms) por categoría del request en curso. asyncio.to_thread y el
+# threadpool de Starlette copian el contexto, así que el dict es el mismo en los hilos.
+_current: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timing", default=None)
+
+
+def start_request():
+    """
+    Abre el contexto de tiempos de un request. Retorna el token para end_request().
+    """
+    return _current.set({category: 0.0 for category in CATEGORIES})
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+def current() -> Optional[Dict[str, float]]:
+    return _current.get()
+
+
+def add(category: str, ms: float) -> None:
+    """
+    Suma `ms` a la categoría del request en curso (no hace nada fuera de un request).
+    """
+    timings = _current.get()
+    if timings is not None:
+        timings[category] = timings.get(category, 0.0) + ms
+
+
+@contextmanager
+def track(category: str):
+    """
+    Mide el bloque y lo suma a la categoría del request en curso:
+
+        with track("validate"):
+            formularios = [Form.model_validate(raw) for raw in docs]
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add(category, (time.perf_counter() - start) * 1000)
+
+
+def server_timing_header(timings: Dict[str, float], total_ms: float) -> str:
+    parts = [f"{category};dur={timings.get(category, 0.0):.1f}" for category in CATEGORIES]
+    parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
+
+
+class _RouteHistogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.counts = [0] * (len(buckets) + 1)  # el último es +Inf
+        self.count = 0
+        self.errors = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self.breakdown_sum_ms = {category: 0.0 for category in CATEGORIES}
+
+
+class RouteLatencyHistograms:
+    """
+    Histogramas de latencia por ruta (método + plantilla de path), con buckets fijos
+    en ms y la suma del desglose por categoría.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self._routes: Dict[Tuple[str, str], _RouteHistogram] = {}
+        self.in_flight = 0
+
+    def observe(self, method: str, route: str, status_code: int, total_ms: float,
+                timings: Optional[Dict[str, float]] = None) -> None:
+        histogram = self._routes.get((method, route))
+        if histogram is None:
+            histogram = self._routes[(method, route)] = _RouteHistogram(self.buckets)
+        histogram.counts[bisect_left(self.buckets, total_ms)] += 1
+        histogram.count += 1
+        histogram.sum_ms += total_ms
+        histogram.max_ms = max(histogram.max_ms, total_ms)
+        if status_code >= 500:
+            histogram.errors += 1
+        for category, ms in (timings or {}).items():
+            histogram.breakdown_sum_ms[category] = histogram.breakdown_sum_ms.get(category, 0.0) + ms
+
+    def _percentile(self, histogram: _RouteHistogram, pct: float) -> Optional[float]:
+        # Cota superior del bucket donde cae el percentil
+        target = histogram.count * pct / 100
+        acumulado = 0
+        for upper, count in zip(self.buckets + (None,), histogram.counts):
+            acumulado += count
+            if acumulado >= target:
+                return upper if upper is not None else round(histogram.max_ms, 1)
+        return None
+
+    def snapshot(self) -> dict:
+        routes = {}
+        for (method, route), histogram in sorted(self._routes.items()):
+            cumulative = []
+            acumulado = 0
+            for count in histogram.counts:
+                acumulado += count
+                cumulative.append(acumulado)
+            routes[f"{method} {route}"] = {
+                "method": method,
+                "route": route,
+                "count": histogram.count,
+                "errors": histogram.errors,
+                "sum_ms": round(histogram.sum_ms, 1),
+                "avg_ms": round(histogram.sum_ms / histogram.count, 1) if histogram.count else None,
+                "max_ms": round(histogram.max_ms, 1),
+                "p50_ms_le": self._percentile(histogram, 50),
+                "p95_ms_le": self._percentile(histogram, 95),
+                "buckets_cumulative": cumulative,
+                "breakdown_sum_ms": {k: round(v, 1) for k, v in histogram.breakdown_sum_ms.items()},
+            }
+        return {"buckets_ms": list(self.buckets), "in_flight": self.in_flight, "routes": routes}
+
+    def metric_families(self) -> List[MetricFamily]:
+        in_flight = MetricFamily("suncar_http_requests_in_flight", "gauge", "Requests HTTP en curso")
+        in_flight.add(self.in_flight)
+        duration = MetricFamily(
+            "suncar_http_request_duration_milliseconds", "histogram", "Duración de los requests HTTP por ruta"
+        )
+        errors = MetricFamily("suncar_http_request_errors_total", "counter", "Requests HTTP con status >= 500")
+        breakdown = MetricFamily(
+            "suncar_http_request_breakdown_milliseconds_total", "counter",
+            "Tiempo acumulado de los requests por categoría (db, validate, storage, llm)"
+        )
+        for (method, route), histogram in sorted(self._routes.items()):
+            labels = {"method": method, "route": route}
+            acumulado = 0
+            for upper, count in zip(self.buckets + (float("inf"),), histogram.counts):
+                acumulado += count
+                duration.add(acumulado, {**labels, "le": "+Inf" if upper == float("inf") else str(upper)}, "_bucket")
+            duration.add(histogram.sum_ms, labels, "_sum")
+            duration.add(histogram.count, labels, "_count")
+            errors.add(histogram.errors, labels)
+            for category, ms in histogram.breakdown_sum_ms.items():
+                breakdown.add(ms, {**labels, "category": category})
+        return [in_flight, duration, errors, breakdown]
+
+    def reset(self) -> None:
+        self._routes.clear()
+
+
+# Histogramas del proceso (los alimenta TimingMiddleware)
+route_histograms = RouteLatencyHistograms()
+metrics_registry.register("http", route_histograms.metric_families)
@@ -1,4 +1,6 @@
-from typing import List, Optional
+import os
+import time
+from typing import Dict, List, Optional, Tuple
 from bson import ObjectId
 from pydantic import ValidationError
 from pymongo.errors import PyMongoError
@@ -8,9 +10,35 @@ from bson.errors import InvalidId
 from domain.entities.brigada import Brigada
 from domain.entities.trabajador import Trabajador
 from infrastucture.database.mongo_db.connection import get_collection
+from infrastucture.observability.metrics_registry import cache_metric_families, metrics_registry
+from infrastucture.repositories import search_keys
 
 logger = logging.getLogger(__name__)
 
+BRIGADAS_CACHE_TTL_SECONDS = float(os.getenv("BRIGADAS_CACHE_TTL_SECONDS", "300"))
+
+# Snapshot de la brigada de cada líder (lider_ci -> (expira_en, Brigada)), compartido por
+# todas las instancias del repositorio. Lo usa sobre todo el login de los jefes de brigada.
+_brigadas_por_lider: Dict[str, Tuple[float, Brigada]] = {}
+_cache_stats = {"hits": 0, "misses": 0}
+
+metrics_registry.register("brigadas_cache", lambda: cache_metric_families(
+    "brigadas_por_lider", _cache_stats["hits"], _cache_stats["misses"], len(_brigadas_por_lider)
+))
+
+
+def invalidar_cache_brigadas(lider_ci: Optional[str] = None) -> None:
+    """
+    Descarta el snapshot de la brigada de un líder, o todos si no se indica lider_ci.
+    Se llama en cada mutación de brigadas y de los trabajadores que las forman, después
+    de escribir: si se invalida antes, una lectura concurrente puede volver a cachear la
+    brigada anterior hasta que venza el TTL.
+    """
+    if lider_ci is None:
+        _brigadas_por_lider.clear()
+    else:
+        _brigadas_por_lider.pop(lider_ci, None)
+
 
 class BrigadaRepository:
     def __init__(self):
@@ -27,6 +55,13 @@ class BrigadaRepository:
         Returns:
             Brigada: Objeto brigada con datos completos de líder e integrantes, o None si no se encuentra
         """
+        cached = _brigadas_por_lider.get(lider_ci)
+        if cached is not None and cached[0] > time.monotonic():
+            _cache_stats["hits"] += 1
+            # Copia para que quien la reciba no modifique el snapshot compartido
+            return cached[1].model_copy(deep=True)
+        _cache_stats["misses"] += 1
+
         try:
             collection = get_collection(self.collection_name)
             
@@ -65,6 +100,7 @@ class BrigadaRepository:
             )
             
             logger.info(f"✅ Brigada obtenida exitosamente (view) para líder CI {lider_ci} con {len(integrantes)} integrantes")
+            _brigadas_por_lider[lider_ci] = (time.monotonic() + BRIGADAS_CACHE_TTL_SECONDS, brigada.model_copy(deep=True))
             return brigada
             
         except ValidationError as e:
@@ -195,6 +231,7 @@ class BrigadaRepository:
             "lider": lider_ci,
             "integrantes": integrantes_ci
         })
+        invalidar_cache_brigadas()
         return str(result.inserted_id)
 
     def update_brigada(self, brigada_id: str, lider_ci: str, integrantes_ci: List[str]) -> bool:
@@ -203,6 +240,7 @@ class BrigadaRepository:
         """
         collection = get_collection("brigadas")
         result = collection.update_one({"_id": ObjectId(brigada_id)}, {"$set": {"lider": lider_ci, "integrantes": integrantes_ci}})
+        invalidar_cache_brigadas()
         return result.modified_count > 0
 
     def delete_brigada(self, brigada_id: str) -> bool:
@@ -211,6 +249,7 @@ class BrigadaRepository:
         """
         collection = get_collection("brigadas")
         result = collection.delete_one({"_id": ObjectId(brigada_id)})
+        invalidar_cache_brigadas()
         return result.deleted_count > 0
 
     def delete_brigada_by_lider_ci(self, lider_ci: str) -> bool:
@@ -219,6 +258,7 @@ class BrigadaRepository:
         """
         collection = get_collection("brigadas")
         result = collection.delete_one({"lider": lider_ci})
+        invalidar_cache_brigadas(lider_ci)
         return result.deleted_count > 0
 
     def add_trabajador(self, brigada_id: str, trabajador_ci: str) -> bool:
@@ -231,11 +271,13 @@ class BrigadaRepository:
             obj_id = ObjectId(brigada_id)
             result = collection.update_one({"_id": obj_id}, {"$addToSet": {"integrantes": trabajador_ci}})
             if result.modified_count > 0:
+                invalidar_cache_brigadas()
                 return True
         except (InvalidId, TypeError):
             pass
         # Si no es ObjectId válido, buscar por lider_ci
         result = collection.update_one({"lider": brigada_id}, {"$addToSet": {"integrantes": trabajador_ci}})
+        invalidar_cache_brigadas()
         return result.modified_count > 0
 
     def remove_trabajador(self, brigada_id: str, trabajador_ci: str) -> bool:
@@ -244,6 +286,7 @@ class BrigadaRepository:
         """
         collection = get_collection("brigadas")
         result = collection.update_one({"_id": ObjectId(brigada_id)}, {"$pull": {"integrantes": trabajador_ci}})
+        invalidar_cache_brigadas()
         return result.modified_count > 0
 
     def remove_trabajador_by_lider_ci(self, lider_ci: str, trabajador_ci: str) -> bool:
@@ -252,6 +295,7 @@ class BrigadaRepository:
         """
         collection = get_collection("brigadas")
         result = collection.update_one({"lider": lider_ci}, {"$pull": {"integrantes": trabajador_ci}})
+        invalidar_cache_brigadas(lider_ci)
         return result.modified_count > 0
 
     def update_trabajador(self, trabajador_ci: str, nombre: str) -> bool:
@@ -259,7 +303,10 @@ class BrigadaRepository:
         Actualiza los datos de un trabajador (solo nombre por simplicidad).
         """
         collection = get_collection("trabajadores")
-        result = collection.update_one({"CI": trabajador_ci}, {"$set": {"nombre": nombre}})
+        result = collection.update_one(
+            {"CI": trabajador_ci}, {"$set": {"nombre": nombre, **search_keys.search_keys("trabajadores", {"nombre": nombre})}}
+        )
+        invalidar_cache_brigadas()
         return result.modified_count > 0
 
     def _get_tiene_contraseña(self, ci: str) -> bool:
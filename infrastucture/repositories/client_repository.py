@@ -1,5 +1,6 @@
 import logging
 from infrastucture.database.mongo_db.connection import get_collection
+from infrastucture.repositories import search_keys
 from domain.entities.cliente import Cliente
 from typing import Optional
 
@@ -18,14 +19,18 @@ class ClientRepository:
         """
         collection = get_collection(self.collection_name)
         cliente_dict = cliente.model_dump()
-        self.logger.info(f"Upsert cliente: {cliente_dict}")
+        self.logger.debug("Upsert cliente %s", cliente.numero)
         try:
             result = collection.update_one(
                 {"numero": cliente.numero},
-                {"$set": cliente_dict},
+                {"$set": {**cliente_dict, **search_keys.search_keys(self.collection_name, cliente_dict)}},
                 upsert=True
             )
-            self.logger.info(f"Resultado upsert: matched={result.matched_count}, modified={result.modified_count}, upserted_id={result.upserted_id}")
+            self.logger.info(
+                "Upsert cliente %s: matched=%s, modified=%s, upserted_id=%s",
+                cliente.numero, result.matched_count, result.modified_count, result.upserted_id,
+                extra={"numero": cliente.numero}
+            )
             return cliente
         except Exception as e:
             self.logger.error(f"Error en upsert cliente: {e}")
@@ -37,13 +42,13 @@ class ClientRepository:
         Retorna el cliente si existe, None si no existe.
         """
         collection = get_collection(self.collection_name)
-        self.logger.info(f"Buscando cliente por número: {numero}")
+        self.logger.debug("Buscando cliente por número: %s", numero)
         try:
             cliente_doc = collection.find_one({"numero": numero})
             if cliente_doc:
-                self.logger.info(f"Cliente encontrado: {cliente_doc}")
+                self.logger.debug("Cliente encontrado: %s", numero)
                 return Cliente.model_validate(cliente_doc)
-            self.logger.info("Cliente no encontrado")
+            self.logger.debug("Cliente no encontrado: %s", numero)
             return None
         except Exception as e:
             self.logger.error(f"Error al buscar cliente: {e}")
@@ -55,7 +60,7 @@ class ClientRepository:
         Retorna solo numero y nombre si existe, None si no existe.
         """
         collection = get_collection(self.collection_name)
-        self.logger.info(f"Buscando cliente por identificador: {identifier}")
+        self.logger.debug("Buscando cliente por identificador: %s", identifier)
         try:
             # Buscar por número de cliente o teléfono, proyectar solo numero y nombre
             cliente_doc = collection.find_one(
@@ -68,9 +73,9 @@ class ClientRepository:
                 {"numero": 1, "nombre": 1, "_id": 0}  # Solo proyectar numero y nombre
             )
             if cliente_doc:
-                self.logger.info(f"Cliente encontrado: {cliente_doc}")
+                self.logger.debug("Cliente encontrado: %s", cliente_doc.get("numero"))
                 return cliente_doc
-            self.logger.info("Cliente no encontrado")
+            self.logger.debug("Cliente no encontrado: %s", identifier)
             return None
         except Exception as e:
             self.logger.error(f"Error al buscar cliente por identificador: {e}")
@@ -78,36 +83,49 @@ class ClientRepository:
 
     def update_client_partial(self, numero: str, update_data: dict) -> bool:
         collection = get_collection(self.collection_name)
-        self.logger.info(f"Actualizando cliente {numero} con datos: {update_data}")
+        self.logger.info("Actualizando cliente %s (campos: %s)", numero, ", ".join(update_data), extra={"numero": numero})
         try:
             result = collection.update_one(
                 {"numero": numero},
-                {"$set": update_data}
+                {"$set": {**update_data, **search_keys.search_keys(self.collection_name, update_data)}}
             )
             return result.modified_count > 0
         except Exception as e:
             self.logger.error(f"Error al actualizar cliente: {e}")
             raise
 
-    def get_clientes(self, numero=None, nombre=None, direccion=None):
+    def get_clientes(self, numero=None, nombre=None, direccion=None, limit=None):
+        """
+        Clientes con filtros opcionales. nombre y direccion buscan por prefijo de palabra,
+        sin distinguir mayúsculas ni tildes (search_keys). Ordenados por los 4 últimos
+        dígitos de numero; con `limit` (typeahead) se devuelven las primeras `limit`
+        coincidencias en ese orden.
+        """
         collection = get_collection(self.collection_name)
+        search_keys.ensure_search_keys(collection, self.collection_name, self.logger)
         query = {}
         if numero:
             query["numero"] = numero
-        if nombre:
-            query["nombre"] = {"$regex": nombre, "$options": "i"}
-        if direccion:
-            query["direccion"] = {"$regex": direccion, "$options": "i"}
-        self.logger.info(f"Buscando clientes con query: {query}")
+        conditions = []
+        for campo, texto in (("nombre", nombre), ("direccion", direccion)):
+            if texto:
+                conditions += search_keys.prefix_conditions(self.collection_name, campo, texto)
+        if conditions:
+            query["$and"] = conditions
+        self.logger.debug("Buscando clientes con query: %s", query)
         try:
-            cursor = collection.find(query)
+            # MongoDB ordena antes del límite, por la clave guardada orden_numero
+            cursor = collection.find(query, search_keys.hidden_fields(self.collection_name)).sort(
+                search_keys.sort_spec(self.collection_name)
+            )
+            if limit:
+                cursor = cursor.limit(limit)
             clientes = []
             for doc in cursor:
-                doc["id"] = str(doc.pop("_id"))
+                # El ObjectId lo serializa ORJSONResponse
+                doc["id"] = doc.pop("_id")
                 clientes.append(doc)
-            # Ordenar por los últimos 4 dígitos del campo 'numero'
-            clientes.sort(key=lambda c: int(c["numero"][-4:]))
-            self.logger.info(f"Clientes encontrados: {len(clientes)}")
+            self.logger.debug("Clientes encontrados: %d", len(clientes))
             return clientes
         except Exception as e:
             self.logger.error(f"Error al obtener clientes: {e}")
@@ -119,11 +137,11 @@ class ClientRepository:
         Retorna True si se eliminó correctamente, False si no se encontró.
         """
         collection = get_collection(self.collection_name)
-        self.logger.info(f"Eliminando cliente con número: {numero}")
+        self.logger.debug("Eliminando cliente con número: %s", numero)
         try:
             result = collection.delete_one({"numero": numero})
             deleted = result.deleted_count > 0
-            self.logger.info(f"Cliente eliminado: {deleted}")
+            self.logger.info("Cliente %s eliminado: %s", numero, deleted, extra={"numero": numero})
             return deleted
         except Exception as e:
             self.logger.error(f"Error al eliminar cliente: {e}")
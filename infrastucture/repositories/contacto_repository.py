@@ -1,5 +1,6 @@
 import logging
 from infrastucture.database.mongo_db.connection import get_collection
+from infrastucture.repositories.hydration import model_projection, trusted_documents
 from domain.entities.contacto import Contacto
 from typing import Optional, List
 
@@ -15,11 +16,11 @@ class ContactoRepository:
         """
         collection = get_collection(self.collection_name)
         contacto_dict = contacto.model_dump(exclude={'id'})
-        self.logger.info(f"Creando contacto: {contacto_dict}")
+        self.logger.debug("Creando contacto")
         try:
             result = collection.insert_one(contacto_dict)
             contacto.id = str(result.inserted_id)
-            self.logger.info(f"Contacto creado con ID: {contacto.id}")
+            self.logger.info("Contacto creado con ID: %s", contacto.id, extra={"contacto_id": contacto.id})
             return contacto
         except Exception as e:
             self.logger.error(f"Error al crear contacto: {e}")
@@ -30,15 +31,15 @@ class ContactoRepository:
         Buscar un contacto por su ID.
         """
         collection = get_collection(self.collection_name)
-        self.logger.info(f"Buscando contacto por ID: {contacto_id}")
+        self.logger.debug("Buscando contacto por ID: %s", contacto_id)
         try:
             from bson import ObjectId
             contacto_doc = collection.find_one({"_id": ObjectId(contacto_id)})
             if contacto_doc:
                 contacto_doc["id"] = str(contacto_doc.pop("_id"))
-                self.logger.info(f"Contacto encontrado: {contacto_doc}")
+                self.logger.debug("Contacto encontrado: %s", contacto_id)
                 return Contacto.model_validate(contacto_doc)
-            self.logger.info("Contacto no encontrado")
+            self.logger.debug("Contacto no encontrado: %s", contacto_id)
             return None
         except Exception as e:
             self.logger.error(f"Error al buscar contacto: {e}")
@@ -49,7 +50,7 @@ class ContactoRepository:
         Actualizar un contacto existente.
         """
         collection = get_collection(self.collection_name)
-        self.logger.info(f"Actualizando contacto {contacto_id} con datos: {contacto}")
+        self.logger.debug("Actualizando contacto %s", contacto_id)
         try:
             from bson import ObjectId
             contacto_dict = contacto.model_dump(exclude={'id'})
@@ -58,7 +59,7 @@ class ContactoRepository:
                 {"$set": contacto_dict}
             )
             success = result.modified_count > 0
-            self.logger.info(f"Contacto actualizado: {success}")
+            self.logger.info("Contacto %s actualizado: %s", contacto_id, success, extra={"contacto_id": contacto_id})
             return success
         except Exception as e:
             self.logger.error(f"Error al actualizar contacto: {e}")
@@ -69,32 +70,43 @@ class ContactoRepository:
         Obtener todos los contactos.
         """
         collection = get_collection(self.collection_name)
-        self.logger.info("Obteniendo todos los contactos")
+        self.logger.debug("Obteniendo todos los contactos")
         try:
             cursor = collection.find()
             contactos = []
             for doc in cursor:
                 doc["id"] = str(doc.pop("_id"))
                 contactos.append(Contacto.model_validate(doc))
-            self.logger.info(f"Contactos encontrados: {len(contactos)}")
+            self.logger.debug("Contactos encontrados: %d", len(contactos))
             return contactos
         except Exception as e:
             self.logger.error(f"Error al obtener contactos: {e}")
             raise
 
+    def get_all_contactos_trusted(self) -> List[dict]:
+        """
+        Lectura de confianza de get_all_contactos: dicts con la forma de Contacto, sin validar.
+        """
+        collection = get_collection(self.collection_name)
+        try:
+            return trusted_documents(Contacto, collection.find({}, model_projection(Contacto)))
+        except Exception as e:
+            self.logger.error(f"Error al obtener contactos: {e}")
+            raise
+
     def get_first_contacto(self) -> Optional[Contacto]:
         """
         Obtener el primer contacto de la base de datos.
         """
         collection = get_collection(self.collection_name)
-        self.logger.info("Obteniendo el primer contacto")
+        self.logger.debug("Obteniendo el primer contacto")
         try:
             contacto_doc = collection.find_one()
             if contacto_doc:
                 contacto_doc["id"] = str(contacto_doc.pop("_id"))
-                self.logger.info(f"Primer contacto encontrado: {contacto_doc}")
+                self.logger.debug("Primer contacto encontrado: %s", contacto_doc["id"])
                 return Contacto.model_validate(contacto_doc)
-            self.logger.info("No se encontraron contactos")
+            self.logger.debug("No se encontraron contactos")
             return None
         except Exception as e:
             self.logger.error(f"Error al obtener el primer contacto: {e}")
@@ -105,12 +117,12 @@ class ContactoRepository:
         Eliminar un contacto por su ID.
         """
         collection = get_collection(self.collection_name)
-        self.logger.info(f"Eliminando contacto: {contacto_id}")
+        self.logger.debug("Eliminando contacto: %s", contacto_id)
         try:
             from bson import ObjectId
             result = collection.delete_one({"_id": ObjectId(contacto_id)})
             success = result.deleted_count > 0
-            self.logger.info(f"Contacto eliminado: {success}")
+            self.logger.info("Contacto %s eliminado: %s", contacto_id, success, extra={"contacto_id": contacto_id})
             return success
         except Exception as e:
             self.logger.error(f"Error al eliminar contacto: {e}")
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from bson import ObjectId
+from pymongo import ASCENDING, ReturnDocument
+import logging
+
+from infrastucture.database.mongo_db.connection import get_collection
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutboxRepository:
+    """
+    Cola persistente de correos pendientes (colección email_outbox).
+
+    Estados: pending -> sending -> sent, o dead tras agotar los reintentos.
+    Un mensaje en 'sending' cuyo lease (locked_until) ha vencido se considera
+    abandonado por un worker caído y vuelve a poder reclamarse.
+    """
+
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    DEAD = "dead"
+
+    def __init__(self):
+        self.collection_name = "email_outbox"
+        self._indexes_ready = False
+
+    def _collection(self):
+        collection = get_collection(self.collection_name)
+        if not self._indexes_ready:
+            collection.create_index([("status", ASCENDING), ("next_attempt_at", ASCENDING)])
+            collection.create_index([("status", ASCENDING), ("created_at", ASCENDING)])
+            self._indexes_ready = True
+        return collection
+
+    def enqueue(self, tipo: str, payload: dict) -> str:
+        """
+        Encola un mensaje para envío en segundo plano. Retorna el id del mensaje.
+        """
+        now = datetime.now(timezone.utc)
+        result = self._collection().insert_one({
+            "tipo": tipo,
+            "payload": payload,
+            "status": self.PENDING,
+            "attempts": 0,
+            "created_at": now,
+            "next_attempt_at": now,
+            "locked_until": None,
+            "last_error": None,
+            "sent_at": None
+        })
+        return str(result.inserted_id)
+
+    def claim_next(self, lease_seconds: float) -> Optional[dict]:
+        """
+        Reclama de forma atómica el siguiente mensaje listo para enviar y lo marca como 'sending'.
+        """
+        now = datetime.now(timezone.utc)
+        return self._collection().find_one_and_update(
+            {
+                "$or": [
+                    {"status": self.PENDING, "next_attempt_at": {"$lte": now}},
+                    {"status": self.SENDING, "locked_until": {"$lt": now}}
+                ]
+            },
+            {
+                "$set": {"status": self.SENDING, "locked_until": now + timedelta(seconds=lease_seconds)},
+                "$inc": {"attempts": 1}
+            },
+            sort=[("next_attempt_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def mark_sent(self, message_id: ObjectId) -> None:
+        self._collection().update_one(
+            {"_id": message_id},
+            {"$set": {"status": self.SENT, "sent_at": datetime.now(timezone.utc), "locked_until": None}}
+        )
+
+    def release(self, message_id: ObjectId, retry_in_seconds: float) -> None:
+        """
+        Devuelve a 'pending' un mensaje reclamado que no se llegó a enviar, sin contar el
+        intento que sumó claim_next.
+        """
+        self._collection().update_one(
+            {"_id": message_id, "status": self.SENDING},
+            {
+                "$set": {
+                    "status": self.PENDING,
+                    "locked_until": None,
+                    "next_attempt_at": datetime.now(timezone.utc) + timedelta(seconds=retry_in_seconds)
+                },
+                "$inc": {"attempts": -1}
+            }
+        )
+
+    def mark_failed(self, message_id: ObjectId, error: str, retry_in_seconds: Optional[float]) -> None:
+        """
+        Registra un intento fallido. Si retry_in_seconds es None el mensaje pasa a 'dead'.
+        """
+        update = {"last_error": error, "locked_until": None}
+        if retry_in_seconds is None:
+            update["status"] = self.DEAD
+        else:
+            update["status"] = self.PENDING
+            update["next_attempt_at"] = datetime.now(timezone.utc) + timedelta(seconds=retry_in_seconds)
+        self._collection().update_one({"_id": message_id}, {"$set": update})
+
+    def get_stats(self) -> dict:
+        """
+        Profundidad de la cola por estado y antigüedad del mensaje pendiente más viejo.
+        """
+        collection = self._collection()
+        counts = {self.PENDING: 0, self.SENDING: 0, self.SENT: 0, self.DEAD: 0}
+        for row in collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+            counts[row["_id"]] = row["count"]
+
+        oldest_age_seconds = None
+        oldest = collection.find_one(
+            {"status": {"$in": [self.PENDING, self.SENDING]}},
+            {"created_at": 1},
+            sort=[("created_at", ASCENDING)]
+        )
+        if oldest:
+            created_at = oldest["created_at"]
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            oldest_age_seconds = round((datetime.now(timezone.utc) - created_at).total_seconds(), 1)
+
+        return {
+            "depth": counts[self.PENDING] + counts[self.SENDING],
+            "by_status": counts,
+            "oldest_pending_age_seconds": oldest_age_seconds
+        }
@@ -0,0 +1,158 @@
+"""
+Fechas nativas de los reportes.
+
+Los reportes guardan la fecha como "YYYY-MM-DD" y las horas como "HH:MM" en fecha_hora,
+así que los filtros por rango dependen del orden de los strings y cada agregación de
+horas trabajadas tiene que hacer $substr/$toInt. Además de esos campos (que se
+mantienen para la app), cada reporte guarda:
+- fecha_hora.inicio / fecha_hora.fin: datetime de inicio y fin. Es la hora de pared
+  local guardada tal cual como UTC, para que un rango de días coincida con el de los
+  strings sin depender de la zona horaria del servidor.
+- fecha_hora.duracion_minutos: duración precalculada.
+
+save_form los escribe en cada reporte nuevo (escritura doble) y migrar() completa los
+existentes (/api/admin/migraciones/fechas-reportes). Las consultas por rango y las
+agregaciones de horas usan los campos nativos solo cuando ya no queda ningún reporte
+sin migrar (nativas_listas); mientras tanto siguen con los strings.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from pymongo import ASCENDING, UpdateOne
+
+from infrastucture.repositories.reportes_view_materializada import ACTUALIZADO_EN
+
+FECHA_FORMAT = "%Y-%m-%d"
+HORA_FORMAT = "%H:%M"
+
+INICIO = "fecha_hora.inicio"
+FIN = "fecha_hora.fin"
+DURACION = "fecha_hora.duracion_minutos"
+
+# Índices de los endpoints por rango de fechas (horas trabajadas, materiales usados,
+# reportes de un líder o de un tipo). El rango va primero porque la mayoría de esas
+# consultas filtran solo por fecha; el segundo campo se filtra sobre las claves del índice
+INDEXES = [
+    [(INICIO, ASCENDING), ("brigada.lider.CI", ASCENDING)],
+    [(INICIO, ASCENDING), ("tipo_reporte", ASCENDING)],
+]
+
+# Reportes que se pueden migrar: fecha_hora es un objeto. Los que no (null, string) no
+# tienen fechas que convertir: migrar() los cuenta y los deja como están, y no cuentan
+# para nativas_listas (tampoco coinciden con los filtros por los strings)
+_SIN_MIGRAR = {INICIO: {"$exists": False}, "fecha_hora": {"$type": "object"}}
+_NO_MIGRABLES = {"fecha_hora": {"$not": {"$type": "object"}}}
+
+_estado = {"indices": False, "nativas": False}
+
+
+def _parse(fecha: Optional[str], hora: Optional[str] = None) -> Optional[datetime]:
+    try:
+        dia = datetime.strptime(fecha, FECHA_FORMAT)
+        if hora is None:
+            return dia
+        hm = datetime.strptime(hora, HORA_FORMAT)
+        return dia.replace(hour=hm.hour, minute=hm.minute)
+    except (TypeError, ValueError):
+        return None
+
+
+def campos_nativos(fecha_hora: Optional[dict]) -> dict:
+    """
+    inicio, fin y duracion_minutos de un fecha_hora con strings. Con fecha válida y horas
+    inválidas, inicio es el comienzo del día y fin/duración quedan en None; sin fecha
+    válida (o si fecha_hora no es un objeto) todo es None y el reporte queda fuera de los
+    rangos.
+    """
+    if not isinstance(fecha_hora, dict):
+        return {"inicio": None, "fin": None, "duracion_minutos": None}
+    fecha = fecha_hora.get("fecha")
+    inicio = _parse(fecha, fecha_hora.get("hora_inicio"))
+    fin = _parse(fecha, fecha_hora.get("hora_fin"))
+    if inicio is None:
+        return {"inicio": _parse(fecha), "fin": None, "duracion_minutos": None}
+    if fin is not None and fin < inicio:
+        # Trabajo que termina pasada la medianoche
+        fin += timedelta(days=1)
+    duracion = int((fin - inicio).total_seconds() // 60) if fin is not None else None
+    return {"inicio": inicio, "fin": fin, "duracion_minutos": duracion}
+
+
+def con_fechas_nativas(form_data: dict) -> dict:
+    """
+    Añade los campos nativos al fecha_hora de un reporte que se va a insertar.
+    """
+    if isinstance(form_data.get("fecha_hora"), dict):
+        form_data["fecha_hora"].update(campos_nativos(form_data["fecha_hora"]))
+    return form_data
+
+
+def rango(fecha_inicio: Optional[str], fecha_fin: Optional[str]) -> Optional[dict]:
+    """
+    Filtro de fecha_hora.inicio para los días [fecha_inicio, fecha_fin], ambos incluidos.
+    None si alguna fecha no tiene el formato YYYY-MM-DD.
+    """
+    condicion = {}
+    if fecha_inicio:
+        desde = _parse(fecha_inicio)
+        if desde is None:
+            return None
+        condicion["$gte"] = desde
+    if fecha_fin:
+        hasta = _parse(fecha_fin)
+        if hasta is None:
+            return None
+        condicion["$lt"] = hasta + timedelta(days=1)
+    return condicion
+
+
+def ensure_indexes(collection, logger) -> None:
+    if _estado["indices"]:
+        return
+    try:
+        for keys in INDEXES:
+            collection.create_index(keys)
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudieron crear los índices de fechas de reportes: {e}")
+    _estado["indices"] = True
+
+
+def nativas_listas(collection) -> bool:
+    """
+    True si todos los reportes migrables tienen los campos nativos. Una vez True no se
+    vuelve a consultar: los reportes nuevos siempre los traen.
+    """
+    if not _estado["nativas"]:
+        _estado["nativas"] = collection.find_one(_SIN_MIGRAR, {"_id": 1}) is None
+    return _estado["nativas"]
+
+
+def migrar(collection, batch_size: int = 1000) -> dict:
+    """
+    Completa los campos nativos de los reportes que no los tienen, por lotes con
+    bulk_write. Es idempotente y se puede interrumpir y relanzar. Marca actualizado_en
+    para que el siguiente refresco de reportes_view_materializada los recoja. Los reportes
+    cuyo fecha_hora no es un objeto no se tocan y se cuentan en `omitidos`.
+    """
+    migrados = 0
+    sin_fecha = 0
+    batch = []
+    for doc in collection.find(_SIN_MIGRAR, {"fecha_hora": 1}):
+        campos = campos_nativos(doc["fecha_hora"])
+        if campos["inicio"] is None:
+            sin_fecha += 1
+        cambios = {f"fecha_hora.{k}": v for k, v in campos.items()}
+        cambios[ACTUALIZADO_EN] = datetime.now(timezone.utc)
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": cambios}))
+        if len(batch) >= batch_size:
+            migrados += collection.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        migrados += collection.bulk_write(batch, ordered=False).modified_count
+    _estado["nativas"] = False
+    return {
+        "migrados": migrados,
+        "sin_fecha": sin_fecha,
+        "omitidos": collection.count_documents(_NO_MIGRABLES),
+        "completa": nativas_listas(collection),
+    }
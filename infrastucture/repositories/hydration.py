@@ -0,0 +1,154 @@
+"""
+Lecturas de confianza (trusted reads) de los repositorios.
+
+Lo que se lee de nuestras colecciones ya se validó al escribirlo, y en los listados se
+volvía a validar dos veces: un model_validate por documento en el repositorio y otra
+pasada del response_model de FastAPI. En modo de confianza los listados:
+- piden a MongoDB solo los campos del modelo (model_projection), así que no viajan ni
+  se exponen campos internos como la contraseña de los trabajadores;
+- convierten `_id` en `id`, completan los defaults ausentes y pasan a float los enteros
+  de los campos float (trusted_documents), sin validar, para que la respuesta tenga la
+  misma forma JSON que por la ruta validada ("precio": 1500.0 y no 1500);
+- y el router serializa los dicts directamente con ORJSONResponse (presentation.responses).
+
+TRUSTED_READS=false vuelve a la ruta validada en todos los listados (útil durante
+migraciones), y audit_collection valida una colección completa contra su modelo para
+las auditorías desde /api/admin/auditoria/{coleccion}.
+"""
+import copy
+import os
+from typing import Callable, Dict, List, Optional, Tuple, Type, get_args, get_origin
+
+from pydantic import BaseModel, ValidationError
+
+TRUSTED_READS = os.getenv("TRUSTED_READS", "true").lower() == "true"
+
+# Por campo: (nombre, default_factory, default, modelo anidado, es lista de modelos, es float)
+_FieldPlan = Tuple[str, Optional[Callable], object, Optional[Type[BaseModel]], bool, bool]
+_plans: Dict[Type[BaseModel], List[_FieldPlan]] = {}
+_projections: Dict[Type[BaseModel], Dict[str, int]] = {}
+
+_REQUIRED = object()
+
+
+def _nested_model(annotation) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """
+    Modelo anidado de una anotación (Modelo, Optional[Modelo] o List[Modelo]).
+    """
+    for candidate in (annotation, *get_args(annotation)):
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate, False
+        if get_origin(candidate) is list:
+            args = get_args(candidate)
+            if args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+                return args[0], True
+    return None, False
+
+
+def _is_float(annotation) -> bool:
+    """
+    True si la anotación es float u Optional[float].
+    """
+    return annotation is float or (
+        get_origin(annotation) is not None and float in get_args(annotation)
+        and all(arg in (float, type(None)) for arg in get_args(annotation))
+    )
+
+
+def _plan(model: Type[BaseModel]) -> List[_FieldPlan]:
+    plan = _plans.get(model)
+    if plan is None:
+        plan = []
+        for name, field in model.model_fields.items():
+            nested, many = _nested_model(field.annotation)
+            default = _REQUIRED if field.is_required() else field.get_default(call_default_factory=False)
+            plan.append((name, field.default_factory, default, nested, many, _is_float(field.annotation)))
+        _plans[model] = plan
+    return plan
+
+
+def model_projection(model: Type[BaseModel], prefix: str = "") -> Dict[str, int]:
+    """
+    Proyección de find() con los campos del modelo (y de sus modelos anidados).
+    `id` se omite porque `_id` se devuelve siempre.
+    """
+    if not prefix and model in _projections:
+        return _projections[model]
+    projection = {}
+    for name, _, _, nested, _, _ in _plan(model):
+        if name == "id" and not prefix:
+            continue
+        if nested is not None:
+            projection.update(model_projection(nested, f"{prefix}{name}."))
+        else:
+            projection[f"{prefix}{name}"] = 1
+    if not prefix:
+        _projections[model] = projection
+    return projection
+
+
+def _fill_defaults(model: Type[BaseModel], doc: dict) -> dict:
+    for name, factory, default, nested, many, is_float in _plan(model):
+        if name not in doc:
+            if factory is not None:
+                doc[name] = factory()
+            elif default is not _REQUIRED:
+                doc[name] = copy.copy(default) if isinstance(default, (list, dict)) else default
+        elif is_float:
+            # Pydantic serializa 1500 como 1500.0 en un campo float
+            if isinstance(doc[name], int):
+                doc[name] = float(doc[name])
+        elif nested is not None and doc[name] is not None:
+            if many:
+                for item in doc[name]:
+                    _fill_defaults(nested, item)
+            else:
+                _fill_defaults(nested, doc[name])
+    return doc
+
+
+def trusted_documents(model: Type[BaseModel], docs) -> List[dict]:
+    """
+    Documentos leídos con model_projection(model) listos para serializar con la forma del
+    modelo: `_id` pasa a `id` (si el modelo lo tiene; el ObjectId lo serializa
+    ORJSONResponse), se completan los defaults y los enteros de los campos float pasan
+    a float, sin validar.
+    """
+    has_id = "id" in model.model_fields
+    result = []
+    for doc in docs:
+        object_id = doc.pop("_id", None)
+        if has_id and object_id is not None:
+            doc["id"] = object_id
+        result.append(_fill_defaults(model, doc))
+    return result
+
+
+def audit_collection(collection, model: Type[BaseModel],
+                     prepare: Optional[Callable[[dict], dict]] = None, limit: int = 100) -> dict:
+    """
+    Valida todos los documentos de `collection` contra `model` y devuelve cuántos se
+    revisaron, cuántos no cumplen el esquema y los errores de los primeros `limit`.
+    Los mensajes de error no incluyen los valores, solo campo y tipo de error.
+    """
+    revisados = 0
+    invalidos = []
+    total_invalidos = 0
+    for doc in collection.find({}):
+        revisados += 1
+        doc_id = str(doc.pop("_id"))
+        if "id" in model.model_fields:
+            doc["id"] = doc_id
+        try:
+            model.model_validate(prepare(doc) if prepare else doc)
+        except ValidationError as e:
+            total_invalidos += 1
+            if len(invalidos) < limit:
+                invalidos.append({
+                    "id": doc_id,
+                    "errores": [
+                        {"campo": ".".join(str(p) for p in err["loc"]), "tipo": err["type"], "mensaje": err["msg"]}
+                        for err in e.errors(include_url=False, include_input=False)
+                    ],
+                })
+    return {"revisados": revisados, "invalidos": total_invalidos, "documentos": invalidos}
@@ -1,6 +1,9 @@
 import logging
 from bson import ObjectId
+from pymongo import DESCENDING
 from infrastucture.database.mongo_db.connection import get_collection
+from infrastucture.repositories import search_keys
+from infrastucture.repositories.hydration import model_projection, trusted_documents
 from domain.entities.lead import Lead
 from typing import Optional, List
 
@@ -19,10 +22,11 @@ class LeadsRepository:
         """
         collection = get_collection(self.collection_name)
         lead_dict = lead.model_dump()
-        self.logger.info(f"Creando lead: {lead_dict}")
+        lead_dict.update(search_keys.search_keys(self.collection_name, lead_dict))
+        self.logger.debug("Creando lead")
         try:
             result = collection.insert_one(lead_dict)
-            self.logger.info(f"Lead creado con ID: {result.inserted_id}")
+            self.logger.info("Lead creado con ID: %s", result.inserted_id, extra={"lead_id": str(result.inserted_id)})
             return str(result.inserted_id)
         except Exception as e:
             self.logger.error(f"Error al crear lead: {e}")
@@ -34,44 +38,75 @@ class LeadsRepository:
         Retorna el lead si existe, None si no existe.
         """
         collection = get_collection(self.collection_name)
-        self.logger.info(f"Buscando lead por ID: {lead_id}")
+        self.logger.debug("Buscando lead por ID: %s", lead_id)
         try:
             lead_doc = collection.find_one({"_id": ObjectId(lead_id)})
             if lead_doc:
                 lead_doc["id"] = str(lead_doc.pop("_id"))
-                self.logger.info(f"Lead encontrado: {lead_doc}")
+                self.logger.debug("Lead encontrado: %s", lead_id)
                 return Lead.model_validate(lead_doc)
-            self.logger.info("Lead no encontrado")
+            self.logger.debug("Lead no encontrado: %s", lead_id)
             return None
         except Exception as e:
             self.logger.error(f"Error al buscar lead: {e}")
             raise
 
-    def get_leads(self, nombre=None, telefono=None, estado=None, fuente=None):
+    def _leads_query(self, collection, nombre=None, telefono=None, estado=None, fuente=None) -> dict:
         """
-        Obtener leads con filtros opcionales.
+        nombre y telefono buscan por prefijo (de palabra / de dígitos) sin distinguir
+        mayúsculas ni tildes, con las claves de search_keys.
         """
-        collection = get_collection(self.collection_name)
+        search_keys.ensure_search_keys(collection, self.collection_name, self.logger)
         query = {}
-        if nombre:
-            query["nombre"] = {"$regex": nombre, "$options": "i"}
-        if telefono:
-            query["telefono"] = {"$regex": telefono, "$options": "i"}
+        conditions = []
+        for campo, texto in (("nombre", nombre), ("telefono", telefono)):
+            if texto:
+                conditions += search_keys.prefix_conditions(self.collection_name, campo, texto)
+        if conditions:
+            query["$and"] = conditions
         if estado:
             query["estado"] = estado
         if fuente:
             query["fuente"] = fuente
+        return query
 
-        self.logger.info(f"Buscando leads con query: {query}")
+    def get_leads(self, nombre=None, telefono=None, estado=None, fuente=None, limit=None):
+        """
+        Obtener leads con filtros opcionales, del contacto más reciente al más antiguo. Con
+        `limit` (typeahead), los `limit` más recientes.
+        """
+        collection = get_collection(self.collection_name)
+        query = self._leads_query(collection, nombre, telefono, estado, fuente)
+
+        self.logger.debug("Buscando leads con query: %s", query)
         try:
-            cursor = collection.find(query)
+            # Ordenado en MongoDB para que el límite se quede con los más recientes
+            cursor = collection.find(query, search_keys.hidden_fields(self.collection_name)).sort("fecha_contacto", DESCENDING)
+            if limit:
+                cursor = cursor.limit(limit)
             leads = []
             for doc in cursor:
                 doc["id"] = str(doc.pop("_id"))
                 leads.append(doc)
-            # Ordenar por fecha de contacto más reciente
-            leads.sort(key=lambda l: l.get("fecha_contacto", ""), reverse=True)
-            self.logger.info(f"Leads encontrados: {len(leads)}")
+            self.logger.debug("Leads encontrados: %d", len(leads))
+            return leads
+        except Exception as e:
+            self.logger.error(f"Error al obtener leads: {e}")
+            raise
+
+    def get_leads_trusted(self, nombre=None, telefono=None, estado=None, fuente=None, limit=None) -> List[dict]:
+        """
+        Lectura de confianza de get_leads: dicts con la forma de Lead, sin validar.
+        """
+        collection = get_collection(self.collection_name)
+        query = self._leads_query(collection, nombre, telefono, estado, fuente)
+        self.logger.debug("Buscando leads con query: %s", query)
+        try:
+            cursor = collection.find(query, model_projection(Lead)).sort("fecha_contacto", DESCENDING)
+            if limit:
+                cursor = cursor.limit(limit)
+            leads = trusted_documents(Lead, cursor)
+            self.logger.debug("Leads encontrados: %d", len(leads))
             return leads
         except Exception as e:
             self.logger.error(f"Error al obtener leads: {e}")
@@ -85,14 +120,15 @@ class LeadsRepository:
         collection = get_collection(self.collection_name)
         # Filtrar campos que no son None
         update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
-        self.logger.info(f"Actualizando lead {lead_id} con datos: {update_dict}")
+        self.logger.debug("Actualizando lead %s (campos: %s)", lead_id, ", ".join(update_dict))
+        update_dict.update(search_keys.search_keys(self.collection_name, update_dict))
         try:
             result = collection.update_one(
                 {"_id": ObjectId(lead_id)},
                 {"$set": update_dict}
             )
             updated = result.modified_count > 0
-            self.logger.info(f"Lead actualizado: {updated}")
+            self.logger.info("Lead %s actualizado: %s", lead_id, updated, extra={"lead_id": lead_id})
             return updated
         except Exception as e:
             self.logger.error(f"Error al actualizar lead: {e}")
@@ -104,11 +140,11 @@ class LeadsRepository:
         Retorna True si se eliminó correctamente, False si no se encontró.
         """
         collection = get_collection(self.collection_name)
-        self.logger.info(f"Eliminando lead con ID: {lead_id}")
+        self.logger.debug("Eliminando lead con ID: %s", lead_id)
         try:
             result = collection.delete_one({"_id": ObjectId(lead_id)})
             deleted = result.deleted_count > 0
-            self.logger.info(f"Lead eliminado: {deleted}")
+            self.logger.info("Lead %s eliminado: %s", lead_id, deleted, extra={"lead_id": lead_id})
             return deleted
         except Exception as e:
             self.logger.error(f"Error al eliminar lead: {e}")
@@ -119,14 +155,14 @@ class LeadsRepository:
         Buscar leads por teléfono (puede haber duplicados).
         """
         collection = get_collection(self.collection_name)
-        self.logger.info(f"Buscando leads por teléfono: {telefono}")
+        self.logger.debug("Buscando leads por teléfono: %s", telefono)
         try:
             cursor = collection.find({"telefono": telefono})
             leads = []
             for doc in cursor:
                 doc["id"] = str(doc.pop("_id"))
                 leads.append(Lead.model_validate(doc))
-            self.logger.info(f"Leads encontrados por teléfono: {len(leads)}")
+            self.logger.debug("Leads encontrados por teléfono: %d", len(leads))
             return leads
         except Exception as e:
             self.logger.error(f"Error al buscar leads por teléfono: {e}")
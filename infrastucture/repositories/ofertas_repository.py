@@ -1,13 +1,36 @@
+import os
 from typing import List, Optional, Union
 from bson import ObjectId
 
-from domain.entities.oferta import Oferta
+from domain.entities.oferta import Oferta, OfertaSimplificada
 from infrastucture.database.mongo_db.connection import get_collection
+from infrastucture.repositories.hydration import model_projection, trusted_documents
+
+DESCRIPCION_IA_MAX_CHARS = int(os.getenv("OFERTAS_DESCRIPCION_IA_MAX_CHARS", "300"))
+
+
+def compactar_descripcion(texto: Optional[str], max_chars: int = DESCRIPCION_IA_MAX_CHARS) -> str:
+    """
+    Versión compacta de la descripción detallada para los prompts del recomendador:
+    colapsa espacios y saltos de línea y recorta en un límite de palabra.
+    """
+    if not texto:
+        return ""
+    compacto = " ".join(texto.split())
+    if len(compacto) <= max_chars:
+        return compacto
+    recorte = compacto[:max_chars].rsplit(" ", 1)[0]
+    return recorte.rstrip(" ,;:.-") + "…"
 
 
 class OfertasRepository:
     def __init__(self):
         self.collection_name = "ofertas"
+        # Versión local del catálogo; se incrementa en cada escritura para invalidar cachés
+        self.catalog_version = 0
+
+    def _bump_version(self) -> None:
+        self.catalog_version += 1
 
     def _to_model(self, raw: dict) -> Oferta:
         raw["id"] = str(raw.pop("_id"))
@@ -24,6 +47,9 @@ class OfertasRepository:
     def _to_document(self, oferta: Union[Oferta, dict]) -> dict:
         data = oferta.model_dump() if hasattr(oferta, "model_dump") else dict(oferta)
         data.pop("id", None)
+        # Guardar junto a la oferta la descripción compacta usada en los prompts de IA
+        if "descripcion_detallada" in data:
+            data["descripcion_ia"] = compactar_descripcion(data["descripcion_detallada"])
         return data
 
     def get_all(self) -> List[Oferta]:
@@ -32,6 +58,25 @@ class OfertasRepository:
         raws = cursor.to_list(length=None)
         return [self._to_model(r) for r in raws]
 
+    def get_all_trusted(self) -> List[dict]:
+        """
+        Lectura de confianza de get_all: dicts con la forma de Oferta, sin validar.
+        """
+        collection = get_collection(self.collection_name)
+        raws = collection.find({}, model_projection(Oferta)).to_list(length=None)
+        for raw in raws:
+            if raw.get("elementos"):
+                raw["elementos"] = sorted(raw["elementos"], key=lambda x: x.get("categoria", "") or "")
+        return trusted_documents(Oferta, raws)
+
+    def get_all_simplified_trusted(self) -> List[dict]:
+        """
+        Lectura de confianza del listado simplificado: no trae los elementos de MongoDB.
+        """
+        collection = get_collection(self.collection_name)
+        raws = collection.find({}, model_projection(OfertaSimplificada)).to_list(length=None)
+        return trusted_documents(OfertaSimplificada, raws)
+
     def get_by_id(self, oferta_id: str) -> Optional[Oferta]:
         collection = get_collection(self.collection_name)
         raw = collection.find_one({"_id": ObjectId(oferta_id)})
@@ -43,17 +88,20 @@ class OfertasRepository:
         collection = get_collection(self.collection_name)
         doc = self._to_document(oferta)
         result = collection.insert_one(doc)
+        self._bump_version()
         return str(result.inserted_id)
 
     def update(self, oferta_id: str, new_data: dict) -> bool:
         collection = get_collection(self.collection_name)
         new_data = self._to_document(new_data)
         result = collection.update_one({"_id": ObjectId(oferta_id)}, {"$set": new_data})
+        self._bump_version()
         return result.modified_count > 0
 
     def delete(self, oferta_id: str) -> bool:
         collection = get_collection(self.collection_name)
         result = collection.delete_one({"_id": ObjectId(oferta_id)})
+        self._bump_version()
         return result.deleted_count > 0
 
     def add_elemento(self, oferta_id: str, elemento_data: dict) -> bool:
@@ -62,6 +110,7 @@ class OfertasRepository:
             {"_id": ObjectId(oferta_id)},
             {"$push": {"elementos": elemento_data}}
         )
+        self._bump_version()
         return result.modified_count > 0
 
     def remove_elemento(self, oferta_id: str, elemento_index: int) -> bool:
@@ -106,6 +155,7 @@ class OfertasRepository:
             {"_id": ObjectId(oferta_id)},
             {"$set": {"elementos": elementos_filtrados}}
         )
+        self._bump_version()
         return result.modified_count > 0
 
     def update_elemento(self, oferta_id: str, elemento_index: int, nuevos_datos: dict) -> bool:
@@ -158,17 +208,21 @@ class OfertasRepository:
             {"_id": ObjectId(oferta_id)},
             {"$set": {"elementos": elementos_actualizados}}
         )
+        self._bump_version()
         return result.modified_count > 0
 
     def obtener_datos_minimos_ofertas(self) -> List[dict]:
         """
         Obtiene datos mínimos de todas las ofertas para recomendaciones IA.
-        Retorna: id, descripcion_detallada, precio
+        Retorna: id, descripcion_detallada, descripcion_ia, precio
+
+        `descripcion_ia` es la versión compacta guardada al escribir la oferta; para
+        documentos antiguos que no la tienen se calcula al vuelo.
         """
         collection = get_collection(self.collection_name)
         cursor = collection.find(
             {},
-            {"_id": 1, "descripcion_detallada": 1, "precio": 1}
+            {"_id": 1, "descripcion_detallada": 1, "descripcion_ia": 1, "precio": 1}
         )
         raws = cursor.to_list(length=None)
 
@@ -177,6 +231,7 @@ class OfertasRepository:
             {
                 "id": str(raw["_id"]),
                 "descripcion_detallada": raw.get("descripcion_detallada", ""),
+                "descripcion_ia": raw.get("descripcion_ia") or compactar_descripcion(raw.get("descripcion_detallada")),
                 "precio": raw.get("precio", 0)
             }
             for raw in raws
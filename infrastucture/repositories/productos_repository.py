@@ -6,6 +6,7 @@ from pymongo.errors import PyMongoError
 import logging
 from domain.entities.producto import CatalogoProductos, Material, Cataegoria, MaterialConFecha
 from infrastucture.database.mongo_db.connection import get_collection
+from infrastucture.repositories.hydration import model_projection, trusted_documents
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +45,23 @@ class ProductRepository:
             logger.error(f"❌ Error: {e}")
             raise Exception(f"Error: {str(e)}")
 
+
+    def get_all_products_trusted(self) -> List[dict]:
+        """
+        Lectura de confianza de get_all_products: dicts con la forma de CatalogoProductos, sin validar.
+        """
+        try:
+            collection = get_collection(self.collection_name)
+            productos_raw = collection.find({}, model_projection(CatalogoProductos)).to_list(length=None)
+            for producto_raw in productos_raw:
+                # Hay códigos guardados como número; el esquema los expone como string
+                for material in producto_raw.get("materiales", []):
+                    if "codigo" in material:
+                        material["codigo"] = str(material["codigo"])
+            return trusted_documents(CatalogoProductos, productos_raw)
+        except Exception as e:
+            logger.error(f"❌ Error: {e}")
+            raise Exception(f"Error: {str(e)}")
     def get_unique_categories(self) -> List[Cataegoria]:
         """
         Obtiene todas las categorías únicas de productos.
@@ -159,10 +177,6 @@ class ProductRepository:
         try:
             collection = get_collection(self.collection_name)
 
-            # Debug prints para ver los datos que llegan
-            print(f"[DEBUG] categoria: {categoria}")
-            print(f"[DEBUG] material: {material}")
-
             # Convertir el material a dict para MongoDB solo si es modelo Pydantic
             if hasattr(material, 'model_dump'):
                 material_dict = material.model_dump()
@@ -179,7 +193,7 @@ class ProductRepository:
                 # Si no se puede convertir, dejar como está
                 pass
 
-            print(f"[DEBUG] material_dict: {material_dict}")
+            logger.debug("Agregando material a la categoría %s: %s", categoria, material_dict)
 
             # Actualizar el producto por su _id
             result = collection.update_many(
@@ -191,7 +205,6 @@ class ProductRepository:
 
         except Exception as e:
             logger.error(f"❌ Error agregando material a la categoría: {e}")
-            print(f"❌ Error agregando material a la categoría: {e}")
             raise e
 
     def delete_material_by_codigo(self, material_codigo: str) -> bool:
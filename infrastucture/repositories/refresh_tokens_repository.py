@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+import logging
+
+from pymongo import ASCENDING
+from pymongo.errors import DuplicateKeyError
+
+from infrastucture.database.mongo_db.connection import get_collection
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshTokensRepository:
+    """
+    Refresh tokens ya usados (colección refresh_tokens_usados), por su jti.
+
+    Cada refresh token sirve una sola vez: al renovar se inserta su jti y, si ya estaba,
+    la renovación se rechaza. Los registros se borran solos (índice TTL) cuando el token
+    habría expirado de todas formas.
+    """
+
+    def __init__(self):
+        self.collection_name = "refresh_tokens_usados"
+        self._indexes_ready = False
+
+    def _collection(self):
+        collection = get_collection(self.collection_name)
+        if not self._indexes_ready:
+            collection.create_index([("expira", ASCENDING)], expireAfterSeconds=0)
+            self._indexes_ready = True
+        return collection
+
+    def consumir(self, jti: str, exp: int) -> bool:
+        """
+        Marca el refresh token como usado. Retorna False si ya lo estaba (reutilización).
+        """
+        try:
+            self._collection().insert_one({
+                "_id": jti,
+                "expira": datetime.fromtimestamp(exp, timezone.utc),
+                "usado_en": datetime.now(timezone.utc)
+            })
+            return True
+        except DuplicateKeyError:
+            logger.warning(f"⚠️ Refresh token reutilizado: {jti}")
+            return False
@@ -1,18 +1,40 @@
+import re
+from datetime import datetime, timezone
 from typing import List, Optional
 from bson import ObjectId
 from pydantic import ValidationError
-from pymongo.errors import PyMongoError
+from pymongo import TEXT
+from pymongo.errors import OperationFailure, PyMongoError
 import logging
 
 from domain.entities.form import Form
 from infrastucture.database.mongo_db.connection import get_collection
+from infrastucture.repositories import fechas_reportes
+from infrastucture.repositories.reportes_view_materializada import ACTUALIZADO_EN, ReportesViewMaterializada
+from infrastucture.observability.request_timing import track
 
 logger = logging.getLogger(__name__)
 
+# Índice de texto de la búsqueda global (q). En español: sin distinción de mayúsculas ni
+# tildes (índice de texto v3) y con stemming ("instalación" encuentra "instalaciones")
+SEARCH_INDEX_NAME = "reportes_busqueda"
+SEARCH_WEIGHTS = {
+    "cliente.nombre": 10,
+    "cliente.numero": 10,
+    "brigada.lider.nombre": 5,
+    "tipo_reporte": 3,
+    "descripcion": 1,
+}
+_INDEX_NOT_FOUND = 27
+
 
 class FormRepository:
-    def __init__(self):
+    _search_index_ready = False
+
+    def __init__(self, reportes_view: Optional[ReportesViewMaterializada] = None):
         self.collection_name = "reportes"
+        # Copia materializada de reportes_view; sin ella get_reportes_view lee la vista
+        self.reportes_view = reportes_view
 
     def get_all_forms(self) -> List[Form]:
         try:
@@ -26,7 +48,8 @@ class FormRepository:
                 formulario_raw["id"] = str(formulario_raw.pop("_id"))
 
                 # Usar model_validate (Pydantic v2)
-                formulario = Form.model_validate(formulario_raw)
+                with track("validate"):
+                    formulario = Form.model_validate(formulario_raw)
                 formularios.append(formulario)
 
             return formularios
@@ -53,7 +76,8 @@ class FormRepository:
                 formulario_raw["id"] = str(formulario_raw.pop("_id"))
 
                 # Usar model_validate (Pydantic v2)
-                formulario = Form.model_validate(formulario_raw)
+                with track("validate"):
+                    formulario = Form.model_validate(formulario_raw)
                 formularios.append(formulario)
 
             return formularios
@@ -80,7 +104,8 @@ class FormRepository:
                 formulario_raw["id"] = str(formulario_raw.pop("_id"))
 
                 # Usar model_validate (Pydantic v2)
-                formulario = Form.model_validate(formulario_raw)
+                with track("validate"):
+                    formulario = Form.model_validate(formulario_raw)
                 formularios.append(formulario)
 
             return formularios
@@ -100,7 +125,10 @@ class FormRepository:
         """
         try:
             collection = get_collection(self.collection_name)
-            result = collection.insert_one(form_data)
+            form_data[ACTUALIZADO_EN] = datetime.now(timezone.utc)
+            result = collection.insert_one(fechas_reportes.con_fechas_nativas(form_data))
+            if self.reportes_view is not None:
+                self.reportes_view.marcar_pendiente()
             return str(result.inserted_id)
         except Exception as e:
             logger.error(f"❌ Error guardando formulario: {e}")
@@ -108,20 +136,21 @@ class FormRepository:
 
             
 
-    def get_reportes(self, tipo_reporte=None, cliente_numero=None, fecha_inicio=None, fecha_fin=None, lider_ci=None, descripcion=None, q=None):
-        """
-        Obtiene reportes con filtros opcionales y los devuelve como dicts serializables.
-        Si se pasa 'q', hace búsqueda global en varios campos.
-        """
-        collection = get_collection(self.collection_name)
+    def _filtros(self, collection, tipo_reporte=None, cliente_numero=None, fecha_inicio=None, fecha_fin=None,
+                 lider_ci=None, descripcion=None) -> dict:
         query = {}
         if tipo_reporte:
             query["tipo_reporte"] = tipo_reporte
         if cliente_numero:
             query["cliente.numero"] = cliente_numero
-        if fecha_inicio:
+        if fecha_inicio or fecha_fin:
+            fechas_reportes.ensure_indexes(collection, logger)
+            rango = fechas_reportes.rango(fecha_inicio, fecha_fin)
+            if rango is not None and fechas_reportes.nativas_listas(collection):
+                query[fechas_reportes.INICIO] = rango
+        if fecha_inicio and fechas_reportes.INICIO not in query:
             query["fecha_hora.fecha"] = {"$gte": fecha_inicio}
-        if fecha_fin:
+        if fecha_fin and fechas_reportes.INICIO not in query:
             if "fecha_hora.fecha" in query:
                 query["fecha_hora.fecha"]["$lte"] = fecha_fin
             else:
@@ -130,27 +159,91 @@ class FormRepository:
             query["brigada.lider.CI"] = lider_ci
         if descripcion:
             query["descripcion"] = {"$regex": descripcion, "$options": "i"}
+        return query
+
+    def _ensure_search_index(self, collection):
+        if FormRepository._search_index_ready:
+            return
+        try:
+            collection.create_index(
+                [(campo, TEXT) for campo in SEARCH_WEIGHTS],
+                name=SEARCH_INDEX_NAME,
+                weights=SEARCH_WEIGHTS,
+                default_language="spanish",
+                # Los reportes no traen idioma propio; evita que un campo "language" lo cambie
+                language_override="idioma_busqueda",
+            )
+        except PyMongoError as e:
+            logger.warning(f"⚠️ No se pudo crear el índice de texto de reportes: {e}")
+        FormRepository._search_index_ready = True
+
+    def _buscar(self, query: dict, q: str, skip: int = 0, limit: int = 0):
+        """
+        Busca `q` con el índice de texto, ordenado por relevancia. Devuelve (total, docs) con
+        la relevancia en `relevancia`. Si el índice no existe (p. ej. sin permisos para
+        crearlo) vuelve al $or de regex, sin ranking.
+        """
+        collection = get_collection(self.collection_name)
+        self._ensure_search_index(collection)
+        text_query = {**query, "$text": {"$search": q}}
+        try:
+            total = collection.count_documents(text_query)
+            cursor = (
+                collection.find(text_query, {"relevancia": {"$meta": "textScore"}})
+                .sort([("relevancia", {"$meta": "textScore"})])
+                .skip(skip)
+                .limit(limit)
+            )
+            return total, list(cursor)
+        except OperationFailure as e:
+            if e.code != _INDEX_NOT_FOUND:
+                raise
+            logger.warning(f"⚠️ Sin índice de texto en reportes, búsqueda con regex: {e}")
+        patron = {"$regex": re.escape(q), "$options": "i"}
+        regex_query = {**query, "$or": [{campo: patron} for campo in SEARCH_WEIGHTS]}
+        total = collection.count_documents(regex_query)
+        return total, list(collection.find(regex_query).skip(skip).limit(limit))
+
+    def get_reportes(self, tipo_reporte=None, cliente_numero=None, fecha_inicio=None, fecha_fin=None, lider_ci=None, descripcion=None, q=None):
+        """
+        Obtiene reportes con filtros opcionales y los devuelve como dicts. El `id` queda como
+        ObjectId; lo serializa ORJSONResponse. Si se pasa 'q', hace búsqueda global en varios
+        campos con el índice de texto, ordenada por relevancia.
+        """
+        collection = get_collection(self.collection_name)
+        query = self._filtros(collection, tipo_reporte, cliente_numero, fecha_inicio, fecha_fin, lider_ci, descripcion)
         if q:
-            or_conditions = [
-                {"descripcion": {"$regex": q, "$options": "i"}},
-                {"cliente.nombre": {"$regex": q, "$options": "i"}},
-                {"cliente.numero": {"$regex": q, "$options": "i"}},
-                {"brigada.lider.nombre": {"$regex": q, "$options": "i"}},
-                {"tipo_reporte": {"$regex": q, "$options": "i"}},
-            ]
-            query["$or"] = or_conditions
-        cursor = collection.find(query)
+            _, cursor = self._buscar(query, q)
+        else:
+            cursor = collection.find(query)
         reportes = []
         for doc in cursor:
-            doc["id"] = str(doc.pop("_id"))
+            doc["id"] = doc.pop("_id")
             reportes.append(doc)
         return reportes
 
+    def buscar_reportes(self, q: str, page: int = 1, limit: int = 50, tipo_reporte=None, cliente_numero=None,
+                        fecha_inicio=None, fecha_fin=None, lider_ci=None) -> dict:
+        """
+        Búsqueda global paginada, ordenada por relevancia. Devuelve la página pedida y el
+        total de coincidencias.
+        """
+        query = self._filtros(get_collection(self.collection_name), tipo_reporte, cliente_numero, fecha_inicio, fecha_fin, lider_ci)
+        total, docs = self._buscar(query, q, skip=(page - 1) * limit, limit=limit)
+        for doc in docs:
+            doc["id"] = doc.pop("_id")
+        return {"total": total, "page": page, "limit": limit, "reportes": docs}
+
     def get_reportes_view(self, tipo_reporte=None, cliente_numero=None, fecha_inicio=None, fecha_fin=None, lider_ci=None):
         """
-        Obtiene reportes desde la vista reportes_view con filtros opcionales.
+        Obtiene reportes desde la vista reportes_view con filtros opcionales. Lee de su copia
+        materializada (indexada) cuando ya se ha refrescado; los reportes recién guardados
+        aparecen tras el refresco que dispara save_form.
         """
-        collection = get_collection("reportes_view")
+        if self.reportes_view is not None:
+            collection = self.reportes_view.coleccion()
+        else:
+            collection = get_collection("reportes_view")
         query = {}
         if tipo_reporte:
             query["tipo_reporte"] = tipo_reporte
@@ -169,7 +262,7 @@ class FormRepository:
         cursor = collection.find(query)
         reportes = []
         for doc in cursor:
-            doc["id"] = str(doc.pop("_id"))
+            doc["id"] = doc.pop("_id")
             reportes.append(doc)
         return reportes
 
@@ -183,7 +276,7 @@ class FormRepository:
             doc = collection.find_one({"_id": ObjectId(reporte_id)})
             if not doc:
                 return None
-            doc["id"] = str(doc.pop("_id"))
+            doc["id"] = doc.pop("_id")
             return doc
         except Exception as e:
             logger.error(f"❌ Error obteniendo reporte por id: {e}")
@@ -0,0 +1,268 @@
+"""
+Copia materializada de la vista reportes_view.
+
+reportes_view es una vista de MongoDB sobre reportes: cada consulta vuelve a ejecutar su
+pipeline sobre todos los reportes y los filtros (fecha, lider_ci, cliente_numero...) no
+pueden usar índices. Aquí se guarda su resultado en la colección reportes_view_materializada,
+con índices propios, y get_reportes_view lee de ella:
+- refresco completo: el pipeline de la vista con $out (reemplaza la colección de una vez y
+  conserva sus índices). Es el primero y el que se fuerza desde admin; también recoge
+  reportes borrados o cambios en colecciones que la vista consulte.
+- refresco incremental: solo los reportes con actualizado_en posterior a la marca del
+  último refresco (menos un margen), con $merge por _id. save_form y la migración de
+  fechas escriben actualizado_en, con un índice para que el $match no recorra reportes.
+
+Lo dispara save_form (BackgroundTask tras crear el reporte), el worker periódico
+(REPORTES_VIEW_WORKER=true) o /api/admin/reportes-view/refrescar. La marca de agua se
+guarda en la colección materializaciones para que la compartan todas las instancias.
+Mientras no haya un refresco completo, get_reportes_view sigue leyendo la vista. Si no se
+puede leer la definición de la vista (no existe, no es una vista sobre reportes o faltan
+permisos), la copia queda deshabilitada en el proceso: nunca se materializa con un
+pipeline supuesto, que cambiaría la forma de los documentos.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from pymongo import ASCENDING
+
+from infrastucture.database.mongo_db.connection import get_collection, get_database
+from infrastucture.observability.metrics_registry import MetricFamily
+
+logger = logging.getLogger(__name__)
+
+ORIGEN = "reportes"
+VISTA = "reportes_view"
+COLECCION = "reportes_view_materializada"
+ESTADO = "materializaciones"
+ACTUALIZADO_EN = "actualizado_en"
+
+# Etapas que no son de documento a documento: con ellas un $match previo cambia el
+# resultado, así que la vista solo se puede refrescar completa
+ETAPAS_NO_INCREMENTALES = {
+    "$group", "$unwind", "$limit", "$skip", "$sort", "$sample", "$facet", "$bucket",
+    "$bucketAuto", "$count", "$sortByCount", "$setWindowFields", "$densify", "$fill",
+}
+
+# Índices de los filtros de get_reportes_view. El rango de fecha va primero porque casi
+# todas las consultas lo usan
+INDEXES = [
+    [("fecha", ASCENDING), ("lider_ci", ASCENDING)],
+    [("fecha", ASCENDING), ("tipo_reporte", ASCENDING)],
+    [("cliente_numero", ASCENDING), ("fecha", ASCENDING)],
+]
+
+
+def _utc(fecha: datetime) -> datetime:
+    # pymongo devuelve datetimes sin zona (en UTC)
+    return fecha if fecha.tzinfo else fecha.replace(tzinfo=timezone.utc)
+
+
+class ReportesViewMaterializada:
+    """
+    Refresca la copia materializada de reportes_view y lleva en memoria el estado que se
+    publica en /metrics (el scrape no consulta MongoDB).
+    """
+
+    def __init__(self):
+        self.habilitada = os.getenv("REPORTES_VIEW_MATERIALIZADA", "true").lower() == "true"
+        self.margen = timedelta(seconds=float(os.getenv("REPORTES_VIEW_MARGEN_SECONDS", "60")))
+        self.intervalo = float(os.getenv("REPORTES_VIEW_REFRESH_SECONDS", "60"))
+        self.intervalo_completo = float(os.getenv("REPORTES_VIEW_FULL_REFRESH_SECONDS", "86400"))
+        self._lock = threading.Lock()
+        self._pipeline: Optional[List[dict]] = None
+        self._indices_listos = False
+        self._lista = False
+
+        # Estado del proceso para /metrics
+        self.pendientes = 0
+        self.refrescos = {}
+        self._marca_de_agua: Optional[float] = None
+        self._ultimo_completo: Optional[float] = None
+        self._ultima_duracion: Optional[float] = None
+        self._ultimos_documentos: Optional[int] = None
+
+    # ---------------------------------------------------------------- lectura
+
+    def lista(self) -> bool:
+        """
+        True si get_reportes_view puede leer de la copia: está habilitada, se puede leer la
+        definición de la vista y ya tuvo un refresco completo (de esta u otra instancia).
+        Una vez True no se vuelve a consultar.
+        """
+        if not self.habilitada or self._pipeline_vista() is None:
+            return False
+        if not self._lista:
+            estado = get_collection(ESTADO).find_one({"_id": VISTA})
+            if estado and estado.get("completo_en"):
+                self._lista = True
+                self._recordar(estado)
+        return self._lista
+
+    def coleccion(self):
+        return get_collection(COLECCION if self.lista() else VISTA)
+
+    def marcar_pendiente(self) -> None:
+        self.pendientes += 1
+
+    # -------------------------------------------------------------- refresco
+
+    def _pipeline_vista(self) -> Optional[List[dict]]:
+        """
+        El pipeline con el que está definida reportes_view en la base (la vista se creó en
+        Atlas y no está en el código). Si no se puede leer, deshabilita la copia en el
+        proceso y retorna None.
+        """
+        if self._pipeline is None and self.habilitada:
+            try:
+                info = get_database().command("listCollections", filter={"name": VISTA})
+                for coleccion in info["cursor"]["firstBatch"]:
+                    opciones = coleccion.get("options", {})
+                    if opciones.get("viewOn") == ORIGEN:
+                        self._pipeline = opciones.get("pipeline", [])
+                if self._pipeline is None:
+                    logger.warning(f"⚠️ {VISTA} no es una vista sobre {ORIGEN}: copia materializada deshabilitada")
+            except Exception as e:
+                logger.warning(f"⚠️ No se pudo leer la definición de {VISTA}, copia materializada deshabilitada: {e}")
+            if self._pipeline is None:
+                self.habilitada = False
+        return self._pipeline
+
+    def _incremental_posible(self) -> bool:
+        return not any(etapa in ETAPAS_NO_INCREMENTALES for paso in self._pipeline_vista() for etapa in paso)
+
+    def _ensure_indexes(self) -> None:
+        if self._indices_listos:
+            return
+        try:
+            get_collection(ORIGEN).create_index([(ACTUALIZADO_EN, ASCENDING)])
+            materializada = get_collection(COLECCION)
+            for keys in INDEXES:
+                materializada.create_index(keys)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudieron crear los índices de {COLECCION}: {e}")
+        self._indices_listos = True
+
+    def _recordar(self, estado: dict) -> None:
+        if estado.get("marca_de_agua"):
+            self._marca_de_agua = _utc(estado["marca_de_agua"]).timestamp()
+        if estado.get("completo_en"):
+            self._ultimo_completo = _utc(estado["completo_en"]).timestamp()
+
+    def refrescar(self, completo: bool = False, esperar: bool = True) -> dict:
+        """
+        Refresca la copia: incremental desde la última marca de agua o completo si se pide,
+        si aún no hay marca, si la vista no admite el incremental o si el último completo es
+        más viejo que REPORTES_VIEW_FULL_REFRESH_SECONDS. Con esperar=False no hace nada si
+        ya hay un refresco en curso en el proceso (ese recogerá los cambios o lo hará el
+        siguiente).
+        """
+        if not self.habilitada or self._pipeline_vista() is None:
+            return {"omitido": True, "motivo": "copia materializada deshabilitada (ver el log)"}
+        if not self._lock.acquire(blocking=esperar):
+            return {"omitido": True, "motivo": "refresco en curso"}
+        try:
+            return self._refrescar(completo)
+        finally:
+            self._lock.release()
+
+    def _refrescar(self, completo: bool) -> dict:
+        estados = get_collection(ESTADO)
+        estado = estados.find_one({"_id": VISTA}) or {}
+        self._recordar(estado)
+        self._ensure_indexes()
+
+        ahora = datetime.now(timezone.utc)
+        vencido = (
+            self._ultimo_completo is None
+            or ahora.timestamp() - self._ultimo_completo >= self.intervalo_completo
+        )
+        if completo or vencido or not estado.get("marca_de_agua") or not self._incremental_posible():
+            modo = "completo"
+        else:
+            modo = "incremental"
+
+        pendientes = self.pendientes
+        start = time.perf_counter()
+        try:
+            reportes = get_collection(ORIGEN)
+            if modo == "completo":
+                reportes.aggregate(self._pipeline_vista() + [{"$out": COLECCION}])
+                documentos = get_collection(COLECCION).estimated_document_count()
+            else:
+                desde = _utc(estado["marca_de_agua"]) - self.margen
+                filtro = {ACTUALIZADO_EN: {"$gte": desde}}
+                documentos = reportes.count_documents(filtro)
+                if documentos:
+                    reportes.aggregate([{"$match": filtro}] + self._pipeline_vista() + [{"$merge": {
+                        "into": COLECCION,
+                        "on": "_id",
+                        "whenMatched": "replace",
+                        "whenNotMatched": "insert",
+                    }}])
+        except Exception as e:
+            self._contar(modo, "error")
+            logger.error(f"❌ Error en el refresco {modo} de {COLECCION}: {e}")
+            raise
+
+        duracion_ms = round((time.perf_counter() - start) * 1000, 1)
+        cambios = {"marca_de_agua": ahora, "refrescado_en": datetime.now(timezone.utc),
+                   "modo": modo, "documentos": documentos, "duracion_ms": duracion_ms}
+        if modo == "completo":
+            cambios["completo_en"] = ahora
+        estados.update_one({"_id": VISTA}, {"$set": cambios}, upsert=True)
+
+        self._recordar(cambios)
+        self._lista = self.habilitada
+        self.pendientes = max(0, self.pendientes - pendientes)
+        self._ultima_duracion = duracion_ms / 1000
+        self._ultimos_documentos = documentos
+        self._contar(modo, "ok")
+        logger.info(f"✅ {COLECCION} refrescada ({modo}): {documentos} documentos en {duracion_ms} ms")
+        return {"modo": modo, "documentos": documentos, "duracion_ms": duracion_ms, "marca_de_agua": ahora}
+
+    def _contar(self, modo: str, resultado: str) -> None:
+        clave = (modo, resultado)
+        self.refrescos[clave] = self.refrescos.get(clave, 0) + 1
+
+    async def run_forever(self) -> None:
+        logger.info(f"Worker de refresco de {COLECCION} iniciado")
+        while True:
+            try:
+                await asyncio.to_thread(self.refrescar, False, False)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Error en el worker de {COLECCION}: {e}")
+            await asyncio.sleep(self.intervalo)
+
+    # --------------------------------------------------------------- métricas
+
+    def metric_families(self) -> List[MetricFamily]:
+        refrescos = MetricFamily("suncar_reportes_view_refreshes_total", "counter",
+                                 "Refrescos de la copia materializada de reportes_view")
+        for (modo, resultado), total in sorted(self.refrescos.items()):
+            refrescos.add(total, {"mode": modo, "result": resultado})
+        families = [
+            refrescos,
+            MetricFamily("suncar_reportes_view_pending_writes", "gauge",
+                         "Reportes guardados por este proceso aún no refrescados").add(self.pendientes),
+        ]
+        if self._marca_de_agua is not None:
+            families.append(MetricFamily(
+                "suncar_reportes_view_staleness_seconds", "gauge",
+                "Segundos desde la marca de agua del último refresco conocido"
+            ).add(round(time.time() - self._marca_de_agua, 3)))
+        if self._ultima_duracion is not None:
+            families.append(MetricFamily(
+                "suncar_reportes_view_last_refresh_seconds", "gauge", "Duración del último refresco"
+            ).add(self._ultima_duracion))
+            families.append(MetricFamily(
+                "suncar_reportes_view_last_refresh_documents", "gauge",
+                "Documentos escritos en el último refresco"
+            ).add(self._ultimos_documentos))
+        return families
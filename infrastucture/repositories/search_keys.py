@@ -0,0 +1,172 @@
+"""
+Claves de búsqueda normalizadas (typeahead) de clientes, trabajadores y leads.
+
+Los filtros por nombre, dirección o teléfono usaban $regex sin anclar con $options "i":
+recorren toda la colección y no encuentran "Pérez" si se escribe "perez". En su lugar,
+al escribir cada documento se guarda, por campo buscable, un array con sus palabras en
+minúsculas y sin tildes (busqueda_nombre: ["jose", "perez", "diaz"]), con un índice
+multikey. La búsqueda exige que cada palabra escrita sea prefijo de alguna palabra del
+campo ("jos per" encuentra "José Pérez"), con regex anclados (^jos) que MongoDB resuelve
+con un rango del índice, sin importar el tamaño de la colección.
+
+Los teléfonos se guardan solo con sus dígitos, y también los 8 últimos (el número
+nacional sin el prefijo de país), para que "5551" y "+53 5551..." encuentren el mismo.
+
+Los listados de clientes se ordenan por los 4 últimos dígitos de numero. Para que MongoDB
+ordene antes de aplicar el límite del typeahead (y con índice), ese sufijo también se
+guarda en el documento (orden_numero).
+
+Los documentos anteriores a las claves se completan la primera vez que el repositorio
+las usa (ensure_search_keys) y /api/admin/busqueda/reindexar/{coleccion} las recalcula.
+"""
+import re
+import unicodedata
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, UpdateOne
+
+PREFIX = "busqueda_"
+SORT_PREFIX = "orden_"
+_WORD = re.compile(r"[a-z0-9]+")
+_NATIONAL_DIGITS = 8
+# Condición que no encuentra nada (rango vacío sobre el índice de _id)
+_NINGUNO = {"_id": {"$in": []}}
+
+
+def key_field(campo: str) -> str:
+    return PREFIX + campo
+
+
+def sort_field(campo: str) -> str:
+    return SORT_PREFIX + campo
+
+
+def fold(text: str) -> str:
+    """
+    Minúsculas y sin tildes ni diéresis ("Peña Núñez" -> "pena nunez").
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def text_tokens(value) -> List[str]:
+    if not value:
+        return []
+    return list(dict.fromkeys(_WORD.findall(fold(str(value)))))
+
+
+def phone_tokens(value) -> List[str]:
+    digits = re.sub(r"\D", "", str(value or ""))
+    if not digits:
+        return []
+    return list(dict.fromkeys([digits, digits[-_NATIONAL_DIGITS:]]))
+
+
+def numero_suffix(value) -> Optional[int]:
+    """
+    Los 4 últimos caracteres de numero como entero, o None si no son dígitos.
+    """
+    suffix = str(value or "")[-4:]
+    return int(suffix) if suffix.isdigit() else None
+
+
+# Campos buscables por colección y cómo se tokenizan
+SEARCH_FIELDS: Dict[str, Dict[str, Callable[[object], List[str]]]] = {
+    "clientes": {"nombre": text_tokens, "direccion": text_tokens},
+    "trabajadores": {"nombre": text_tokens},
+    "leads": {"nombre": text_tokens, "telefono": phone_tokens},
+}
+
+# Campos de orden por colección y cómo se calcula la clave guardada
+SORT_FIELDS: Dict[str, Dict[str, Callable[[object], object]]] = {
+    "clientes": {"numero": numero_suffix},
+}
+
+
+def _key_fields(collection_name: str) -> Dict[str, Tuple[str, Callable]]:
+    """
+    Todas las claves calculadas de la colección: campo guardado -> (campo de origen, cálculo).
+    """
+    keys = {key_field(c): (c, f) for c, f in SEARCH_FIELDS[collection_name].items()}
+    keys.update({sort_field(c): (c, f) for c, f in SORT_FIELDS.get(collection_name, {}).items()})
+    return keys
+
+_ready = set()
+
+
+def search_keys(collection_name: str, data: dict) -> dict:
+    """
+    Claves de búsqueda (y de orden) de los campos presentes en `data`, para añadirlas al
+    documento que se inserta o al $set de una actualización (parcial o completa).
+    """
+    return {
+        key: compute(data[campo])
+        for key, (campo, compute) in _key_fields(collection_name).items()
+        if campo in data
+    }
+
+
+def prefix_conditions(collection_name: str, campo: str, text: str) -> List[dict]:
+    """
+    Condiciones de find() (para un $and) de `text` sobre el campo: cada palabra escrita
+    debe ser prefijo de alguna palabra guardada. Si `text` no tiene nada buscable
+    ("--", "?") la condición no encuentra nada, en vez de quedar sin filtro y devolver
+    toda la colección.
+    """
+    tokens = SEARCH_FIELDS[collection_name][campo](text)
+    if not tokens:
+        return [_NINGUNO]
+    return [{key_field(campo): re.compile("^" + re.escape(token))} for token in tokens]
+
+
+def hidden_fields(collection_name: str) -> Dict[str, int]:
+    """
+    Proyección que excluye las claves de búsqueda y de orden de las respuestas.
+    """
+    return {key: 0 for key in _key_fields(collection_name)}
+
+
+def sort_spec(collection_name: str) -> List[tuple]:
+    """
+    Orden de find() por las claves de orden de la colección, con _id para desempatar.
+    """
+    return [(sort_field(campo), ASCENDING) for campo in SORT_FIELDS.get(collection_name, {})] + [("_id", ASCENDING)]
+
+
+def reindex(collection, collection_name: str, only_missing: bool = False, batch_size: int = 1000) -> int:
+    """
+    Recalcula las claves de búsqueda y de orden de la colección (o solo de los documentos
+    que no las tienen) con bulk_write por lotes. Retorna los documentos actualizados.
+    """
+    keys = _key_fields(collection_name)
+    campos = list(dict.fromkeys(campo for campo, _ in keys.values()))
+    query = {"$or": [{key: {"$exists": False}} for key in keys]} if only_missing else {}
+    projection = {c: 1 for c in campos}
+    updated = 0
+    batch = []
+    for doc in collection.find(query, projection):
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": search_keys(collection_name, {c: doc.get(c) for c in campos})}))
+        if len(batch) >= batch_size:
+            updated += collection.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        updated += collection.bulk_write(batch, ordered=False).modified_count
+    return updated
+
+
+def ensure_search_keys(collection, collection_name: str, logger) -> None:
+    """
+    Una vez por proceso: crea los índices de las claves y completa los documentos que no
+    las tienen (los escritos antes de existir las claves o por otras vías).
+    """
+    if collection_name in _ready:
+        return
+    try:
+        for key in _key_fields(collection_name):
+            collection.create_index([(key, ASCENDING)])
+        completados = reindex(collection, collection_name, only_missing=True)
+        if completados:
+            logger.info(f"✅ Claves de búsqueda completadas en {collection_name}: {completados} documentos")
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudieron preparar las claves de búsqueda de {collection_name}: {e}")
+    _ready.add(collection_name)
@@ -6,6 +6,10 @@ import logging
 
 from domain.entities.trabajador import Trabajador
 from infrastucture.database.mongo_db.connection import get_collection
+from infrastucture.observability.request_timing import track
+from infrastucture.repositories import fechas_reportes, search_keys
+from infrastucture.repositories.hydration import model_projection, trusted_documents
+from infrastucture.repositories.brigada_repository import invalidar_cache_brigadas
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +32,8 @@ class WorkerRepository:
                 # Determinar si tiene contraseña
                 worker_raw["tiene_contraseña"] = bool(worker_raw.get("contraseña"))
                 # Usar model_validate (Pydantic v2)
-                worker = Trabajador.model_validate(worker_raw)
+                with track("validate"):
+                    worker = Trabajador.model_validate(worker_raw)
                 workers.append(worker)
 
             return workers
@@ -40,6 +45,22 @@ class WorkerRepository:
             logger.error(f"❌ Error: {e}")
             raise Exception(f"Error: {str(e)}")
 
+    def get_all_workers_trusted(self) -> List[dict]:
+        """
+        Lectura de confianza de get_all_workers: dicts con la forma de Trabajador, sin validar.
+        La contraseña solo se lee para calcular tiene_contraseña y no se devuelve.
+        """
+        try:
+            collection = get_collection(self.collection_name)
+            projection = {**model_projection(Trabajador), "contraseña": 1}
+            workers_raw = collection.find({}, projection).to_list(length=None)
+            for worker_raw in workers_raw:
+                worker_raw["tiene_contraseña"] = bool(worker_raw.pop("contraseña", None))
+            return trusted_documents(Trabajador, workers_raw)
+        except Exception as e:
+            logger.error(f"❌ Error: {e}")
+            raise Exception(f"Error: {str(e)}")
+
     def login(self, ci: str, contraseña: str) -> bool:
         """
         Autentica un trabajador usando su CI y contraseña.
@@ -78,35 +99,88 @@ class WorkerRepository:
             logger.error(f"❌ Error durante el login: {e}")
             raise Exception(f"Error durante el login: {str(e)}")
 
+    def get_contraseña(self, ci: str) -> Optional[str]:
+        """
+        Contraseña actual del trabajador, o None si no existe o no tiene contraseña.
+        """
+        worker_raw = get_collection(self.collection_name).find_one({"CI": ci}, {"contraseña": 1})
+        return worker_raw.get("contraseña") if worker_raw else None
+
     def create_worker(self, ci: str, nombre: str, contrasena: str = None) -> str:
         collection = get_collection(self.collection_name)
-        data = {"CI": ci, "nombre": nombre}
+        data = {"CI": ci, "nombre": nombre, **search_keys.search_keys(self.collection_name, {"nombre": nombre})}
         if contrasena:
             data["contraseña"] = contrasena
         result = collection.insert_one(data)
         return str(result.inserted_id)
 
-    def search_workers_by_name(self, nombre: str) -> list:
+    def search_workers_by_name(self, nombre: str, limit: Optional[int] = None) -> list:
+        """
+        Trabajadores cuyo nombre contiene palabras que empiezan por las escritas, sin
+        distinguir mayúsculas ni tildes (search_keys). Con `limit`, como mucho `limit`.
+        """
         collection = get_collection(self.collection_name)
-        cursor = collection.find({"nombre": {"$regex": nombre, "$options": "i"}})
-        workers_raw = cursor.to_list(length=None)
+        search_keys.ensure_search_keys(collection, self.collection_name, logger)
+        if not nombre:
+            return []
+        query = {"$and": search_keys.prefix_conditions(self.collection_name, "nombre", nombre)}
+        cursor = collection.find(query, search_keys.hidden_fields(self.collection_name))
+        workers_raw = cursor.to_list(length=limit)
         workers = []
         for worker_raw in workers_raw:
             worker_raw["id"] = str(worker_raw.pop("_id"))
-            worker = Trabajador.model_validate(worker_raw)
+            with track("validate"):
+                worker = Trabajador.model_validate(worker_raw)
             workers.append(worker)
         return workers
 
     def set_worker_password(self, ci: str, contrasena: str) -> bool:
         collection = get_collection(self.collection_name)
         result = collection.update_one({"CI": ci}, {"$set": {"contraseña": contrasena}})
+        # tiene_contraseña forma parte del snapshot de las brigadas
+        invalidar_cache_brigadas()
         return result.modified_count > 0
 
     def remove_worker_password(self, ci: str) -> bool:
         collection = get_collection(self.collection_name)
         result = collection.update_one({"CI": ci}, {"$unset": {"contraseña": ""}})
+        invalidar_cache_brigadas()
         return result.modified_count > 0
 
+    @staticmethod
+    def _match_fechas(collection, fecha_inicio: str, fecha_fin: str) -> dict:
+        """
+        Filtro del rango de fechas: por fecha_hora.inicio (datetime, con índice) si todos
+        los reportes tienen las fechas nativas, si no por los strings de fecha_hora.fecha.
+        """
+        fechas_reportes.ensure_indexes(collection, logger)
+        rango = fechas_reportes.rango(fecha_inicio, fecha_fin)
+        if rango is not None and fechas_reportes.nativas_listas(collection):
+            return {fechas_reportes.INICIO: rango}
+        return {"fecha_hora.fecha": {"$gte": fecha_inicio, "$lte": fecha_fin}}
+
+    @staticmethod
+    def _horas_trabajadas(fechas: dict) -> dict:
+        """
+        Horas de cada reporte: la duración precalculada o, con los strings, (hora_fin -
+        hora_inicio) convertidas a minutos con $substr/$toInt.
+
+        Los dos caminos no dan lo mismo en dos casos, a propósito: un trabajo que pasa de
+        la medianoche (22:00-02:00) da horas negativas con los strings y 4 h con la
+        duración nativa, y una hora sin cero delante ("8:30") solo la entiende la nativa
+        (el $substr de dos caracteres no la lee bien).
+        """
+        if fechas_reportes.INICIO in fechas:
+            return {"$divide": [{"$ifNull": ["$" + fechas_reportes.DURACION, 0]}, 60]}
+
+        def minutos(campo: str) -> dict:
+            return {"$add": [
+                {"$multiply": [{"$toInt": {"$substr": [campo, 0, 2]}}, 60]},
+                {"$toInt": {"$substr": [campo, 3, 2]}},
+            ]}
+
+        return {"$divide": [{"$subtract": [minutos("$fecha_hora.hora_fin"), minutos("$fecha_hora.hora_inicio")]}, 60]}
+
     def get_hours_worked_by_ci(self, ci: str, fecha_inicio: str, fecha_fin: str) -> float:
         """
         Obtiene el total de horas trabajadas por una persona dado su CI y rango de fechas.
@@ -119,16 +193,12 @@ class WorkerRepository:
         try:
             collection = get_collection(self.reportes_collection_name)
 
+            fechas = self._match_fechas(collection, fecha_inicio, fecha_fin)
             pipeline = [
                 {
                     "$match": {
                         "$and": [
-                            {
-                                "fecha_hora.fecha": {
-                                    "$gte": fecha_inicio,
-                                    "$lte": fecha_fin
-                                }
-                            },
+                            fechas,
                             {
                                 "$or": [
                                     {"brigada.lider.CI": ci},
@@ -138,41 +208,7 @@ class WorkerRepository:
                         ]
                     }
                 },
-                {
-                    "$addFields": {
-                        "horas_trabajadas": {
-                            "$divide": [
-                                {
-                                    "$subtract": [
-                                        {
-                                            "$add": [
-                                                {
-                                                    "$multiply": [
-                                                        {"$toInt": {"$substr": ["$fecha_hora.hora_fin", 0, 2]}},
-                                                        60
-                                                    ]
-                                                },
-                                                {"$toInt": {"$substr": ["$fecha_hora.hora_fin", 3, 2]}}
-                                            ]
-                                        },
-                                        {
-                                            "$add": [
-                                                {
-                                                    "$multiply": [
-                                                        {"$toInt": {"$substr": ["$fecha_hora.hora_inicio", 0, 2]}},
-                                                        60
-                                                    ]
-                                                },
-                                                {"$toInt": {"$substr": ["$fecha_hora.hora_inicio", 3, 2]}}
-                                            ]
-                                        }
-                                    ]
-                                },
-                                60
-                            ]
-                        }
-                    }
-                },
+                {"$addFields": {"horas_trabajadas": self._horas_trabajadas(fechas)}},
                 {
                     "$group": {
                         "_id": None,
@@ -203,50 +239,10 @@ class WorkerRepository:
         try:
             collection = get_collection(self.reportes_collection_name)
 
+            fechas = self._match_fechas(collection, fecha_inicio, fecha_fin)
             pipeline = [
-                {
-                    "$match": {
-                        "fecha_hora.fecha": {
-                            "$gte": fecha_inicio,
-                            "$lte": fecha_fin
-                        }
-                    }
-                },
-                {
-                    "$addFields": {
-                        "horas_trabajadas": {
-                            "$divide": [
-                                {
-                                    "$subtract": [
-                                        {
-                                            "$add": [
-                                                {
-                                                    "$multiply": [
-                                                        {"$toInt": {"$substr": ["$fecha_hora.hora_fin", 0, 2]}},
-                                                        60
-                                                    ]
-                                                },
-                                                {"$toInt": {"$substr": ["$fecha_hora.hora_fin", 3, 2]}}
-                                            ]
-                                        },
-                                        {
-                                            "$add": [
-                                                {
-                                                    "$multiply": [
-                                                        {"$toInt": {"$substr": ["$fecha_hora.hora_inicio", 0, 2]}},
-                                                        60
-                                                    ]
-                                                },
-                                                {"$toInt": {"$substr": ["$fecha_hora.hora_inicio", 3, 2]}}
-                                            ]
-                                        }
-                                    ]
-                                },
-                                60
-                            ]
-                        }
-                    }
-                },
+                {"$match": fechas},
+                {"$addFields": {"horas_trabajadas": self._horas_trabajadas(fechas)}},
                 {
                     "$project": {
                         "horas_trabajadas": 1,
@@ -335,6 +331,7 @@ class WorkerRepository:
         # Asignar contraseña si no la tiene y se provee
         if contrasena and not worker.get("contraseña"):
             collection.update_one({"CI": ci}, {"$set": {"contraseña": contrasena}})
+            invalidar_cache_brigadas()
         # Si se pasan integrantes, crear/actualizar brigada
         if integrantes is not None:
             brigada_repo = BrigadaRepository()
@@ -357,16 +354,17 @@ class WorkerRepository:
         # Verificar si el trabajador ya existe
         worker = collection.find_one({"CI": ci})
         if not worker:
-            data = {"CI": ci, "nombre": nombre}
+            data = {"CI": ci, "nombre": nombre, **search_keys.search_keys(self.collection_name, {"nombre": nombre})}
             if contrasena:
                 data["contraseña"] = contrasena
             result = collection.insert_one(data)
         else:
             # Si ya existe, actualizar nombre y contraseña si se proveen
-            update_data = {"nombre": nombre}
+            update_data = {"nombre": nombre, **search_keys.search_keys(self.collection_name, {"nombre": nombre})}
             if contrasena:
                 update_data["contraseña"] = contrasena
             collection.update_one({"CI": ci}, {"$set": update_data})
+            invalidar_cache_brigadas()
         # Si se pasan integrantes, crear la brigada
         if integrantes is not None:
             brigada_repo = BrigadaRepository()
@@ -385,6 +383,7 @@ class WorkerRepository:
         try:
             collection = get_collection(self.collection_name)
             result = collection.delete_one({"CI": ci})
+            invalidar_cache_brigadas()
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"❌ Error eliminando trabajador con CI {ci}: {e}")
@@ -396,11 +395,12 @@ class WorkerRepository:
         """
         try:
             collection = get_collection(self.collection_name)
-            update_data = {"nombre": nombre}
+            update_data = {"nombre": nombre, **search_keys.search_keys(self.collection_name, {"nombre": nombre})}
             if nuevo_ci:
                 update_data["CI"] = nuevo_ci
             
             result = collection.update_one({"CI": ci}, {"$set": update_data})
+            invalidar_cache_brigadas()
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"❌ Error actualizando datos del trabajador con CI {ci}: {e}")
@@ -1,11 +1,21 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
+from fastapi.datastructures import Default
 from fastapi.exceptions import RequestValidationError
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from starlette.middleware.cors import CORSMiddleware
 from starlette.responses import JSONResponse
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
 
 from presentation.middleware.auth_middleware import AuthMiddleware
+from presentation.middleware.compression_middleware import CompressionMiddleware
+from presentation.middleware.etag_middleware import ETagMiddleware
+from presentation.middleware.timing_middleware import TimingMiddleware
+from presentation.openapi_schema import install_openapi
+from presentation.responses import ORJSONResponse
+from infrastucture.observability.logging_config import configure_logging
 
 from presentation.routers.auth_router import router as auth_router
 from presentation.routers.trabajadores_router import router as trabajadores_router
@@ -22,62 +32,54 @@ from presentation.routers.contactos_router import router as contactos_router
 from presentation.routers.chat_router import router as chat_router
 from presentation.routers.ofertas_router import router as ofertas_router
 from presentation.routers.leads_router import router as leads_router
+from presentation.routers.metrics_router import router as metrics_router
 
 from dotenv import load_dotenv
 from presentation.handlers.validation_exception_handler import validation_exception_handler
+from infrastucture.dependencies import email_outbox_service, reportes_view_materializada, session_token_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Worker persistente de la outbox de correos (no aplica en Vercel, donde se
+    # vacía con BackgroundTasks tras cada cotización)
+    workers = []
+    if os.getenv("EMAIL_OUTBOX_WORKER", "false").lower() == "true":
+        workers.append(asyncio.create_task(email_outbox_service.run_forever()))
+    # Refresco periódico de la copia materializada de reportes_view (en Vercel la
+    # refresca la BackgroundTask de cada reporte guardado)
+    if os.getenv("REPORTES_VIEW_WORKER", "false").lower() == "true":
+        workers.append(asyncio.create_task(reportes_view_materializada.run_forever()))
+    yield
+    for worker in workers:
+        worker.cancel()
+
 
 app = FastAPI(
     title="SunCar Backend",
     description="API con arquitectura limpia de la empresa SunCar",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
+    # orjson para las rutas sin response_model tipado. Como Default(...), las rutas con
+    # response_model mantienen la serialización directa de pydantic-core de FastAPI
+    default_response_class=Default(ORJSONResponse)
 )
 
-# Esquema de seguridad para Swagger UI
-security = HTTPBearer()
-
-# Configurar autenticación global para Swagger
-app.openapi_schema = None
-
-def get_openapi():
-    if app.openapi_schema:
-        return app.openapi_schema
-    
-    from fastapi.openapi.utils import get_openapi
-    openapi_schema = get_openapi(
-        title="SunCar Backend",
-        version="1.0.0",
-        description="API con arquitectura limpia de la empresa SunCar",
-        routes=app.routes,
-    )
-    
-    # Agregar esquema de seguridad Bearer Token
-    openapi_schema["components"]["securitySchemes"] = {
-        "BearerAuth": {
-            "type": "http",
-            "scheme": "bearer",
-            "bearerFormat": "string"
-        }
-    }
-    
-    # Aplicar seguridad global a todos los endpoints excepto los excluidos
-    excluded_paths = ["/api/auth/login", "/api/auth/login-token"]
-    for path, methods in openapi_schema["paths"].items():
-        if path not in excluded_paths:
-            for method, operation in methods.items():
-                if method != "parameters":
-                    operation.setdefault("security", [{"BearerAuth": []}])
-    
-    app.openapi_schema = openapi_schema
-    return app.openapi_schema
-
-app.openapi = get_openapi
+# Esquema OpenAPI precompilado (openapi.json) con seguridad Bearer para Swagger UI
+install_openapi(app)
 
 # Cargar variables de entorno del archivo .env
 load_dotenv()
 
+# Niveles por módulo, muestreo de rutas calientes y formato (LOG_LEVEL, LOG_LEVELS, ...)
+configure_logging()
+
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 
-app.add_middleware(AuthMiddleware)
+# El más interno: ETag sobre el body final de los endpoints de catálogo
+app.add_middleware(ETagMiddleware)
+
+app.add_middleware(AuthMiddleware, token_service=session_token_service)
 
 app.add_middleware(
     CORSMiddleware,
@@ -85,7 +87,14 @@ app.add_middleware(
     allow_credentials=True,  # Permite el envío de credenciales
     allow_methods=["*"],  # Permite todos los métodos HTTP
     allow_headers=["*"],  # Permite todos los encabezados
+    expose_headers=["Server-Timing", "ETag"],
 )
+
+# gzip/brotli de respuestas grandes (reutiliza el body comprimido por ETag)
+app.add_middleware(CompressionMiddleware)
+
+# El más externo: mide el request completo (Server-Timing e histogramas por ruta)
+app.add_middleware(TimingMiddleware)
 # Incluir los routers organizados por features
 app.include_router(
     auth_router,
@@ -177,6 +186,11 @@ app.include_router(
     tags=["Leads"]
 )
 
+app.include_router(
+    metrics_router,
+    tags=["Métricas"]
+)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -1,47 +1,106 @@
+import hmac
 import os
-from fastapi import Request, HTTPException, status
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-
-AUTH_TOKEN = os.getenv("AUTH_TOKEN")
-
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Rutas excluidas de autenticación
-        excluded_paths = [
-            "/docs",
-            "/redoc", 
-            "/openapi.json",
-            "/api/auth/login",
-            "/api/auth/login-token",
-            "/",
-            "/favicon.ico"
-        ]
-        
-        # Verificar si la ruta está excluida
-        if request.url.path in excluded_paths:
-            return await call_next(request)
-        
-        # Verificar que el token esté configurado
-        if not AUTH_TOKEN:
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from application.services.session_token_service import SessionTokenService, SessionTokenError
+
+# Rutas excluidas de autenticación (coincidencia exacta)
+PUBLIC_PATHS = frozenset({
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+    "/api/auth/login",
+    "/api/auth/login-token",
+    "/api/auth/refresh",
+    "/",
+    "/favicon.ico"
+})
+
+
+class AuthMiddleware:
+    """
+    Middleware ASGI puro que exige el header `Authorization: Bearer <token>`, donde el
+    token es el AUTH_TOKEN global o un token de sesión firmado de un jefe de brigada.
+
+    Los tokens de sesión se verifican solo con su firma (sin consultar MongoDB) y sus
+    claims quedan disponibles en `request.state.sesion`.
+
+    A diferencia de BaseHTTPMiddleware no envuelve el request en una tarea ni el body
+    de la respuesta en otro stream, así que no añade coste por request ni rompe las
+    respuestas en streaming (/api/chat/stream).
+    """
+
+    def __init__(self, app: ASGIApp, auth_token: Optional[str] = None,
+                 token_service: Optional[SessionTokenService] = None):
+        self.app = app
+        token = auth_token if auth_token is not None else os.getenv("AUTH_TOKEN")
+        self._expected = f"Bearer {token}".encode("latin-1") if token else None
+        self.token_service = token_service
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in PUBLIC_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        error = self._check(scope)
+        if error is not None:
+            await error(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    def _check(self, scope: Scope) -> Optional[JSONResponse]:
+        # Verificar que haya algún tipo de token configurado
+        sesiones = self.token_service is not None and self.token_service.enabled
+        if self._expected is None and not sesiones:
             return JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={"detail": "Token de autorización no configurado en el servidor"}
             )
-        
+
         # Verificar token en header Authorization
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
+        auth_header = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                auth_header = value
+                break
+        if not auth_header or not auth_header.startswith(b"Bearer "):
             return JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 content={"detail": "Token de autorización requerido"}
             )
-        
-        token = auth_header.replace("Bearer ", "")
-        if token != AUTH_TOKEN:
-            return JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={"detail": "Token inválido"}
-            )
-        
-        return await call_next(request)
\ No newline at end of file
+
+        # Comparación en tiempo constante para no filtrar el token por timing
+        if self._expected is not None and hmac.compare_digest(auth_header, self._expected):
+            return None
+
+        if sesiones:
+            try:
+                claims = self.token_service.verificar(auth_header[7:].decode("latin-1"))
+            except SessionTokenError as e:
+                return JSONResponse(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    content={"detail": str(e)}
+                )
+            scope.setdefault("state", {})["sesion"] = claims
+            return None
+
+        return JSONResponse(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            content={"detail": "Token inválido"}
+        )
+
+
+def get_sesion(request: Request) -> dict:
+    """
+    Dependencia para endpoints de jefes de brigada: retorna los claims del token de sesión
+    verificado por el middleware (`sub` = CI del líder, `brigada_id`), sin consultar MongoDB.
+    """
+    sesion = getattr(request.state, "sesion", None)
+    if sesion is None:
+        raise HTTPException(status_code=401, detail="Se requiere un token de sesión de jefe de brigada")
+    return sesion
@@ -0,0 +1,172 @@
+import gzip
+import os
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastucture.observability.metrics_registry import MetricFamily, metrics_registry
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se ofrece gzip
+    brotli = None
+
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_CACHE_ENTRIES = int(os.getenv("COMPRESSION_CACHE_ENTRIES", "32"))
+
+# Rutas que nunca se comprimen (coincidencia exacta). Las respuestas text/event-stream y
+# las que se envían en varios trozos tampoco se comprimen, estén o no aquí
+NO_COMPRESSION_PATHS = frozenset({
+    "/api/chat/stream",
+})
+
+_COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+
+_stats = {"bytes_in": 0, "bytes_out": 0, "cache_hits": 0, "cache_misses": 0}
+
+metrics_registry.register("http_compression", lambda: [
+    MetricFamily("suncar_http_compression_bytes_total", "counter", "Bytes de respuestas comprimidas antes y después de comprimir")
+    .add(_stats["bytes_in"], {"stage": "original"})
+    .add(_stats["bytes_out"], {"stage": "compressed"}),
+    MetricFamily("suncar_http_compression_cache_total", "counter", "Bodies comprimidos reutilizados por ETag")
+    .add(_stats["cache_hits"], {"result": "hit"})
+    .add(_stats["cache_misses"], {"result": "miss"}),
+])
+
+
+def _accepted_encoding(scope: Scope) -> Optional[str]:
+    """
+    Codificación a usar según Accept-Encoding: br si está disponible, si no gzip.
+    """
+    accept = ""
+    for name, value in scope["headers"]:
+        if name == b"accept-encoding":
+            accept = value.decode("latin-1").lower()
+    accepted = set()
+    for part in accept.split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime con brotli o gzip (según Accept-Encoding) las respuestas
+    de texto/JSON de al menos `minimum_size` bytes.
+
+    Solo se comprimen las respuestas que llegan en un único mensaje (Response,
+    JSONResponse, ORJSONResponse): en cuanto llega un trozo con more_body se envía tal
+    cual, así que StreamingResponse y SSE no se almacenan en memoria. Las rutas de
+    NO_COMPRESSION_PATHS y las respuestas text/event-stream se dejan pasar sin esperar
+    al primer trozo.
+
+    Si la respuesta trae ETag (ETagMiddleware, endpoints de catálogo), el body
+    comprimido se guarda por (ETag, codificación) y se reutiliza mientras el catálogo no
+    cambie, sin volver a comprimir.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_BYTES,
+                 gzip_level: int = COMPRESSION_GZIP_LEVEL, brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+                 excluded_paths: frozenset = NO_COMPRESSION_PATHS, cache_entries: int = COMPRESSION_CACHE_ENTRIES):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.excluded_paths = excluded_paths
+        self.cache_entries = cache_entries
+        self._cache: "OrderedDict[Tuple[bytes, str], bytes]" = OrderedDict()
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def _compress_cached(self, body: bytes, encoding: str, etag: Optional[bytes]) -> bytes:
+        if etag is None or self.cache_entries <= 0:
+            return self.compress(body, encoding)
+        key = (etag, encoding)
+        compressed = self._cache.get(key)
+        if compressed is not None:
+            _stats["cache_hits"] += 1
+            self._cache.move_to_end(key)
+            return compressed
+        _stats["cache_misses"] += 1
+        compressed = self.compress(body, encoding)
+        self._cache[key] = compressed
+        if len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+        return compressed
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+        encoding = _accepted_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", []))
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                if (
+                    b"content-encoding" in headers
+                    or message["status"] in (204, 304)
+                    or message["status"] < 200
+                    or content_type.startswith("text/event-stream")
+                    or not content_type.startswith(_COMPRESSIBLE_TYPES)
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streaming (no se almacena) o demasiado pequeño para que compense
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            etag = None
+            headers = []
+            for name, value in start_message.get("headers", []):
+                if name == b"etag":
+                    etag = value
+                if name == b"vary" and b"accept-encoding" not in value.lower():
+                    headers.append((name, value + b", Accept-Encoding"))
+                elif name != b"content-length":
+                    headers.append((name, value))
+            if not any(name == b"vary" for name, _ in headers):
+                headers.append((b"vary", b"Accept-Encoding"))
+
+            compressed = self._compress_cached(body, encoding, etag)
+            _stats["bytes_in"] += len(body)
+            _stats["bytes_out"] += len(compressed)
+            headers += [(b"content-encoding", encoding.encode("latin-1")),
+                        (b"content-length", str(len(compressed)).encode("latin-1"))]
+            start_message["headers"] = headers
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
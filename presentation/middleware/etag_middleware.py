@@ -0,0 +1,96 @@
+import hashlib
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastucture.observability.metrics_registry import MetricFamily, metrics_registry
+
+# Endpoints de catálogo con ETag (coincidencia exacta): cambian poco y son los payloads
+# más grandes que descarga la app en cada apertura
+ETAG_PATHS = frozenset({
+    "/api/productos/",
+    "/api/productos/categorias",
+    "/api/ofertas/",
+    "/api/ofertas/simplified",
+})
+
+_etag_stats = {"etag": 0, "not_modified": 0}
+
+metrics_registry.register("http_etag", lambda: [
+    MetricFamily("suncar_http_etag_responses_total", "counter", "Respuestas de catálogo con ETag por resultado")
+    .add(_etag_stats["etag"], {"result": "full"})
+    .add(_etag_stats["not_modified"], {"result": "not_modified"})
+])
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # Comparación débil (RFC 9110): se ignora el prefijo W/
+    tag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or (candidate[2:] if candidate.startswith("W/") else candidate) == tag:
+            return True
+    return False
+
+
+class ETagMiddleware:
+    """
+    Middleware ASGI que añade un ETag débil (hash del body) a los GET de ETAG_PATHS y
+    responde 304 sin body si coincide con If-None-Match. El body se genera igual (la
+    consulta no se evita), pero no viaja por la red; CompressionMiddleware usa el mismo
+    ETag para reutilizar el body ya comprimido.
+
+    Es débil porque la misma representación puede enviarse con distintas codificaciones
+    (gzip, br, sin comprimir).
+    """
+
+    def __init__(self, app: ASGIApp, paths: frozenset = ETAG_PATHS):
+        self.app = app
+        self.paths = paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = None
+        for name, value in scope["headers"]:
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+        start_message = None
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    await send(message)
+                else:
+                    start_message = message
+                return
+            if start_message is None:
+                await send(message)
+                return
+            if message.get("more_body", False):
+                # Streaming: sin ETag
+                await send(start_message)
+                start_message = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            headers = [(k, v) for k, v in start_message.get("headers", []) if k not in (b"etag", b"cache-control")]
+            headers += [(b"etag", etag.encode("latin-1")), (b"cache-control", b"private, no-cache")]
+
+            if if_none_match and _matches(if_none_match, etag):
+                _etag_stats["not_modified"] += 1
+                headers = [(k, v) for k, v in headers if k not in (b"content-length", b"content-type")]
+                await send({"type": "http.response.start", "status": 304, "headers": headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            _etag_stats["etag"] += 1
+            start_message["headers"] = headers
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
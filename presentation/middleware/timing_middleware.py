@@ -0,0 +1,65 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastucture.observability import request_timing
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Plantilla de la ruta atendida (/api/reportes/{reporte_id}), para no crear una serie
+    por cada id. Es el path completo de la ruta montada: las versiones de FastAPI que
+    incluyen los routers de forma diferida dejan en scope["route"] la ruta original
+    (relativa al router) y el path montado en el contexto de la ruta efectiva; las
+    anteriores copian la ruta con el prefijo y scope["route"] ya lo trae.
+    Todo lo que no llega a una ruta (404, 401 del AuthMiddleware antes del routing,
+    /docs...) va a una sola serie "unmatched": el path crudo lo elige el cliente y
+    crearía series sin límite.
+    """
+    contexto = scope.get("fastapi", {}).get("effective_route_context")
+    template = getattr(contexto, "path", None) or getattr(scope.get("route"), "path_format", None)
+    return template if template else "unmatched"
+
+
+class TimingMiddleware:
+    """
+    Middleware ASGI que abre el contexto de tiempos de cada request, añade el header
+    `Server-Timing` (db, validate, storage, llm, total) y alimenta los histogramas de
+    latencia por ruta.
+
+    En respuestas en streaming el header se envía con lo medido hasta el primer byte;
+    el histograma registra la duración completa.
+    """
+
+    def __init__(self, app: ASGIApp, histograms: request_timing.RouteLatencyHistograms = None):
+        self.app = app
+        self.histograms = histograms if histograms is not None else request_timing.route_histograms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        token = request_timing.start_request()
+        timings = request_timing.current()
+        status_code = 500
+        self.histograms.in_flight += 1
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total_ms = (time.perf_counter() - start) * 1000
+                header = request_timing.server_timing_header(timings, total_ms).encode("latin-1")
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            self.histograms.in_flight -= 1
+            request_timing.end_request(token)
+            self.histograms.observe(
+                scope["method"], route_template(scope), status_code, (time.perf_counter() - start) * 1000, timings
+            )
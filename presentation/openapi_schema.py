@@ -0,0 +1,117 @@
+"""
+Esquema OpenAPI precompilado.
+
+Generar el esquema recorre todas las rutas y modelos, y en Vercel eso pasaba en el
+primer /docs u /openapi.json de cada instancia fría. Ahora el esquema se genera en
+build y se guarda en openapi.json (en la raíz del repo); en runtime se sirve ese
+archivo cargado en memoria.
+
+    python -m presentation.openapi_schema --write   # regenerar el artefacto
+    python -m presentation.openapi_schema --check   # falla si el artefacto no coincide con las rutas
+
+Con OPENAPI_DYNAMIC=true (o si falta el archivo) se genera en caliente como antes.
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Optional
+
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+
+from presentation.middleware.auth_middleware import PUBLIC_PATHS
+
+OPENAPI_ARTIFACT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "openapi.json")
+
+
+def build_openapi_schema(app: FastAPI) -> dict:
+    """
+    Genera el esquema a partir de las rutas de la app, con seguridad Bearer global
+    en todos los endpoints excepto los públicos.
+    """
+    openapi_schema = get_openapi(
+        title="SunCar Backend",
+        version="1.0.0",
+        description="API con arquitectura limpia de la empresa SunCar",
+        routes=app.routes,
+    )
+
+    # Agregar esquema de seguridad Bearer Token
+    openapi_schema.setdefault("components", {})["securitySchemes"] = {
+        "BearerAuth": {
+            "type": "http",
+            "scheme": "bearer",
+            "bearerFormat": "string"
+        }
+    }
+
+    # Aplicar seguridad global a todos los endpoints excepto los excluidos
+    for path, methods in openapi_schema["paths"].items():
+        if path not in PUBLIC_PATHS:
+            for method, operation in methods.items():
+                if method != "parameters":
+                    operation.setdefault("security", [{"BearerAuth": []}])
+
+    return openapi_schema
+
+
+def serialize_openapi_schema(schema: dict) -> str:
+    # Salida determinista para que el artefacto solo cambie cuando cambian las rutas
+    return json.dumps(schema, indent=2, ensure_ascii=False, sort_keys=True) + "\n"
+
+
+def load_openapi_artifact() -> Optional[dict]:
+    if not os.path.exists(OPENAPI_ARTIFACT):
+        return None
+    with open(OPENAPI_ARTIFACT, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def install_openapi(app: FastAPI) -> None:
+    """
+    Reemplaza app.openapi para servir el artefacto precompilado (cargado una sola vez
+    al primer acceso) o, en modo dinámico, el esquema generado y cacheado.
+    """
+    dynamic = os.getenv("OPENAPI_DYNAMIC", "false").lower() == "true"
+
+    def openapi() -> dict:
+        if app.openapi_schema:
+            return app.openapi_schema
+        schema = None if dynamic else load_openapi_artifact()
+        app.openapi_schema = schema if schema is not None else build_openapi_schema(app)
+        return app.openapi_schema
+
+    app.openapi = openapi
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--write", action="store_true", help="Regenerar openapi.json")
+    group.add_argument("--check", action="store_true", help="Fallar si openapi.json no está al día")
+    args = parser.parse_args()
+
+    from main import app
+
+    expected = serialize_openapi_schema(build_openapi_schema(app))
+
+    if args.write:
+        with open(OPENAPI_ARTIFACT, "w", encoding="utf-8") as f:
+            f.write(expected)
+        print(f"✅ Esquema OpenAPI escrito en {OPENAPI_ARTIFACT}")
+        return
+
+    current = None
+    if os.path.exists(OPENAPI_ARTIFACT):
+        with open(OPENAPI_ARTIFACT, encoding="utf-8") as f:
+            current = f.read()
+    if current != expected:
+        print("❌ openapi.json no coincide con las rutas; regenéralo con "
+              "'python -m presentation.openapi_schema --write'", file=sys.stderr)
+        sys.exit(1)
+    print("✅ openapi.json está al día")
+
+
+if __name__ == "__main__":
+    main()
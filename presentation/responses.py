@@ -0,0 +1,50 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+
+def _default(value: Any) -> Any:
+    """
+    Tipos que orjson no conoce. datetime, date, UUID y dataclasses los serializa él.
+    """
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        value = value.to_decimal()
+    if isinstance(value, Decimal):
+        # Igual que jsonable_encoder: entero si no tiene parte decimal, si no float
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Tipo no serializable a JSON: {type(value).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse serializada con orjson, con soporte de ObjectId, Decimal/Decimal128 y
+    datetime, para devolver documentos de MongoDB tal cual salen del driver (sin
+    convertir `_id` a str en un bucle de Python).
+
+    Es la clase por defecto de la app (main.py). En rutas con un response_model tipado
+    FastAPI sigue serializando con pydantic-core (su camino rápido), así que orjson se
+    usa en las rutas que devuelven dicts y en las que devuelven esta clase directamente.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def trusted_json_response(**payload: Any) -> ORJSONResponse:
+    """
+    Respuesta de un listado en modo de confianza (hydration.trusted_documents), sin pasar
+    por el response_model del endpoint, que se mantiene solo para documentar el esquema
+    en OpenAPI.
+    """
+    return ORJSONResponse(payload)
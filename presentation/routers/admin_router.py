@@ -1,11 +1,33 @@
-from typing import List
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from starlette.responses import Response
+from domain.entities.contacto import Contacto
 from domain.entities.form import Form
+from domain.entities.lead import Lead
+from domain.entities.oferta import Oferta
+from domain.entities.producto import CatalogoProductos
+from domain.entities.trabajador import Trabajador
 from domain.entities.update import AppVersionConfig
 from application.services.form_service import FormService
-from infrastucture.dependencies import get_form_service, get_update_repository
+from infrastucture.dependencies import get_form_service, get_update_repository, get_gemini_provider, get_email_outbox_service, \
+    get_reportes_view_materializada
 from infrastucture.repositories.update_repository import UpdateRepository
+from infrastucture.external_services.gemini_provider import GeminiProvider
+from application.services.email_outbox_service import EmailOutboxService
+from infrastucture.observability.request_timing import route_histograms
+from infrastucture.observability.mongo_monitoring import slow_query_listener
+from infrastucture.observability import profiler
+from infrastucture.database.mongo_db.connection import get_collection
+from infrastucture.repositories.hydration import audit_collection
+from infrastucture.repositories import fechas_reportes, search_keys
+from infrastucture.repositories.reportes_view_materializada import ReportesViewMaterializada
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -90,3 +112,206 @@ async def delete_app_version(
         return {"message": f"Configuración para {platform} eliminada exitosamente"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# ====================== METRICS ENDPOINTS ======================
+
+@router.get("/metrics/llm", response_model=dict)
+async def get_llm_metrics(
+    gemini_provider: GeminiProvider = Depends(get_gemini_provider)
+):
+    """
+    Obtiene las métricas del proveedor LLM: estado del circuit breaker y, por operación y modelo,
+    tokens de entrada/salida, latencia total, tiempo al primer token, reintentos y aciertos de caché.
+    Incluye la muestra de prompts lentos si GEMINI_SLOW_PROMPT_SAMPLE_RATE > 0.
+    """
+    return gemini_provider.get_stats()
+
+
+@router.get("/metrics/http", response_model=dict)
+async def get_http_metrics():
+    """
+    Obtiene los histogramas de latencia por ruta (buckets en ms, acumulados) y la suma del
+    desglose por categoría (db, validate, storage, llm) que también se envía en Server-Timing.
+    """
+    return route_histograms.snapshot()
+
+
+@router.get("/metrics/mongo", response_model=dict)
+async def get_mongo_metrics(
+    limit: Optional[int] = Query(None, ge=1, description="Máximo de consultas lentas a devolver")
+):
+    """
+    Obtiene la telemetría de MongoDB: por namespace y comando, número de llamadas, errores,
+    consultas lentas, latencia media/máxima y documentos devueltos; y el buffer de consultas
+    que superaron MONGO_SLOW_QUERY_MS (de la más lenta a la más rápida) con la forma del filtro,
+    útil para detectar búsquedas $regex sin índice.
+    """
+    return slow_query_listener.snapshot(limit)
+
+
+# ====================== PROFILING ENDPOINTS ======================
+
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "30"))
+
+
+@router.get("/profile", response_class=Response)
+async def run_profiler(
+    seconds: float = Query(10, gt=0, description="Duración del muestreo en segundos"),
+    format: str = Query("speedscope", pattern="^(speedscope|collapsed)$", description="speedscope o collapsed"),
+    interval_ms: float = Query(5, ge=1, le=100, description="Intervalo entre muestras en ms"),
+    include_idle: bool = Query(False, description="Incluir hilos esperando trabajo (select, colas)")
+):
+    """
+    Perfila el proceso durante `seconds` segundos muestreando las pilas del event loop y
+    de los hilos del threadpool, y devuelve un archivo para speedscope (JSON) o en formato
+    collapsed stack (para flamegraph.pl). Los requests que lleguen mientras tanto son los
+    que quedan perfilados. Máximo PROFILER_MAX_SECONDS; una sola sesión a la vez (409 si no).
+    """
+    if seconds > PROFILER_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds no puede superar {PROFILER_MAX_SECONDS:g}")
+    try:
+        content, media_type = await asyncio.to_thread(
+            profiler.profile, seconds, interval_ms / 1000, include_idle, format
+        )
+    except profiler.ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    extension = "speedscope.json" if format == "speedscope" else "collapsed.txt"
+    filename = f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{extension}"
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/metrics/email-outbox", response_model=dict)
+async def get_email_outbox_metrics(
+    email_outbox_service: EmailOutboxService = Depends(get_email_outbox_service)
+):
+    """
+    Obtiene la profundidad de la outbox de correos por estado y la antigüedad del pendiente más viejo
+    """
+    try:
+        return email_outbox_service.get_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/email-outbox/procesar", response_model=dict)
+async def process_email_outbox(
+    email_outbox_service: EmailOutboxService = Depends(get_email_outbox_service)
+):
+    """
+    Fuerza el envío de los correos pendientes de la outbox (útil en despliegues sin worker persistente)
+    """
+    try:
+        sent = await email_outbox_service.process_pending()
+        return {"enviados": sent}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# ====================== AUDIT ENDPOINTS ======================
+
+def _preparar_trabajador(doc: dict) -> dict:
+    doc["tiene_contraseña"] = bool(doc.pop("contraseña", None))
+    return doc
+
+
+def _preparar_producto(doc: dict) -> dict:
+    for material in doc.get("materiales", []):
+        if "codigo" in material:
+            material["codigo"] = str(material["codigo"])
+    return doc
+
+
+# Colecciones que los listados leen en modo de confianza: (modelo, preparación previa)
+AUDITABLE_COLLECTIONS = {
+    "trabajadores": (Trabajador, _preparar_trabajador),
+    "productos": (CatalogoProductos, _preparar_producto),
+    "ofertas": (Oferta, None),
+    "leads": (Lead, None),
+    "contactos": (Contacto, None),
+}
+
+
+@router.get("/auditoria/{coleccion}", response_model=dict)
+async def audit_collection_schema(
+    coleccion: str,
+    limit: int = Query(100, ge=1, le=1000, description="Máximo de documentos inválidos a detallar")
+):
+    """
+    Valida todos los documentos de una colección contra su modelo. Los listados de esas
+    colecciones no revalidan al leer (TRUSTED_READS), así que esta es la forma de detectar
+    documentos que no cumplen el esquema, p. ej. tras una migración. Devuelve el total
+    revisado, el número de inválidos y, de los primeros `limit`, el campo y tipo de cada error.
+    """
+    if coleccion not in AUDITABLE_COLLECTIONS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Colección no auditable. Opciones: {', '.join(AUDITABLE_COLLECTIONS)}"
+        )
+    model, prepare = AUDITABLE_COLLECTIONS[coleccion]
+    try:
+        resultado = await asyncio.to_thread(audit_collection, get_collection(coleccion), model, prepare, limit)
+        return {"coleccion": coleccion, **resultado}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/busqueda/reindexar/{coleccion}", response_model=dict)
+async def reindex_search_keys(coleccion: str):
+    """
+    Recalcula las claves de búsqueda (nombre, dirección, teléfono sin tildes ni
+    mayúsculas) de todos los documentos de una colección. Los documentos sin claves se
+    completan solos la primera vez que se busca; esto hace falta si se escribieron
+    nombres por fuera de la API o si cambia la normalización.
+    """
+    if coleccion not in search_keys.SEARCH_FIELDS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Colección sin claves de búsqueda. Opciones: {', '.join(search_keys.SEARCH_FIELDS)}"
+        )
+    try:
+        actualizados = await asyncio.to_thread(search_keys.reindex, get_collection(coleccion), coleccion)
+        return {"coleccion": coleccion, "actualizados": actualizados}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/migraciones/fechas-reportes", response_model=dict)
+async def migrate_report_dates():
+    """
+    Completa en los reportes existentes las fechas nativas (fecha_hora.inicio y fin como
+    datetime, y duracion_minutos) a partir de los strings de fecha y hora, y crea los
+    índices por rango de fechas. Idempotente: solo toca los reportes que no las tienen.
+    Cuando no queda ninguno (`completa`), los filtros por fecha y las horas trabajadas
+    pasan a usar los campos nativos.
+    """
+    try:
+        collection = get_collection("reportes")
+        fechas_reportes.ensure_indexes(collection, logger)
+        return await asyncio.to_thread(fechas_reportes.migrar, collection)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/reportes-view/refrescar", response_model=dict)
+async def refresh_reportes_view(
+    completo: bool = Query(False, description="Recalcular toda la copia en vez de solo los reportes cambiados"),
+    reportes_view: ReportesViewMaterializada = Depends(get_reportes_view_materializada)
+):
+    """
+    Refresca la copia materializada de reportes_view que lee /api/reportes/view. El
+    incremental lleva los reportes guardados o migrados desde el último refresco; el
+    completo rehace la colección (necesario si se borraron reportes o cambiaron datos de
+    otras colecciones que use la vista). El primer refresco siempre es completo.
+    """
+    try:
+        return await asyncio.to_thread(reportes_view.refrescar, completo)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,10 +1,12 @@
 import os
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 
 from application.services.auth_service import AuthService
+from application.services.session_token_service import SessionTokenService, SessionTokenError
 from application.services.worker_service import WorkerService
-from infrastucture.dependencies import get_auth_service, get_worker_service
+from infrastucture.dependencies import get_auth_service, get_worker_service, get_session_token_service
+from presentation.middleware.auth_middleware import get_sesion
 from presentation.schemas.responses import LoginResponse, ChangePasswordResponse
 
 router = APIRouter()
@@ -31,23 +33,39 @@ class TokenResponse(BaseModel):
     token: str = None
 
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class RefreshResponse(BaseModel):
+    success: bool
+    message: str
+    token: str = None
+    refresh_token: str = None
+    expires_in: int = None
+
+
 @router.post("/login", response_model=LoginResponse)
 async def login_trabajador(
         login_data: LoginRequest,
-        auth_service: AuthService = Depends(get_auth_service)
+        auth_service: AuthService = Depends(get_auth_service),
+        token_service: SessionTokenService = Depends(get_session_token_service)
 ):
     """
     Endpoint para autenticar un trabajador usando CI y contraseña.
-    Si la autenticación es exitosa, retorna la brigada de la cual es líder.
+    Si la autenticación es exitosa, retorna la brigada de la cual es líder y un token
+    de sesión firmado (más su refresh token) para no repetir el login en cada request.
     """
     try:
         brigada = await auth_service.login_trabajador(login_data.ci, login_data.contraseña)
         
         if brigada is not None:
+            tokens = token_service.emitir(login_data.ci, brigada.id, login_data.contraseña) or {}
             return LoginResponse(
                 success=True,
                 message="Autenticación exitosa",
-                brigada=brigada
+                brigada=brigada,
+                **tokens
             )
         else:
             return LoginResponse(
@@ -120,12 +138,51 @@ async def login_token(credentials: TokenLoginRequest):
         )
 
 
+@router.post("/refresh", response_model=RefreshResponse)
+async def refresh_token(
+    data: RefreshRequest,
+    auth_service: AuthService = Depends(get_auth_service)
+):
+    """
+    Emite un token de sesión nuevo y rota el refresh token, que no se puede volver a usar.
+    Comprueba que el trabajador sigue con la misma contraseña y liderando la misma
+    brigada; la sesión no se extiende más allá de SESSION_MAX_AGE_SECONDS desde el login.
+    """
+    try:
+        tokens = auth_service.refrescar_sesion(data.refresh_token)
+        return RefreshResponse(success=True, message="Token renovado", **tokens)
+    except SessionTokenError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/sesion")
+async def sesion_actual(sesion: dict = Depends(get_sesion)):
+    """
+    Retorna los datos de la sesión del jefe de brigada tomados del token, sin consultar MongoDB.
+    """
+    return {
+        "success": True,
+        "ci": sesion["sub"],
+        "brigada_id": sesion.get("brigada_id"),
+        "expira": sesion["exp"]
+    }
+
+
 @router.get("/validate")
-async def validate_token():
+async def validate_token(request: Request):
     """
     Endpoint para validar el token de autorización.
     Si el middleware permite llegar aquí, el token es válido.
+    Con un token de sesión de jefe de brigada no se devuelve el AUTH_TOKEN global.
     """
+    if getattr(request.state, "sesion", None) is not None:
+        return {
+            "success": True,
+            "message": "Token válido",
+            "token": None
+        }
     return {
         "success": True,
         "message": "Token válido",
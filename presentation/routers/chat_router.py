@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Annotated, AsyncGenerator
 import json
@@ -7,6 +8,7 @@ from fastapi.responses import StreamingResponse
 
 from application.services.chat_service import ChatService
 from infrastucture.dependencies import get_chat_service
+from infrastucture.external_services.circuit_breaker import CircuitOpenError
 from presentation.schemas.requests.ChatRequest import ChatRequest
 from presentation.schemas.responses.chat_responses import ChatResponse
 
@@ -46,6 +48,14 @@ async def chat_with_llm(
             model_used=model_used
         )
         
+    except (CircuitOpenError, asyncio.TimeoutError) as e:
+        logger.warning(f"LLM no disponible en chat_with_llm: {e!r}")
+        return ChatResponse(
+            success=False,
+            message="El asistente no está disponible en este momento, intenta más tarde",
+            response="",
+            model_used=""
+        )
     except Exception as e:
         logger.error(f"Error en chat_with_llm: {e}", exc_info=True)
         return ChatResponse(
@@ -85,6 +95,9 @@ async def chat_streaming(
             # Enviar señal de finalización
             yield f"data: {json.dumps({'type': 'end'})}\n\n"
             
+        except (CircuitOpenError, asyncio.TimeoutError) as e:
+            logger.warning(f"LLM no disponible en chat_streaming: {e!r}")
+            yield f"data: {json.dumps({'type': 'error', 'message': 'El asistente no está disponible en este momento, intenta más tarde'})}\n\n"
         except Exception as e:
             logger.error(f"Error en chat_streaming: {e}", exc_info=True)
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
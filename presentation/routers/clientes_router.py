@@ -11,6 +11,7 @@ from presentation.schemas.requests.ClienteCreateRequest import ClienteCreateRequ
 from presentation.schemas.responses import ClienteCreateResponse, ClienteVerifyResponse, ClienteVerifyByIdentifierResponse
 from presentation.schemas.requests.ClienteUpdateRequest import ClienteUpdateRequest
 from presentation.schemas.requests.ClienteVerifyRequest import ClienteVerifyRequest
+from presentation.responses import ORJSONResponse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -39,14 +40,15 @@ def crear_cliente(
 @router.get("/", summary="Listar clientes", tags=["Clientes"], response_model=List[dict])
 def listar_clientes(
     numero: Optional[str] = Query(None, description="Número de cliente"),
-    nombre: Optional[str] = Query(None, description="Nombre del cliente (búsqueda parcial)"),
-    direccion: Optional[str] = Query(None, description="Dirección del cliente (búsqueda parcial)"),
+    nombre: Optional[str] = Query(None, description="Nombre del cliente (prefijos de palabra, sin distinguir mayúsculas ni tildes)"),
+    direccion: Optional[str] = Query(None, description="Dirección del cliente (prefijos de palabra, sin distinguir mayúsculas ni tildes)"),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Máximo de resultados (typeahead)"),
     client_service: ClientService = Depends(get_client_service)
 ):
     """Listar clientes con filtros opcionales."""
     try:
-        clientes = client_service.get_clientes(numero, nombre, direccion)
-        return clientes
+        clientes = client_service.get_clientes(numero, nombre, direccion, limit)
+        return ORJSONResponse(clientes)
     except Exception as e:
         logger.error(f"Error en listar_clientes: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
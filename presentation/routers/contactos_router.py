@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from application.services.contacto_service import ContactoService
 from infrastucture.dependencies import get_contacto_service
+from infrastucture.repositories import hydration
 from domain.entities.contacto import Contacto
 from presentation.schemas.requests.ContactoRequest import ContactoCreateRequest, ContactoUpdateRequest
 from presentation.schemas.responses.contactos_responses import (
@@ -14,6 +15,7 @@ from presentation.schemas.responses.contactos_responses import (
     ContactoListResponse,
     ContactoDeleteResponse
 )
+from presentation.responses import trusted_json_response
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -48,6 +50,11 @@ def listar_contactos(
     Obtener todos los contactos.
     """
     try:
+        if hydration.TRUSTED_READS:
+            contactos = contacto_service.get_all_contactos_trusted()
+            return trusted_json_response(
+                success=True, message=f"Se encontraron {len(contactos)} contactos", data=contactos
+            )
         contactos = contacto_service.get_all_contactos()
         return ContactoListResponse(
             success=True,
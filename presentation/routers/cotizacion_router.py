@@ -1,21 +1,25 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 
 from application.services.cotizacion_service import CotizacionService
+from application.services.email_outbox_service import EmailOutboxService
+from infrastucture.dependencies import get_cotizacion_service, get_email_outbox_service
 from presentation.schemas.requests.CotizacionRequest import CotizacionRequest
 
 router = APIRouter()
 
 
 @router.post("/cotizacion")
-async def crear_cotizacion(request: CotizacionRequest):
+async def crear_cotizacion(
+    request: CotizacionRequest,
+    background_tasks: BackgroundTasks,
+    cotizacion_service: CotizacionService = Depends(get_cotizacion_service),
+    email_outbox_service: EmailOutboxService = Depends(get_email_outbox_service)
+):
     """
     Endpoint para crear una nueva cotización.
-    Recibe un mensaje y lo muestra en consola.
+    Recibe un mensaje, lo encola para envío por correo y responde sin esperar al SMTP.
     """
     try:
-        # Crear instancia del service
-        cotizacion_service = CotizacionService()
-        
         # Procesar la cotización
         resultado = await cotizacion_service.procesar_cotizacion(
             request.mensaje, 
@@ -24,6 +28,8 @@ async def crear_cotizacion(request: CotizacionRequest):
         )
         
         if resultado["success"]:
+            # Intentar el envío justo después de responder
+            background_tasks.add_task(email_outbox_service.process_pending)
             return {
                 "success": True,
                 "message": resultado["message"],
@@ -33,4 +39,4 @@ async def crear_cotizacion(request: CotizacionRequest):
             raise HTTPException(status_code=500, detail=resultado["message"])
             
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error interno del servidor: {str(e)}") 
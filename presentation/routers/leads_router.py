@@ -6,12 +6,14 @@ from pydantic import BaseModel
 
 from application.services.leads_service import LeadsService
 from infrastucture.dependencies import get_leads_service
+from infrastucture.repositories import hydration
 from domain.entities.lead import Lead
 from presentation.schemas.requests.LeadCreateRequest import LeadCreateRequest, LeadUpdateRequest
 from presentation.schemas.responses.leads_responses import (
     LeadCreateResponse, LeadGetResponse, LeadListResponse,
     LeadUpdateResponse, LeadDeleteResponse
 )
+from presentation.responses import trusted_json_response
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -41,15 +43,19 @@ def crear_lead(
 
 @router.get("/", summary="Listar leads", tags=["Leads"], response_model=LeadListResponse)
 def listar_leads(
-    nombre: Optional[str] = Query(None, description="Nombre del lead (búsqueda parcial)"),
-    telefono: Optional[str] = Query(None, description="Teléfono del lead (búsqueda parcial)"),
+    nombre: Optional[str] = Query(None, description="Nombre del lead (prefijos de palabra, sin distinguir mayúsculas ni tildes)"),
+    telefono: Optional[str] = Query(None, description="Teléfono del lead (prefijo de los dígitos, con o sin código de país)"),
     estado: Optional[str] = Query(None, description="Estado del lead"),
     fuente: Optional[str] = Query(None, description="Fuente del lead"),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Máximo de resultados (typeahead)"),
     leads_service: LeadsService = Depends(get_leads_service)
 ):
     """Listar leads con filtros opcionales."""
     try:
-        leads = leads_service.get_leads(nombre, telefono, estado, fuente)
+        if hydration.TRUSTED_READS:
+            leads = leads_service.get_leads_trusted(nombre, telefono, estado, fuente, limit)
+            return trusted_json_response(success=True, message="Leads obtenidos exitosamente", data=leads)
+        leads = leads_service.get_leads(nombre, telefono, estado, fuente, limit)
         # Convertir los dicts a objetos Lead para la respuesta
         leads_objects = [Lead.model_validate(lead) for lead in leads]
         return LeadListResponse(
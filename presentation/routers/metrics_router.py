@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from starlette.responses import Response
+
+from infrastucture.observability.metrics_registry import PROMETHEUS_CONTENT_TYPE, metrics_registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=Response)
+async def get_metrics():
+    """
+    Métricas del proceso en formato de texto de Prometheus: requests e histogramas de
+    latencia por ruta, requests en curso, pool y comandos de MongoDB, subidas a MinIO,
+    llamadas a Gemini y circuit breaker, outbox de correos/SMTP y aciertos de las cachés.
+
+    Se arma con los contadores en memoria de cada subsistema, sin consultar la base de
+    datos, así que se puede scrapear cada 15 s. Requiere el Bearer token como el resto de la API.
+    """
+    return Response(content=metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -8,7 +8,9 @@ from application.services.oferta_service import OfertaService
 from application.services.chat_service import ChatService
 from domain.entities.oferta import Oferta, OfertaElemento
 from infrastucture.dependencies import get_oferta_service, get_chat_service
+from infrastucture.repositories import hydration
 from infrastucture.external_services.minio_uploader import upload_file_to_minio
+from presentation.responses import trusted_json_response
 from presentation.schemas.responses.ofertas_responses import (
     OfertasListResponse,
     OfertaGetResponse,
@@ -48,6 +50,9 @@ class RecomendacionResponse(BaseModel):
 @router.get("/simplified", response_model=OfertasSimplificadasListResponse)
 async def read_ofertas_simplificadas(oferta_service: OfertaService = Depends(get_oferta_service)):
     try:
+        if hydration.TRUSTED_READS:
+            data = await oferta_service.get_all_simplified_trusted()
+            return trusted_json_response(success=True, message="Ofertas simplificadas obtenidas", data=data)
         data = await oferta_service.get_all_simplified()
         return OfertasSimplificadasListResponse(success=True, message="Ofertas simplificadas obtenidas", data=data)
     except Exception as e:
@@ -57,6 +62,9 @@ async def read_ofertas_simplificadas(oferta_service: OfertaService = Depends(get
 @router.get("/", response_model=OfertasListResponse)
 async def read_ofertas(oferta_service: OfertaService = Depends(get_oferta_service)):
     try:
+        if hydration.TRUSTED_READS:
+            data = await oferta_service.get_all_trusted()
+            return trusted_json_response(success=True, message="Ofertas obtenidas", data=data)
         data = await oferta_service.get_all()
         return OfertasListResponse(success=True, message="Ofertas obtenidas", data=data)
     except Exception as e:
@@ -292,8 +300,9 @@ async def recomendar_ofertas(
     Recibe texto del usuario y retorna todas las ofertas ordenadas por recomendación.
     """
     try:
-        # 1. Obtener datos mínimos de todas las ofertas
-        datos_minimos = await oferta_service.obtener_datos_minimos()
+        # 1. Obtener el contexto pre-renderizado (cacheado por versión del catálogo)
+        contexto = await oferta_service.obtener_contexto_recomendador()
+        datos_minimos = contexto["ofertas"]
 
         if not datos_minimos:
             return RecomendacionResponse(
@@ -304,7 +313,8 @@ async def recomendar_ofertas(
         # 2. Llamar al chat service para obtener recomendaciones
         resultado_ia = await chat_service.recomendar_ofertas(
             texto_usuario=request.texto,
-            ofertas_contexto=datos_minimos
+            ofertas_contexto=datos_minimos,
+            contexto_renderizado=contexto["contexto"]
         )
 
         # 3. Obtener ofertas completas en formato simplificado usando los IDs ordenados
@@ -5,6 +5,7 @@ from pydantic import BaseModel
 
 from application.services.product_service import ProductService
 from infrastucture.dependencies import get_product_service
+from infrastucture.repositories import hydration
 from domain.entities.producto import CatalogoProductos, Material, Cataegoria
 from presentation.schemas.responses.productos_responses import (
     ProductoListResponse,
@@ -18,6 +19,7 @@ from presentation.schemas.responses.productos_responses import (
     MaterialUpdateResponse,
     MaterialDeleteResponse
 )
+from presentation.responses import trusted_json_response
 
 router = APIRouter()
 
@@ -43,6 +45,9 @@ async def read_products(
     Endpoint para obtener una lista de todos los productos.
     """
     try:
+        if hydration.TRUSTED_READS:
+            products = await product_service.get_all_products_trusted()
+            return trusted_json_response(success=True, message="Productos obtenidos exitosamente", data=products)
         products = await product_service.get_all_products()
         return ProductoListResponse(
             success=True,
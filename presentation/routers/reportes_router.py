@@ -1,7 +1,7 @@
 from http.client import HTTPException
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status, HTTPException, File, UploadFile, Form, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, status, HTTPException, File, UploadFile, Form, Query
 from pydantic import BaseModel, Field, ValidationError
 
 from infrastucture.dependencies import get_form_service
@@ -20,7 +20,9 @@ from domain.entities.form import Form as FormEntity
 import base64
 import json
 from infrastucture.external_services.minio_uploader import upload_file_to_minio
+from presentation.responses import ORJSONResponse
 from presentation.schemas.responses.reportes_responses import (
+    BusquedaReportesResponse,
     MaterialesUsadosBrigadaResponse,
     MaterialesUsadosTodasBrigadasResponse
 )
@@ -56,6 +58,7 @@ router = APIRouter()
     tags=["Reportes de Inversión"]
 )
 async def create_inversion_report(
+        background_tasks: BackgroundTasks,
         tipo_reporte: str = Form(...),
         brigada: str = Form(...),
         materiales: str = Form(...),
@@ -107,6 +110,8 @@ async def create_inversion_report(
 
         inversion_request = InversionRequest(**request_data)
         form_id = await form_service.save_form(inversion_request.dict())
+        # Llevar el reporte a la copia materializada de reportes_view tras responder
+        background_tasks.add_task(form_service.refrescar_reportes_view)
         return InversionReportResponse(
             success=True,
             message=f"Reporte de inversión recibido y guardado con id {form_id}",
@@ -154,6 +159,7 @@ async def create_inversion_report(
     tags=["Reportes de Avería"]
 )
 async def create_averia_report(
+        background_tasks: BackgroundTasks,
         tipo_reporte: str = Form(...),
         brigada: str = Form(...),
         materiales: str = Form(default="[]"),
@@ -206,6 +212,8 @@ async def create_averia_report(
 
         averia_request = AveriaRequest(**request_data)
         form_id = await form_service.save_form(averia_request.dict())
+        # Llevar el reporte a la copia materializada de reportes_view tras responder
+        background_tasks.add_task(form_service.refrescar_reportes_view)
         return AveriaReportResponse(
             success=True,
             message=f"Reporte de avería recibido y guardado con id {form_id}",
@@ -253,6 +261,7 @@ async def create_averia_report(
     tags=["Reportes de Mantenimiento"]
 )
 async def create_mantenimiento_report(
+        background_tasks: BackgroundTasks,
         tipo_reporte: str = Form(...),
         brigada: str = Form(...),
         materiales: str = Form(default="[]"),
@@ -305,6 +314,8 @@ async def create_mantenimiento_report(
 
         mantenimiento_request = MantenimientoRequest(**request_data)
         form_id = await form_service.save_form(mantenimiento_request.dict())
+        # Llevar el reporte a la copia materializada de reportes_view tras responder
+        background_tasks.add_task(form_service.refrescar_reportes_view)
         return MantenimientoReportResponse(
             success=True,
             message=f"Reporte de mantenimiento recibido y guardado con id {form_id}",
@@ -346,7 +357,35 @@ def listar_reportes(
 ):
     """Listar reportes de la colección principal con filtros opcionales, incluyendo búsqueda global por 'q'."""
     reportes = form_service.get_reportes_view(tipo_reporte, cliente_numero, fecha_inicio, fecha_fin, lider_ci)
-    return reportes
+    return ORJSONResponse(reportes)
+
+
+@router.get("/buscar", summary="Buscar reportes", tags=["Reportes"], response_model=BusquedaReportesResponse)
+def buscar_reportes(
+    q: str = Query(..., min_length=1, description="Texto a buscar en descripción, nombre y número de cliente, nombre del líder y tipo de reporte"),
+    page: int = Query(1, ge=1, description="Página (desde 1)"),
+    limit: int = Query(50, ge=1, le=200, description="Reportes por página"),
+    tipo_reporte: Optional[str] = Query(None, description="Tipo de reporte (inversion, averia, mantenimiento)"),
+    cliente_numero: Optional[str] = Query(None, description="Número de cliente"),
+    fecha_inicio: Optional[str] = Query(None, description="Fecha inicio (YYYY-MM-DD)"),
+    fecha_fin: Optional[str] = Query(None, description="Fecha fin (YYYY-MM-DD)"),
+    lider_ci: Optional[str] = Query(None, description="CI del líder de brigada"),
+    form_service: FormService = Depends(get_form_service)
+):
+    """
+    Búsqueda global paginada y ordenada por relevancia (índice de texto en español: sin
+    distinción de mayúsculas ni tildes). Busca palabras completas y sus variantes
+    (instalación / instalaciones), no fragmentos.
+    """
+    try:
+        resultado = form_service.buscar_reportes(q, page, limit, tipo_reporte, cliente_numero, fecha_inicio, fecha_fin, lider_ci)
+        return ORJSONResponse({
+            "success": True,
+            "message": f"{resultado['total']} reportes encontrados",
+            "data": resultado,
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/view", summary="Listar reportes desde la vista", tags=["Reportes"], response_model=List[dict])
@@ -360,7 +399,7 @@ def listar_reportes_view(
 ):
     """Listar reportes desde la vista reportes_view con filtros opcionales."""
     reportes = form_service.get_reportes_view(tipo_reporte, cliente_numero, fecha_inicio, fecha_fin, lider_ci)
-    return reportes
+    return ORJSONResponse(reportes)
 
 
 @router.get("/cliente/{numero}", summary="Listar reportes de un cliente", tags=["Reportes"], response_model=List[dict])
@@ -378,7 +417,7 @@ def listar_reportes_por_cliente(
         reportes = form_service.get_reportes_view(tipo_reporte, numero, fecha_inicio, fecha_fin, lider_ci)
     else:
         reportes = form_service.get_reportes(tipo_reporte, numero, fecha_inicio, fecha_fin, lider_ci, None, None)
-    return reportes
+    return ORJSONResponse(reportes)
 
 
 @router.get("/{reporte_id}", summary="Obtener reporte por ID", tags=["Reportes"], response_model=dict)
@@ -390,7 +429,7 @@ def obtener_reporte_por_id(
     reporte = form_service.get_reporte_by_id(reporte_id)
     if not reporte:
         raise HTTPException(status_code=404, detail="Reporte no encontrado")
-    return reporte
+    return ORJSONResponse(reporte)
 
 
 @router.get(
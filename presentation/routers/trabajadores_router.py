@@ -1,11 +1,12 @@
 from http.client import HTTPException
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, Body, Query, HTTPException, Path
 from pydantic import BaseModel
 
 from application.services.worker_service import WorkerService
 from infrastucture.dependencies import get_worker_service, get_brigada_service
+from infrastucture.repositories import hydration
 from application.services.brigada_service import BrigadaService
 from domain.entities.trabajador import Trabajador
 from presentation.schemas.responses import (
@@ -16,6 +17,7 @@ from presentation.schemas.responses import (
     HoursWorkedResponse
 )
 from presentation.schemas.responses.reportes_responses import AllWorkersHoursWorkedResponse
+from presentation.responses import trusted_json_response
 
 router = APIRouter()
 
@@ -52,6 +54,11 @@ async def read_workers(
     Endpoint to get a list of all workers.
     """
     try:
+        if hydration.TRUSTED_READS:
+            workers = await worker_service.get_all_workers_trusted()
+            return trusted_json_response(
+                success=True, message="Trabajadores obtenidos exitosamente", data=workers
+            )
         workers = await worker_service.get_all_workers()
         return TrabajadorListResponse(
             success=True,
@@ -84,13 +91,14 @@ async def crear_trabajador(
 @router.get("/buscar", response_model=TrabajadorSearchResponse)
 async def buscar_trabajadores(
     nombre: str = Query(..., description="Nombre a buscar"),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Máximo de resultados (typeahead)"),
     worker_service: WorkerService = Depends(get_worker_service)
 ):
     """
-    Buscar trabajadores por nombre (case-insensitive).
+    Buscar trabajadores por nombre: prefijos de palabra, sin distinguir mayúsculas ni tildes.
     """
     try:
-        trabajadores = await worker_service.search_workers_by_name(nombre)
+        trabajadores = await worker_service.search_workers_by_name(nombre, limit)
         return TrabajadorSearchResponse(
             success=True,
             message="Búsqueda completada exitosamente",
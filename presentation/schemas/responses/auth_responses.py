@@ -7,6 +7,9 @@ class LoginResponse(BaseModel):
     success: bool
     message: str
     brigada: Optional[Brigada] = None
+    token: Optional[str] = None
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
 
 
 class ChangePasswordResponse(BaseModel):
@@ -246,4 +246,15 @@ class MaterialesUsadosBrigadaResponse(BaseModel):
 class MaterialesUsadosTodasBrigadasResponse(BaseModel):
     success: bool
     message: str
-    brigadas: list[MaterialesPorBrigadaResponse] 
\ No newline at end of file
+    brigadas: list[MaterialesPorBrigadaResponse]
+
+class BusquedaReportesData(BaseModel):
+    total: int = Field(..., description="Total de reportes que coinciden con la búsqueda")
+    page: int
+    limit: int
+    reportes: list[dict] = Field(..., description="Reportes de la página, por relevancia (campo `relevancia`)")
+
+class BusquedaReportesResponse(BaseModel):
+    success: bool
+    message: str
+    data: BusquedaReportesData